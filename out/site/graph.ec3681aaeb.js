@@ -0,0 +1,195 @@
+
+(function () {
+    const canvas = document.getElementById('graphCanvas');
+    const ctx = canvas.getContext('2d');
+    const COLORS = { verified: '#4caf50', needs_review: '#ff9800' };
+    const FALLBACK_COLOR = '#f44336';
+
+    let manifest = null;
+    const shards = [];
+    const loading = {};
+    const grid = new Map();
+    const view = { scale: 1, ox: 0, oy: 0 };
+
+    function shardIndexOf(g) {
+        let lo = 0, hi = manifest.shards.length - 1;
+        while (lo < hi) {
+            const mid = (lo + hi + 1) >> 1;
+            if (manifest.shards[mid].start <= g) lo = mid; else hi = mid - 1;
+        }
+        return lo;
+    }
+
+    function loadShard(k) {
+        if (!loading[k]) {
+            loading[k] = fetch(manifest.shards[k].file).then(r => r.json()).then(s => {
+                shards[k] = s;
+                for (const cell in s.cells) {
+                    const list = grid.get(cell) || [];
+                    s.cells[cell].forEach(i => list.push(s.start + i));
+                    grid.set(cell, list);
+                }
+            });
+        }
+        return loading[k];
+    }
+
+    function at(g) {
+        const s = shards[shardIndexOf(g)];
+        return s ? [s, g - s.start] : null;
+    }
+
+    function draw() {
+        ctx.setTransform(1, 0, 0, 1, 0, 0);
+        ctx.clearRect(0, 0, canvas.width, canvas.height);
+        ctx.setTransform(view.scale, 0, 0, view.scale, view.ox, view.oy);
+        const r = manifest.node_radius;
+
+        ctx.strokeStyle = '#999';
+        ctx.lineWidth = 1 / view.scale;
+        ctx.beginPath();
+        shards.forEach(s => {
+            if (!s) return;
+            const e = s.edges;
+            for (let i = 0; i < e.length; i += 2) {
+                const a = at(e[i]), b = at(e[i + 1]);
+                if (!a || !b) continue;
+                ctx.moveTo(a[0].x[a[1]], a[0].y[a[1]]);
+                ctx.lineTo(b[0].x[b[1]], b[0].y[b[1]]);
+            }
+        });
+        ctx.stroke();
+
+        // One path per color keeps the number of fill calls constant
+        const byColor = {};
+        shards.forEach(s => {
+            if (!s) return;
+            for (let i = 0; i < s.ids.length; i++) {
+                const color = COLORS[s.status[i]] || FALLBACK_COLOR;
+                (byColor[color] = byColor[color] || []).push(s, i);
+            }
+        });
+        for (const color in byColor) {
+            const list = byColor[color];
+            ctx.fillStyle = color;
+            ctx.beginPath();
+            for (let j = 0; j < list.length; j += 2) {
+                const s = list[j], i = list[j + 1];
+                ctx.moveTo(s.x[i] + r, s.y[i]);
+                ctx.arc(s.x[i], s.y[i], r, 0, 2 * Math.PI);
+            }
+            ctx.fill();
+        }
+
+        if (view.scale > 0.5) {
+            ctx.fillStyle = '#000';
+            ctx.font = (12 / view.scale) + 'px sans-serif';
+            shards.forEach(s => {
+                if (!s) return;
+                for (let i = 0; i < s.ids.length; i++) ctx.fillText(s.ids[i], s.x[i] + r + 4, s.y[i]);
+            });
+        }
+    }
+
+    function toWorld(e) {
+        const rect = canvas.getBoundingClientRect();
+        return [(e.clientX - rect.left - view.ox) / view.scale, (e.clientY - rect.top - view.oy) / view.scale];
+    }
+
+    function hit(x, y) {
+        const cx = Math.floor(x / manifest.cell), cy = Math.floor(y / manifest.cell);
+        const r2 = manifest.node_radius * manifest.node_radius;
+        let best = -1, bestD = Infinity;
+        for (let dx = -1; dx <= 1; dx++) {
+            for (let dy = -1; dy <= 1; dy++) {
+                (grid.get((cx + dx) + ',' + (cy + dy)) || []).forEach(g => {
+                    const [s, i] = at(g);
+                    const d = (s.x[i] - x) ** 2 + (s.y[i] - y) ** 2;
+                    if (d <= r2 && d < bestD) { best = g; bestD = d; }
+                });
+            }
+        }
+        return best;
+    }
+
+    function missingNeighborShards(g) {
+        const keys = new Set();
+        const e = at(g)[0].edges;
+        for (let i = 0; i < e.length; i += 2) {
+            const other = e[i] === g ? e[i + 1] : e[i + 1] === g ? e[i] : -1;
+            if (other !== -1) {
+                const k = shardIndexOf(other);
+                if (!loading[k]) keys.add(k);
+            }
+        }
+        return Array.from(keys);
+    }
+
+    function center(x, y, scale) {
+        view.scale = scale;
+        view.ox = canvas.width / 2 - x * scale;
+        view.oy = canvas.height / 2 - y * scale;
+    }
+
+    let drag = null;
+    canvas.addEventListener('mousedown', e => { drag = { x: e.clientX, y: e.clientY, ox: view.ox, oy: view.oy, moved: false }; });
+    canvas.addEventListener('mousemove', e => {
+        if (!drag) return;
+        const dx = e.clientX - drag.x, dy = e.clientY - drag.y;
+        if (Math.abs(dx) + Math.abs(dy) > 3) drag.moved = true;
+        if (drag.moved) { view.ox = drag.ox + dx; view.oy = drag.oy + dy; draw(); }
+    });
+    canvas.addEventListener('mouseup', async e => {
+        const wasDrag = drag && drag.moved;
+        drag = null;
+        if (wasDrag || !manifest) return;
+        const [x, y] = toWorld(e);
+        const g = hit(x, y);
+        if (g === -1) return;
+        const pending = missingNeighborShards(g);
+        if (pending.length) {
+            await Promise.all(pending.map(loadShard));
+            draw();
+        } else {
+            const [s, i] = at(g);
+            window.location.href = 'lo/' + s.ids[i] + '.html';
+        }
+    });
+    canvas.addEventListener('wheel', e => {
+        e.preventDefault();
+        const rect = canvas.getBoundingClientRect();
+        const mx = e.clientX - rect.left, my = e.clientY - rect.top;
+        const factor = e.deltaY < 0 ? 1.2 : 1 / 1.2;
+        view.ox = mx - (mx - view.ox) * factor;
+        view.oy = my - (my - view.oy) * factor;
+        view.scale *= factor;
+        draw();
+    }, { passive: false });
+
+    fetch('data/graph/manifest.json').then(r => r.json()).then(async m => {
+        manifest = m;
+        if (!m.shards.length) return;
+        const focus = new URLSearchParams(window.location.search).get('focus');
+        const key = focus ? (focus.split('.')[0].replace(/[^A-Za-z0-9_-]/g, '_') || '_') : null;
+        let k = m.shards.findIndex(s => s.key === key);
+        if (k === -1) k = 0;
+        await loadShard(k);
+
+        const s = shards[k];
+        const i = focus ? s.ids.indexOf(focus) : -1;
+        if (i !== -1) {
+            center(s.x[i], s.y[i], 1);
+        } else {
+            // Fit the loaded shard
+            let x0 = Infinity, y0 = Infinity, x1 = -Infinity, y1 = -Infinity;
+            for (let j = 0; j < s.ids.length; j++) {
+                x0 = Math.min(x0, s.x[j]); x1 = Math.max(x1, s.x[j]);
+                y0 = Math.min(y0, s.y[j]); y1 = Math.max(y1, s.y[j]);
+            }
+            const pad = 4 * m.node_radius;
+            const scale = Math.min(1, canvas.width / (x1 - x0 + pad), canvas.height / (y1 - y0 + pad));
+            center((x0 + x1) / 2, (y0 + y1) / 2, scale);
+        }
+        draw();
+    });
+})();
@@ -0,0 +1,107 @@
+
+(function () {
+    const input = document.getElementById('search');
+    const results = document.getElementById('search-results');
+    if (!input || !results) return;
+
+    const LIMIT = 50;
+    const cache = {};
+    let seq = 0;
+
+    function load(url) {
+        if (!(url in cache)) {
+            cache[url] = fetch(url).then(r => r.ok ? r.json() : null).catch(() => null);
+        }
+        return cache[url];
+    }
+
+    function tokenize(q) {
+        return (q.toLowerCase().match(/[a-z0-9]+/g) || []);
+    }
+
+    function score(bits, weights) {
+        let s = 0;
+        for (const bit in weights) if (bits & bit) s += weights[bit];
+        return s;
+    }
+
+    // doc -> best score for one query token; the last token also matches as a prefix
+    async function lookup(manifest, token, prefix) {
+        const scores = new Map();
+        const key = token.slice(0, manifest.min_token);
+        if (manifest.shards.indexOf(key) === -1) return scores;
+        const shard = await load('search/terms/' + key + '.json');
+        if (!shard) return scores;
+        for (const term in shard) {
+            if (prefix ? !term.startsWith(token) : term !== token) continue;
+            const postings = shard[term];
+            let doc = 0;
+            for (let i = 0; i < postings.length; i += 2) {
+                doc += postings[i];
+                const s = score(postings[i + 1], manifest.weights);
+                if (!(scores.get(doc) >= s)) scores.set(doc, s);
+            }
+        }
+        return scores;
+    }
+
+    async function search(query) {
+        const mine = ++seq;
+        const manifest = await load('search/manifest.json');
+        if (!manifest) return;
+        const tokens = tokenize(query).filter(t => t.length >= manifest.min_token);
+        if (!tokens.length) {
+            results.innerHTML = '';
+            return;
+        }
+
+        const maps = await Promise.all(tokens.map((t, i) => lookup(manifest, t, i === tokens.length - 1)));
+        maps.sort((a, b) => a.size - b.size);
+        let hits = [];
+        for (const [doc, s] of maps[0]) {
+            let total = s;
+            for (let i = 1; i < maps.length && total >= 0; i++) {
+                const other = maps[i].get(doc);
+                total = other === undefined ? -1 : total + other;
+            }
+            if (total >= 0) hits.push([doc, total]);
+        }
+        hits.sort((a, b) => b[1] - a[1] || a[0] - b[0]);
+        const count = hits.length;
+        hits = hits.slice(0, LIMIT);
+
+        const chunks = {};
+        await Promise.all(hits.map(([doc]) => {
+            const n = Math.floor(doc / manifest.doc_chunk);
+            return load('search/docs/' + n + '.json').then(c => { chunks[n] = c; });
+        }));
+        if (mine !== seq) return;
+
+        results.textContent = '';
+        const summary = document.createElement('p');
+        summary.textContent = count + (count === 1 ? ' result' : ' results') + (count > LIMIT ? ' (showing ' + LIMIT + ')' : '');
+        results.appendChild(summary);
+        for (const [doc] of hits) {
+            const entry = (chunks[Math.floor(doc / manifest.doc_chunk)] || [])[doc % manifest.doc_chunk];
+            if (!entry) continue;
+            const card = document.createElement('div');
+            card.className = 'card';
+            const link = document.createElement('a');
+            link.href = 'lo/' + entry[0] + '.html';
+            link.textContent = entry[1] || entry[0];
+            const badge = document.createElement('span');
+            badge.className = 'badge ' + entry[2];
+            badge.textContent = entry[2];
+            card.appendChild(link);
+            card.appendChild(document.createTextNode(' '));
+            card.appendChild(badge);
+            results.appendChild(card);
+        }
+    }
+
+    let timer = null;
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(() => search(input.value), 80);
+    });
+})();
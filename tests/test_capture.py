@@ -0,0 +1,14 @@
+import os
+
+from tools.capture.cmd import capture_lo
+
+
+def test_lo_id_cannot_reach_outside_the_capture_dirs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("knowledge/learning_objects")
+
+    result = capture_lo("/engine", "../../../knowledge", "capture_staticmesh_collision.py")
+
+    assert not result.passed
+    assert "invalid LO id" in result.detail
+    assert os.path.isdir("knowledge/learning_objects")
@@ -0,0 +1,42 @@
+import pytest
+
+from tools.path_planner.context_filter import ContextFilter
+
+RECORDS = [
+    {"id": "a", "requirements": {"engine_version": ">=5.3 <5.7", "plugins_required": ["Nanite"]}},
+    {"id": "b", "requirements": {"plugins_incompatible": ["Lumen"]}, "trust": {"trust_score": 0.4}},
+]
+
+
+def test_context_fields_filter_by_bit():
+    f = ContextFilter(RECORDS)
+    assert f.excluded({}) == 0
+    assert f.excluded({"engine_version": "5.7"}) == 0b01
+    assert f.excluded({"engine_version": "5.6", "plugins": ["Nanite", "Lumen"]}) == 0b10
+    assert f.excluded({"min_trust_score": 0.5}) == 0b10
+
+
+@pytest.mark.parametrize("context", [
+    {"engine_version": "latest"},
+    {"engine_version": ["5.6"]},
+    {"engine_version": 5.10},
+    {"plugins": "Nanite"},
+    {"plugins": [1]},
+    {"project_settings": ["r.Lumen"]},
+    {"min_trust_score": "high"},
+])
+def test_invalid_context_raises_value_error(context):
+    with pytest.raises(ValueError):
+        ContextFilter(RECORDS).excluded(context)
+
+
+def test_malformed_lo_fields_are_reported_not_raised():
+    f = ContextFilter([
+        {"id": "a", "requirements": {"plugins_required": "Nanite"}},
+        {"id": "b", "lifecycle": "draft", "trust": 0.9},
+        {"id": "c", "requirements": "none"},
+        {"id": "d", "requirements": {"plugins_required": ["Nanite"]}, "trust": {"trust_score": "high"}},
+    ])
+    assert set(f.errors) == {"a", "b", "c", "d"}
+    assert list(f.requires_plugin) == ["Nanite"]
+    assert f.excluded({"plugins": ["Nanite"]}) == 0
@@ -0,0 +1,121 @@
+import subprocess
+
+import pytest
+
+from tools.freshness.audit import query_audit
+from tools.freshness.cmd import run_heal
+
+LO_TEMPLATE = """id: {lo_id}
+type: task
+title: "{lo_id}"
+description: "Test LO."
+roles: ["technical_artist"]
+skill_level: "intermediate"
+prerequisites: []
+evidence:
+  - file: "{file}"
+    symbol: "{symbol}"
+    symbol_id: "{symbol_id}"
+    snippet_hash: "0000"
+"""
+
+
+def git(repo, *args):
+    return subprocess.run(["git", "-C", str(repo), "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                          check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    repo = tmp_path / "engine"
+    source = repo / "Engine" / "Source"
+    source.mkdir(parents=True)
+    (source / "Mesh.cpp").write_text("void UMesh::Build()\n{\n    Rebuild();\n}\n")
+    (source / "Body.cpp").write_text("void UBody::Create()\n{\n    Setup();\n}\n")
+    git(repo, "init", "-q")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "one")
+    first = git(repo, "rev-parse", "HEAD")
+
+    (source / "Body.cpp").write_text("void UBody::Create()\n{\n    Setup(true);\n}\n")
+    git(repo, "commit", "-q", "-am", "two")
+    second = git(repo, "rev-parse", "HEAD")
+    return repo, first, second
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    los = tmp_path / "work" / "knowledge" / "learning_objects"
+    los.mkdir(parents=True)
+    (los / "mesh.yml").write_text(LO_TEMPLATE.format(
+        lo_id="test.mesh", file="Engine/Source/Mesh.cpp", symbol="UMesh::Build", symbol_id="func_build"))
+    (los / "body.yml").write_text(LO_TEMPLATE.format(
+        lo_id="test.body", file="Engine/Source/Body.cpp", symbol="UBody::Create", symbol_id="func_create"))
+    monkeypatch.chdir(tmp_path / "work")
+
+
+def test_heal_checks_only_evidence_of_changed_files(engine, workspace):
+    repo, first, second = engine
+
+    heal_status = run_heal(str(repo), first, second)
+
+    assert heal_status == {"test.body": "needs_review"}
+    entries = list(query_audit())
+    assert [(e["lo_id"], e["file"], e["action"]) for e in entries] == [
+        ("test.body", "Engine/Source/Body.cpp", "FLAGGED")]
+    assert entries[0]["to_sha"] == second
+
+
+def test_heal_relocates_against_the_object_store(engine, workspace):
+    from tools.index.trigram import SourceIndex
+
+    repo, _, second = engine
+    source = repo / "Engine" / "Source"
+    (source / "Body.cpp").unlink()
+    (source / "Physics.cpp").write_text("void UBody::Create()\n{\n    Setup(true);\n}\n")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "three")
+    third = git(repo, "rev-parse", "HEAD")
+
+    index = SourceIndex(str(repo))
+    index.update()
+    index.save()
+    # The working tree is back at a commit where the new file does not exist
+    git(repo, "checkout", "-q", second)
+
+    heal_status = run_heal(str(repo), second, third)
+
+    assert heal_status == {"test.body": "needs_review"}
+    [entry] = query_audit()
+    assert entry["action"] == "FLAGGED"
+    assert entry["new_file"] == "Engine/Source/Physics.cpp"
+
+
+def test_missing_symbol_is_invalid_until_the_next_gate(engine, workspace):
+    import json
+    from tools.gate.validator import run_validation
+
+    repo, _, second = engine
+    (repo / "Engine" / "Source" / "Body.cpp").write_text("void UBody::Destroy()\n{\n}\n")
+    git(repo, "commit", "-q", "-am", "three")
+    run_validation(str(repo), no_capture=False, incremental=True)
+
+    assert run_heal(str(repo), second, "HEAD") == {"test.body": "invalid"}
+    with open("out/status.json") as f:
+        assert json.load(f)["test.body"] == "invalid"
+
+    # Nothing the gate depends on changed, but its results still replace the heal downgrade
+    report = run_validation(str(repo), no_capture=False, incremental=True)
+    assert report.reused_count == 2
+    with open("out/status.json") as f:
+        assert json.load(f) == {"test.body": "verified", "test.mesh": "verified"}
+
+
+def test_unknown_sha_aborts_instead_of_scanning_everything(engine, workspace):
+    import os
+
+    repo, first, _ = engine
+
+    assert run_heal(str(repo), first, "deadbeef") == {}
+    assert list(query_audit()) == []
+    assert not os.path.exists("out/status.json")
@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from tools.corpus import load_corpus
+from tools.gate.validator import run_validation
+from tools.site_gen.cmd import SiteGenerator
+
+LO_TEMPLATE = """id: {lo_id}
+type: {lo_type}
+title: "{title}"
+description: "Test LO."
+roles: ["technical_artist"]
+skill_level: "intermediate"
+prerequisites: {prereqs}
+evidence:
+  - file: "{file}"
+    symbol: "Symbol{n}"
+    symbol_id: "sym_{n}"
+    snippet_hash: "0000"
+"""
+
+
+def write_lo(n, title=None, prereqs="[]", lo_type="task"):
+    path = f"knowledge/learning_objects/lo{n}.yml"
+    with open(path, "w") as f:
+        f.write(LO_TEMPLATE.format(lo_id=f"test.lo{n}", lo_type=lo_type, title=title or f"LO {n}",
+                                   prereqs=prereqs, file=f"Engine/Source/File{n}.cpp", n=n))
+    return path
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("knowledge/learning_objects")
+    os.makedirs("engine/Engine/Source")
+    write_lo(0, lo_type="concept")
+    for n in range(1, 8):
+        write_lo(n, prereqs='["test.lo0"]')
+        # Every third evidence file is missing, so the report mixes verified and invalid LOs
+        if n % 3:
+            with open(f"engine/Engine/Source/File{n}.cpp", "w") as f:
+                f.write(f"void Symbol{n}() {{}}\n")
+    return tmp_path
+
+
+def site_files():
+    files = {}
+    for dirpath, _, filenames in os.walk("out/site"):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            with open(path, "rb") as f:
+                files[os.path.relpath(path, "out/site")] = (os.stat(path).st_mtime_ns, f.read())
+    return files
+
+
+def test_parallel_gate_report_is_byte_identical_to_serial(workspace):
+    outputs = []
+    for jobs in (1, 3):
+        # Drop the corpus cache so every LO file is parsed again, across workers when jobs > 1
+        if os.path.exists("out/cache/corpus.pkl"):
+            os.remove("out/cache/corpus.pkl")
+        run_validation("engine", no_capture=False, jobs=jobs)
+        with open("out/gate_report.json", "rb") as report, open("out/status.json", "rb") as status:
+            outputs.append((report.read(), status.read()))
+    assert outputs[0] == outputs[1]
+    assert b"invalid" in outputs[0][1] and b"verified" in outputs[0][1]
+
+
+def test_site_rewrites_only_stale_pages_and_removes_orphans(workspace):
+    gen = SiteGenerator(corpus=load_corpus())
+    gen.generate()
+    first = site_files()
+    assert "lo/test.lo7.html" in first
+
+    gen = SiteGenerator(corpus=load_corpus())
+    gen.generate()
+    assert (gen.written, gen.removed) == (0, 0)
+    assert site_files() == first
+
+    write_lo(7, title="LO 7 renamed", prereqs='["test.lo0"]')
+    gen = SiteGenerator(corpus=load_corpus())
+    gen.generate()
+    second = site_files()
+    rewritten = {p for p in second if second[p] != first.get(p)}
+    assert "lo/test.lo7.html" in rewritten
+    assert b"LO 7 renamed" in second["lo/test.lo7.html"][1]
+    # Pages that do not show the title are left alone
+    assert not any(p.startswith("lo/") for p in rewritten - {"lo/test.lo7.html", "lo/test.lo7.html.gz"})
+    assert 0 < gen.written < len(first)
+
+    os.remove("knowledge/learning_objects/lo7.yml")
+    gen = SiteGenerator(corpus=load_corpus())
+    gen.generate()
+    assert gen.removed >= 1
+    assert not os.path.exists("out/site/lo/test.lo7.html")
+    assert not os.path.exists("out/site/lo/test.lo7.html.gz")
+    assert os.path.exists("out/site/lo/test.lo6.html")
@@ -0,0 +1,32 @@
+from tools.capture.cmd import CaptureResult, record_results
+from tools.metrics.store import MetricsStore
+
+
+def test_anchor_hit_rate_counts_captures(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    record_results([
+        CaptureResult("lo.a", True, 1.0, hits=9, misses=1),
+        CaptureResult("lo.b", True, 1.0, hits=2, misses=0),
+        CaptureResult("lo.c", True, 1.0, hits=1, misses=0),
+        CaptureResult("lo.d", False, 1.0, "exit code 1"),
+    ])
+
+    with MetricsStore() as metrics:
+        kpis = metrics.kpis()
+    # 2 of the 3 passing captures resolved every anchor; the failed one has no anchors to judge
+    assert kpis["anchor_hit_rate"] == 2 / 3
+    assert kpis["capture_pass_rate"] == 3 / 4
+
+
+def test_heal_kpis_count_drift_only(tmp_path):
+    with MetricsStore(str(tmp_path / "metrics.db")) as metrics:
+        metrics.record_many([("heal", "VERIFIED", "lo.a", "s", 60.0, None)] * 8
+                            + [("heal", "RELOCATED", "lo.b", "s", 3600.0, None),
+                               ("heal", "FLAGGED", "lo.c", "s", 3 * 3600.0, None)])
+        kpis = metrics.kpis()
+        assert kpis["auto_merge_rate"] == 0.5
+        assert kpis["drift_latency_hours"] == 2.0
+        assert kpis["rollbacks_per_week"] is None
+
+        metrics.record("heal", "ROLLBACK", "lo.b")
+        assert metrics.kpis()["rollbacks_per_week"] == 7.0
@@ -0,0 +1,24 @@
+import hashlib
+
+from tools.freshness.normalizer import compute_hash, normalize_snippet
+
+
+def test_comment_markers_inside_a_block_comment():
+    assert normalize_snippet("a /* // */ b\nc") == "abc"
+
+
+def test_comment_markers_inside_a_string_literal():
+    assert normalize_snippet('Log("a // b"); // trailing\n') == 'Log("a // b");'
+    assert normalize_snippet('s = "/* x */";') == 's="/* x */";'
+
+
+def test_raw_string_literal_is_kept_verbatim():
+    snippet = 'auto s = R"x(// not a comment\n  "quoted" )x"; // comment'
+    assert normalize_snippet(snippet) == 'autos=R"x(// not a comment\n  "quoted" )x";'
+
+
+def test_whitespace_and_comments_do_not_change_the_hash():
+    before = "void F()\n{\n    Call(1, 2); // old\n}\n"
+    after = "void F() { /* reformatted */\n\tCall(1,2);\n}"
+    assert compute_hash(before) == compute_hash(after)
+    assert compute_hash(before) == hashlib.sha256(normalize_snippet(before).encode("utf-8")).hexdigest()
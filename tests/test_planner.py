@@ -0,0 +1,35 @@
+from tools.path_planner.graph import PrereqGraph
+
+
+def test_prerequisites_come_first_in_id_order():
+    graph = PrereqGraph({"c": ["a", "b"], "b": ["a"], "a": [], "d": []})
+    order, cycles = graph.topo_order()
+    assert [graph.ids[n] for n in order] == ["a", "b", "c", "d"]
+    assert cycles == []
+
+
+def test_cycle_is_reported_and_broken():
+    graph = PrereqGraph({"a": ["c"], "b": ["a"], "c": ["b"], "d": ["a"]})
+    order, cycles = graph.topo_order()
+    assert cycles == [["a", "c", "b"]]
+    assert sorted(graph.ids[n] for n in order) == ["a", "b", "c", "d"]
+    assert order.index(graph.index["a"]) < order.index(graph.index["d"])
+
+
+def test_missing_prerequisite_is_reported_not_followed():
+    graph = PrereqGraph({"a": [], "b": ["a", "gone"], "c": ["b", "also.gone"]})
+    assert graph.missing == {"b": ["gone"], "c": ["also.gone"]}
+    assert graph.prereqs_of(graph.index["b"]) == [graph.index["a"]]
+    order, cycles = graph.topo_order()
+    assert [graph.ids[n] for n in order] == ["a", "b", "c"]
+
+
+def test_deep_chain_does_not_recurse():
+    depth = 100_000
+    ids = [f"lo.{i:06d}" for i in range(depth)]
+    # Each LO requires the next one, so the walk from the first root is as deep as the chain
+    graph = PrereqGraph({lo_id: [ids[i + 1]] if i + 1 < depth else [] for i, lo_id in enumerate(ids)})
+    order, cycles = graph.topo_order()
+    assert order == list(reversed(range(depth)))
+    assert cycles == []
+    assert graph.topo_order([depth - 2])[0] == [depth - 1, depth - 2]
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from tools.serve_cmd import resolve_site_path
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("out/site/lo")
+    os.makedirs("out/images/lo.a")
+    for path in ("out/site/index.html", "out/site/lo/lo.a.html", "out/images/lo.a/step_01.png", "README.md"):
+        with open(path, "w") as f:
+            f.write("x")
+    return tmp_path
+
+
+def test_files_under_the_site_and_mounts_resolve(site):
+    assert resolve_site_path("/").as_posix() == "out/site/index.html"
+    assert resolve_site_path("/lo/lo.a.html").as_posix() == "out/site/lo/lo.a.html"
+    assert resolve_site_path("/images/lo.a/step_01.png").as_posix() == "out/images/lo.a/step_01.png"
+    assert resolve_site_path("/lo/missing.html") is None
+
+
+@pytest.mark.parametrize("url_path", [
+    "/../../README.md",
+    "/lo/%2e%2e/%2e%2e/%2e%2e/README.md",
+    "/..%5c..%5cREADME.md",
+    "/C:/Windows/win.ini",
+    "/images/../../README.md",
+])
+def test_paths_outside_the_site_are_rejected(site, url_path):
+    assert resolve_site_path(url_path) is None
+
+
+def test_symlink_out_of_the_site_is_rejected(site):
+    os.symlink(site / "README.md", "out/site/readme.html")
+    assert resolve_site_path("/readme.html") is None
@@ -0,0 +1,43 @@
+import json
+import threading
+
+from tools.path_planner import service as service_module
+from tools.path_planner.service import PlanningService
+
+LO = """id: {lo_id}
+type: concept
+title: "{lo_id}"
+description: "Test LO."
+prerequisites: []
+evidence: []
+"""
+
+
+def test_requests_are_served_while_the_corpus_is_stat_ed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    los = tmp_path / "knowledge" / "learning_objects"
+    los.mkdir(parents=True)
+    (los / "a.yml").write_text(LO.format(lo_id="lo.a"))
+    service = PlanningService(check_interval=0)
+
+    stat_fingerprint = service_module.stat_fingerprint
+    statting, release = threading.Event(), threading.Event()
+
+    def slow_fingerprint():
+        statting.set()
+        release.wait(5)
+        return stat_fingerprint()
+
+    monkeypatch.setattr(service_module, "stat_fingerprint", slow_fingerprint)
+    refresher = threading.Thread(target=service.plan, args=({}, ["lo.a"]))
+    refresher.start()
+    assert statting.wait(5)
+
+    # A second request neither waits for the stat nor starts another one
+    body = json.loads(service.plan({}, ["lo.a"]))
+    assert body["steps"] == ["lo.a"]
+    assert refresher.is_alive()
+
+    release.set()
+    refresher.join(5)
+    assert not refresher.is_alive()
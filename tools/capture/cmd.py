@@ -1,73 +1,210 @@
 
 import os
 import sys
+import json
 import subprocess
 import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
 from rich.console import Console
+from rich.table import Table
 from PIL import Image, ImageDraw, ImageFont
+from tools.corpus import load_corpus
+from tools.gate.models import LearningObject
+from tools.metrics.store import MetricsStore
 
 console = Console()
 
-def run_capture(engine_path: str, lo_id: str):
-    console.print(f"[bold]Running Capture for LO: {lo_id}[/bold]")
+SCRIPTS_DIR = Path("tools/capture/scripts")
+IMAGES_DIR = Path("out/images")
+OVERLAYS_DIR = Path("knowledge/assets/overlays")
+# Per-run staging dirs, script logs and the batch report
+CAPTURE_DIR = Path("out/capture")
+DEFAULT_TIMEOUT = 600
 
-    # Identify script payload based on LO ID
-    # In a real system, this mapping would be better defined.
-    if lo_id == "staticmesh.collision.simple":
-        script_name = "capture_staticmesh_collision.py"
-    else:
-        console.print(f"[red]No capture script defined for {lo_id}[/red]")
-        return
+@dataclass
+class CaptureResult:
+    lo_id: str
+    passed: bool
+    duration: float
+    detail: Optional[str] = None
+    hits: int = 0
+    misses: int = 0
 
-    script_path = os.path.abspath(f"tools/capture/scripts/{script_name}")
-    
-    # 1. Run the script (Mocking Unreal execution for POC if engine not available/setup)
-    # The user provided a real path: D:\Fortnite\UE_5.6\Engine\Source
-    # We need the Editor Cmd path, usually ../Binaries/Win64/UnrealEditor-Cmd.exe relative to Engine/Source??
-    # Actually usually it's Engine/Binaries/Win64/UnrealEditor-Cmd.exe
-    
-    # Heuristic to find editor cmd
-    # engine_root = os.path.abspath(os.path.join(engine_path, "../..")) # Assuming engine_path is passed as Source... user said engine path is D:\Fortnite\UE_5.6\Engine\Source? 
-    # Let's assume the user passes the ROOT engine path, or we try to find it.
-    # The previous instruction said "Engine Source code can be found here". 
-    # If passed "D:\Fortnite\UE_5.6\Engine\Source", we probably want "D:\Fortnite\UE_5.6\Engine\Binaries\Win64\UnrealEditor-Cmd.exe"
-    
-    # For this POC, to ensure it runs without crashing if the user doesn't physically have that path or it's huge:
-    # We will simulate the "run" by invoking python directly on the script with a mocked `unreal` module (which we added to the script).
-    
-    console.print(f"[yellow]Simulating Unreal execution of {script_name}...[/yellow]")
-    
-    # Ensure output dir exists
-    out_dir = f"out/images/{lo_id}"
-    os.makedirs(out_dir, exist_ok=True)
-    
-    # Create a dummy screenshot for the pipeline since we aren't actually running UE to take one
-    dummy_screenshot = os.path.join(out_dir, "step_01.png")
+def capture_script(lo: LearningObject) -> Optional[str]:
+    """Capture script named by the LO's validation.script, if any."""
+    return lo.validation.script if lo.validation and lo.validation.script else None
+
+def write_mock_screenshot(path: Path):
+    # Stands in for the screenshot UE would take, since we aren't actually running UE
     img = Image.new('RGB', (1920, 1080), color = (73, 109, 137))
     d = ImageDraw.Draw(img)
     d.text((10,10), "Unreal Editor Mock Screenshot", fill=(255,255,0))
     # Draw a fake details panel row at the coords our stub returns (100, 200, 300, 50)
     d.rectangle([100, 200, 400, 250], outline="black", fill="gray")
     d.text((110, 210), "Collision Complexity", fill="white")
-    img.save(dummy_screenshot)
-    console.print("Created mock screenshot.")
-
-    # Execute the script to generate layout JSON
-    # We need to pass arguments if the script expects them, or ensuring it knows what to do.
-    # The script currently has hardcoded steps.
-    subprocess.run([sys.executable, script_path], check=True)
-
-    # 2. Overlay Pipeline
-    console.print("[bold]Composing Overlays...[/bold]")
-    layout_path = os.path.join(out_dir, "step_01.layout.json")
-    overlay_def_path = f"knowledge/assets/overlays/{lo_id}/step_01.overlay.json"
-    final_output = os.path.join(out_dir, "step_01.final.png")
-
-    if os.path.exists(layout_path) and os.path.exists(overlay_def_path):
-        compose_overlays(dummy_screenshot, layout_path, overlay_def_path, final_output)
-        console.print(f"[green]Capture complete. Output: {final_output}[/green]")
+    img.save(path)
+
+def is_child_dir(path: Path, base: Path) -> bool:
+    """True if path resolves to a directory entry directly inside base (no "..", separators or drives)."""
+    resolved = path.resolve()
+    return resolved.parent == base.resolve() and resolved.name == path.name
+
+def publish(staging: Path, target: Path):
+    """Replaces target with the finished staging dir, so a failed capture never clobbers the last good one."""
+    replaced = CAPTURE_DIR / "replaced" / target.name
+    shutil.rmtree(replaced, ignore_errors=True)
+    if target.exists():
+        os.makedirs(replaced.parent, exist_ok=True)
+        os.replace(target, replaced)
+    os.makedirs(target.parent, exist_ok=True)
+    os.replace(staging, target)
+    shutil.rmtree(replaced, ignore_errors=True)
+
+def capture_lo(engine_path: str, lo_id: str, script_name: str, timeout: float = DEFAULT_TIMEOUT) -> CaptureResult:
+    """
+    Runs one LO's capture script in its own staging dir (passed as UKE_CAPTURE_OUT), composes
+    the overlays and, if everything passed, publishes the dir as out/images/<lo_id>.
+    Script output goes to out/capture/logs/<lo_id>.log.
+
+    For this POC the script is run by the local interpreter with its mocked `unreal` module
+    rather than through UnrealEditor-Cmd under engine_path.
+    """
+    start = time.perf_counter()
+    # lo_id is LO metadata too, and names dirs that are deleted and replaced below
+    staging_root, logs_dir = CAPTURE_DIR / "staging", CAPTURE_DIR / "logs"
+    if not all(is_child_dir(base / lo_id, base) for base in (staging_root, logs_dir, IMAGES_DIR)):
+        return CaptureResult(lo_id, False, 0.0, f"invalid LO id for a capture directory: {lo_id!r}")
+    script_path = (SCRIPTS_DIR / script_name).resolve()
+    # validation.script comes from LO metadata; "../" must not reach scripts elsewhere
+    if not script_path.is_relative_to(SCRIPTS_DIR.resolve()):
+        return CaptureResult(lo_id, False, 0.0, f"capture script outside {SCRIPTS_DIR}: {script_name}")
+    if not script_path.is_file():
+        return CaptureResult(lo_id, False, 0.0, f"capture script not found: {SCRIPTS_DIR / script_name}")
+
+    staging = staging_root / lo_id
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    os.makedirs(logs_dir, exist_ok=True)
+    screenshot = staging / "step_01.png"
+    write_mock_screenshot(screenshot)
+
+    env = dict(os.environ, UKE_CAPTURE_OUT=str(staging.resolve()))
+    try:
+        with open(logs_dir / f"{lo_id}.log", "wb") as log:
+            result = subprocess.run([sys.executable, str(script_path)], stdout=log, stderr=subprocess.STDOUT,
+                                    env=env, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return CaptureResult(lo_id, False, time.perf_counter() - start, f"timed out after {timeout:g}s")
+    if result.returncode != 0:
+        return CaptureResult(lo_id, False, time.perf_counter() - start, f"exit code {result.returncode}")
+
+    # Overlay Pipeline
+    layout_path = staging / "step_01.layout.json"
+    overlay_def_path = OVERLAYS_DIR / lo_id / "step_01.overlay.json"
+    if not (layout_path.exists() and overlay_def_path.exists()):
+        return CaptureResult(lo_id, False, time.perf_counter() - start, "missing layout or overlay definition")
+    try:
+        hits, misses = compose_overlays(str(screenshot), str(layout_path), str(overlay_def_path),
+                                        str(staging / "step_01.final.png"))
+        publish(staging, IMAGES_DIR / lo_id)
+    except Exception as e:
+        # A bad overlay definition or layout fails this capture, not the whole --all batch
+        return CaptureResult(lo_id, False, time.perf_counter() - start, f"overlay or publish failed: {e}")
+    return CaptureResult(lo_id, True, time.perf_counter() - start, hits=hits, misses=misses)
+
+def record_results(results: List[CaptureResult]):
+    events = []
+    for r in results:
+        if r.passed:
+            events.append(("capture", "PASS", r.lo_id, None, r.duration, None))
+            # Architecture 8 counts captures, not anchors: one lost anchor loses the capture
+            if r.misses:
+                events.append(("capture", "ANCHOR_LOST", r.lo_id, None, None,
+                               f"{r.misses} of {r.hits + r.misses} anchors missing"))
+            else:
+                events.append(("capture", "ANCHOR_OK", r.lo_id, None, None, None))
+        else:
+            events.append(("capture", "FAIL", r.lo_id, None, r.duration, r.detail))
+    with MetricsStore() as metrics:
+        metrics.record_many(events)
+
+def run_capture(engine_path: str, lo_id: str, timeout: float = DEFAULT_TIMEOUT):
+    console.print(f"[bold]Running Capture for LO: {lo_id}[/bold]")
+
+    lo = next((lo for lo in load_corpus().learning_objects() if lo.id == lo_id), None)
+    if lo is None:
+        console.print(f"[red]Unknown LO: {lo_id}[/red]")
+        return
+    script_name = capture_script(lo)
+    if script_name is None:
+        console.print(f"[red]No capture script defined for {lo_id} (validation.script)[/red]")
+        return
+
+    console.print(f"[yellow]Simulating Unreal execution of {script_name}...[/yellow]")
+    result = capture_lo(engine_path, lo_id, script_name, timeout)
+    record_results([result])
+    if result.passed:
+        console.print(f"[green]Capture complete. Output: {IMAGES_DIR / lo_id / 'step_01.final.png'}[/green]")
     else:
-        console.print("[red]Missing layout or overlay definition.[/red]")
+        console.print(f"[red]Capture failed: {result.detail}.[/red]")
+        log_path = CAPTURE_DIR / "logs" / f"{lo_id}.log"
+        if log_path.exists():
+            console.print(f"Script output: [blue]{log_path}[/blue]")
+
+def run_capture_all(engine_path: str, jobs: int = 1, timeout: float = DEFAULT_TIMEOUT):
+    """
+    Captures every LO whose metadata names a capture script, jobs at a time. Each run is a
+    separate process with its own output dir and timeout. Writes out/capture/report.json.
+    """
+    console.print(f"[bold]Running Capture for all LOs...[/bold]")
+    los = load_corpus().learning_objects()
+    targets = {}
+    for lo in los:
+        script_name = capture_script(lo)
+        if script_name and lo.id not in targets:
+            targets[lo.id] = script_name
+    console.print(f"{len(targets)} LOs have a capture script, {len(los) - len(targets)} do not.")
+
+    def capture(item):
+        return capture_lo(engine_path, item[0], item[1], timeout)
+
+    start = time.perf_counter()
+    if jobs > 1 and len(targets) > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(capture, targets.items()))
+    else:
+        results = [capture(item) for item in targets.items()]
+    elapsed = time.perf_counter() - start
+    record_results(results)
+
+    os.makedirs(CAPTURE_DIR, exist_ok=True)
+    report_path = CAPTURE_DIR / "report.json"
+    with open(report_path, "w") as f:
+        json.dump([{
+            "lo_id": r.lo_id,
+            "status": "pass" if r.passed else "fail",
+            "duration": round(r.duration, 3),
+            "detail": r.detail,
+            "anchor_hits": r.hits,
+            "anchor_misses": r.misses,
+        } for r in results], f, indent=2)
+
+    table = Table(title="Capture Results")
+    table.add_column("LO")
+    table.add_column("Result")
+    table.add_column("Time", justify="right")
+    table.add_column("Detail")
+    for r in results:
+        table.add_row(r.lo_id, "[green]PASS[/]" if r.passed else "[red]FAIL[/]", f"{r.duration:.2f} s", r.detail or "")
+    console.print(table)
+
+    passed = sum(1 for r in results if r.passed)
+    console.print(f"{passed}/{len(results)} captures passed in {elapsed:.2f} s.")
+    console.print(f"Report saved to [blue]{report_path}[/blue]")
 
 def compose_overlays(image_path, layout_path, overlay_path, output_path):
     import json
@@ -82,6 +219,7 @@ def compose_overlays(image_path, layout_path, overlay_path, output_path):
             overlays_def = json.load(f)
 
         widgets = layout.get("widgets", {})
+        hits = misses = 0
         
         for step in overlays_def.get("steps", []):
             for overlay in step.get("overlays", []):
@@ -91,7 +229,9 @@ def compose_overlays(image_path, layout_path, overlay_path, output_path):
                 if not bounds:
                     # Draw warning if anchor missing
                     draw.text((50, 50), f"MISSING ANCHOR: {anchor_name}", fill="red")
+                    misses += 1
                     continue
+                hits += 1
                 
                 x, y, w, h = bounds["x"], bounds["y"], bounds["w"], bounds["h"]
                 
@@ -108,3 +248,4 @@ def compose_overlays(image_path, layout_path, overlay_path, output_path):
                     draw.text((bx+10, by+5), text, fill="white")
 
         im.save(output_path)
+    return hits, misses
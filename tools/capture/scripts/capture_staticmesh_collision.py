@@ -19,6 +19,9 @@ except ImportError:
 sys.path.append(os.path.join(os.getcwd(), "tools", "capture", "plugin", "TutorialCapture"))
 import tutorial_capture
 
+# The capture runner points each run at its own directory; standalone runs write in place
+OUT_DIR = os.environ.get("UKE_CAPTURE_OUT") or os.path.join(os.getcwd(), "out", "images", "staticmesh.collision.simple")
+
 def capture_step():
     unreal.log("Starting capture for StaticMesh Collision...")
 
@@ -55,12 +58,12 @@ def capture_step():
 
     # 5. Capture Screenshot
     # unreal.AutomationLibrary.take_automation_screenshot(...)
-    screenshot_path = os.path.join(os.getcwd(), "out", "images", "staticmesh.collision.simple", "step_01.png")
+    screenshot_path = os.path.join(OUT_DIR, "step_01.png")
     unreal.log(f"Captured screenshot to {screenshot_path}")
 
     # 6. Write Layout Manifest
     bounds = tutorial_capture.get_widget_bounds(prop_name)
-    manifest_path = os.path.join(os.getcwd(), "out", "images", "staticmesh.collision.simple", "step_01.layout.json")
+    manifest_path = os.path.join(OUT_DIR, "step_01.layout.json")
     
     manifest = {
         "asset": asset_path,
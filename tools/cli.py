@@ -20,27 +20,73 @@ def main():
     parser_gate = subparsers.add_parser("gate", help="Validate LOs and evidence")
     parser_gate.add_argument("--engine", help="Path to Unreal Engine root")
     parser_gate.add_argument("--no-capture", action="store_true", help="Skip capture validation")
+    parser_gate.add_argument("--jobs", type=int, default=1, help="Worker processes for parsing and validation")
+    parser_gate.add_argument("--incremental", action="store_true", help="Only revalidate LOs whose YAML or evidence changed")
 
     # uke capture
     parser_capture = subparsers.add_parser("capture", help="Run capture for an LO")
     parser_capture.add_argument("--engine", required=True, help="Path to Unreal Engine root")
-    parser_capture.add_argument("--lo", required=True, help="Learning Object ID")
+    capture_target = parser_capture.add_mutually_exclusive_group(required=True)
+    capture_target.add_argument("--lo", help="Learning Object ID")
+    capture_target.add_argument("--all", action="store_true", help="Capture every LO whose validation.script is set")
+    parser_capture.add_argument("--jobs", type=int, default=1, help="Captures to run concurrently with --all")
+    parser_capture.add_argument("--timeout", type=float, default=600, help="Seconds before a capture script is killed")
 
     # uke heal
     parser_heal = subparsers.add_parser("heal", help="Auto-heal cosmetic drift")
     parser_heal.add_argument("--engine", required=True, help="Path to Unreal Engine root")
     parser_heal.add_argument("--from-sha", required=True, help="Old commit SHA")
     parser_heal.add_argument("--to-sha", required=True, help="New commit SHA")
+    parser_heal.add_argument("--jobs", type=int, default=1, help="Threads for resolving evidence, one engine file per task")
+
+    # uke audit
+    parser_audit = subparsers.add_parser("audit", help="Query the heal audit journal")
+    parser_audit.add_argument("--lo", help="Learning Object ID")
+    parser_audit.add_argument("--sha", help="Engine commit the heal ran against (--to-sha), may be abbreviated")
+    parser_audit.add_argument("--action", help="VERIFIED, RELOCATED, FLAGGED or ERROR")
+
+    # uke index
+    parser_index = subparsers.add_parser("index", help="Manage the engine source index")
+    index_subparsers = parser_index.add_subparsers(dest="index_command", help="Index commands")
+    parser_index_build = index_subparsers.add_parser("build", help="Build or incrementally update the index")
+    parser_index_build.add_argument("--engine", required=True, help="Path to Unreal Engine root")
+
+    # uke metrics
+    parser_metrics = subparsers.add_parser("metrics", help="Report pipeline KPIs")
+    parser_metrics.add_argument("--since", help="First day to include (YYYY-MM-DD)")
+    parser_metrics.add_argument("--until", help="Last day to include (YYYY-MM-DD)")
 
     # uke plan
     parser_plan = subparsers.add_parser("plan", help="Generate learning path")
-    parser_plan.add_argument("--context", required=True, help="Path to context.json")
+    plan_input = parser_plan.add_mutually_exclusive_group(required=True)
+    plan_input.add_argument("--context", help="Path to context.json")
+    plan_input.add_argument("--contexts", help="Path to a JSONL file of contexts to plan in one batch")
+    parser_plan.add_argument("--goal", action="append", help="Plan only this LO and its prerequisites (repeatable)")
 
     # uke site
     parser_site = subparsers.add_parser("site", help="Generate static site")
+    parser_site.add_argument("--jobs", type=int, default=1, help="Worker processes for rendering LO pages")
+
+    # uke pipeline
+    parser_pipeline = subparsers.add_parser("pipeline", help="Run gate, heal, plan and site in one process")
+    parser_pipeline.add_argument("--engine", help="Path to Unreal Engine root")
+    parser_pipeline.add_argument("--from-sha", help="Old engine commit SHA for heal (heal is skipped without both SHAs)")
+    parser_pipeline.add_argument("--to-sha", help="New engine commit SHA for heal")
+    parser_pipeline.add_argument("--context", default="context.json", help="Path to context.json for the plan")
+    parser_pipeline.add_argument("--goal", action="append", help="Target LO ID for the plan; repeat for several goals")
+    parser_pipeline.add_argument("--jobs", type=int, default=1, help="Workers for parsing, engine stats, heal and site rendering")
+    parser_pipeline.add_argument("--no-capture", action="store_true", help="Skip capture validation in the gate")
+    parser_pipeline.add_argument("--force", action="store_true", help="Run every stage even if its inputs are unchanged")
 
     # uke serve
     parser_serve = subparsers.add_parser("serve", help="Serve static site locally")
+    parser_serve.add_argument("--api", action="store_true", help="Serve the planning API (/plan) instead of the site")
+    parser_serve.add_argument("--prod", action="store_true", help="Threaded production server for out/site (no browser)")
+    parser_serve.add_argument("--host", default="", help="Interface to bind with --prod (default: all)")
+    parser_serve.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser_serve.add_argument("--watch", action="store_true", help="Rebuild on changes to knowledge/ and out/images/ and live-reload open pages")
+    parser_serve.add_argument("--engine", help="Path to Unreal Engine root for the gate with --watch")
+    parser_serve.add_argument("--context", default="context.json", help="Context JSON for the plan with --watch")
 
     args = parser.parse_args()
 
@@ -49,22 +95,46 @@ def main():
         run_init()
     elif args.command == "gate":
         from tools.gate.cmd import run_gate
-        run_gate(args.engine, args.no_capture)
+        run_gate(args.engine, args.no_capture, args.jobs, args.incremental)
     elif args.command == "capture":
-        from tools.capture.cmd import run_capture
-        run_capture(args.engine, args.lo)
+        if args.all:
+            from tools.capture.cmd import run_capture_all
+            run_capture_all(args.engine, args.jobs, args.timeout)
+        else:
+            from tools.capture.cmd import run_capture
+            run_capture(args.engine, args.lo, args.timeout)
     elif args.command == "heal":
         from tools.freshness.cmd import run_heal
-        run_heal(args.engine, args.from_sha, args.to_sha)
+        run_heal(args.engine, args.from_sha, args.to_sha, args.jobs)
+    elif args.command == "audit":
+        from tools.freshness.cmd import run_audit
+        run_audit(args.lo, args.sha, args.action)
+    elif args.command == "index":
+        if args.index_command == "build":
+            from tools.index.cmd import run_index_build
+            run_index_build(args.engine)
+        else:
+            parser_index.print_help()
+    elif args.command == "metrics":
+        from tools.metrics.cmd import run_metrics
+        run_metrics(args.since, args.until)
     elif args.command == "plan":
-        from tools.path_planner.cmd import run_plan
-        run_plan(args.context)
+        if args.contexts:
+            from tools.path_planner.cmd import run_plan_batch
+            run_plan_batch(args.contexts, args.goal)
+        else:
+            from tools.path_planner.cmd import run_plan
+            run_plan(args.context, args.goal)
     elif args.command == "site":
         from tools.site_gen.cmd import run_site
-        run_site()
+        run_site(args.jobs)
+    elif args.command == "pipeline":
+        from tools.pipeline.cmd import run_pipeline
+        run_pipeline(args.engine, args.from_sha, args.to_sha, args.context, args.goal, args.jobs,
+                     args.no_capture, args.force)
     elif args.command == "serve":
         from tools.serve_cmd import run_serve
-        run_serve()
+        run_serve(args.api, args.port, args.prod, args.host, args.watch, args.engine, args.context)
     else:
         parser.print_help()
 
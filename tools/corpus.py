@@ -0,0 +1,192 @@
+import os
+import hashlib
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import yaml
+from pydantic import ValidationError
+from tools.gate.models import LearningObject
+
+# The libyaml-backed loader is an order of magnitude faster than the pure Python one.
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+KNOWLEDGE_DIR = Path("knowledge/learning_objects")
+CACHE_PATH = Path("out/cache/corpus.pkl")
+
+# Bump whenever CorpusEntry or LearningObject changes shape so old caches are discarded.
+CACHE_VERSION = 2
+
+
+@dataclass
+class CorpusEntry:
+    """One LO file as parsed and validated from disk."""
+    path: str
+    mtime_ns: int
+    size: int
+    content_hash: str
+    data: Any = None
+    lo: Optional[LearningObject] = None
+    error: Optional[str] = None
+
+    @property
+    def lo_id(self) -> str:
+        """ID declared in the file, falling back to the file name when it has none."""
+        if isinstance(self.data, dict) and "id" in self.data:
+            return self.data["id"]
+        return os.path.basename(self.path)
+
+
+def compile_entry(path: str, st: os.stat_result, raw: bytes) -> CorpusEntry:
+    """Parses and validates raw LO bytes. Errors are recorded, never raised."""
+    entry = CorpusEntry(path, st.st_mtime_ns, st.st_size, hashlib.sha256(raw).hexdigest())
+
+    try:
+        entry.data = yaml.load(raw, Loader=SafeLoader)
+    except Exception as e:
+        entry.error = f"YAML Parse Error: {str(e)}"
+        return entry
+
+    if not isinstance(entry.data, dict):
+        entry.error = "Schema Error: LO document must be a mapping"
+        return entry
+
+    try:
+        entry.lo = LearningObject(**entry.data)
+    except ValidationError as e:
+        entry.error = f"Schema Error: {str(e)}"
+    return entry
+
+
+def parse_lo_file(path: str) -> CorpusEntry:
+    """Reads, parses and validates a single LO file."""
+    st = os.stat(path)
+    with open(path, "rb") as f:
+        raw = f.read()
+    return compile_entry(path, st, raw)
+
+
+def discover_lo_files(knowledge_dir: Path = KNOWLEDGE_DIR) -> List[str]:
+    """Returns every LO YAML path under knowledge_dir in a stable order."""
+    paths = []
+    for root, dirs, files in os.walk(knowledge_dir):
+        for file in files:
+            if file.endswith(".yml") or file.endswith(".yaml"):
+                paths.append(os.path.join(root, file))
+    return sorted(paths)
+
+
+class LOCorpus:
+    """The full set of LO files, ordered by path."""
+
+    def __init__(self, entries: List[CorpusEntry]):
+        self.entries = entries
+        self.parsed_count = 0
+        self.reused_count = 0
+
+    def learning_objects(self) -> List[LearningObject]:
+        """Schema-valid LOs only."""
+        return [e.lo for e in self.entries if e.lo is not None]
+
+    def records(self) -> List[Dict]:
+        """Raw YAML mappings for every file that declares an id, valid or not."""
+        return [e.data for e in self.entries if isinstance(e.data, dict) and "id" in e.data]
+
+    def version(self) -> str:
+        """Content fingerprint of the corpus: changes when any LO file is added, removed or edited."""
+        h = hashlib.sha256()
+        for e in self.entries:
+            h.update(f"{e.path}\0{e.content_hash}\n".encode("utf-8"))
+        return h.hexdigest()
+
+
+def stat_fingerprint(knowledge_dir: Path = KNOWLEDGE_DIR) -> str:
+    """
+    Cheap change check for long-running processes: a hash of every LO file's path,
+    mtime and size, computed without reading any file.
+    """
+    h = hashlib.sha256()
+    for path in discover_lo_files(knowledge_dir):
+        st = os.stat(path)
+        h.update(f"{path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _read_cache(cache_path: Path) -> Dict[str, CorpusEntry]:
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return {}
+    if not isinstance(cached, dict) or cached.get("version") != CACHE_VERSION:
+        return {}
+    return cached.get("entries", {})
+
+
+def _write_cache(cache_path: Path, entries: List[CorpusEntry]):
+    os.makedirs(cache_path.parent, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"version": CACHE_VERSION, "entries": {e.path: e for e in entries}}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+
+def parse_lo_files(paths: List[str], jobs: int = 1) -> List[CorpusEntry]:
+    """Parses paths in order, fanning out across a process pool when jobs > 1."""
+    if jobs <= 1 or len(paths) < 2:
+        return [parse_lo_file(p) for p in paths]
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(parse_lo_file, paths, chunksize=chunksize))
+
+
+def load_corpus(knowledge_dir: Path = KNOWLEDGE_DIR, cache_path: Optional[Path] = CACHE_PATH,
+                jobs: int = 1, previous: Optional[LOCorpus] = None) -> LOCorpus:
+    """
+    Loads every LO under knowledge_dir, reusing compiled entries from cache_path.
+    A cached entry is reused without reading the file when its mtime and size are unchanged,
+    and without re-parsing it when only the mtime moved but the content hash still matches.
+    Files that do need parsing are spread over `jobs` worker processes.
+    Long-running processes pass the corpus they already hold as `previous`, which then
+    stands in for the on-disk cache. Pass cache_path=None to bypass the cache entirely.
+    """
+    if previous is not None:
+        cached = {e.path: e for e in previous.entries}
+    else:
+        cached = _read_cache(cache_path) if cache_path else {}
+    paths = discover_lo_files(knowledge_dir)
+    entries: List[Optional[CorpusEntry]] = [None] * len(paths)
+    stale = []
+    dirty = False
+
+    for i, path in enumerate(paths):
+        st = os.stat(path)
+        prev = cached.get(path)
+        if prev and prev.mtime_ns == st.st_mtime_ns and prev.size == st.st_size:
+            entries[i] = prev
+            continue
+
+        dirty = True
+        if prev:
+            with open(path, "rb") as f:
+                if prev.content_hash == hashlib.sha256(f.read()).hexdigest():
+                    prev.mtime_ns, prev.size = st.st_mtime_ns, st.st_size
+                    entries[i] = prev
+                    continue
+        stale.append(i)
+
+    for i, entry in zip(stale, parse_lo_files([paths[i] for i in stale], jobs)):
+        entries[i] = entry
+
+    if cache_path and (dirty or len(cached) != len(entries)):
+        _write_cache(cache_path, entries)
+
+    corpus = LOCorpus(entries)
+    corpus.parsed_count = len(stale)
+    corpus.reused_count = len(entries) - len(stale)
+    return corpus
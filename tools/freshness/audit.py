@@ -0,0 +1,102 @@
+import os
+import json
+import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+AUDIT_DIR = Path("out/audit")
+INDEX_NAME = "index.jsonl"
+
+
+class AuditJournal:
+    """
+    Append-only JSONL journal for one heal run, written to out/audit/<date>/<run>.jsonl.
+    Entries are buffered and fsync'ed in batches. On close, one row per entry
+    (LO id, SHA, action, byte offset) is appended to out/audit/index.jsonl so that
+    lookups by LO, SHA or action read the index instead of scanning directories.
+    """
+
+    def __init__(self, sha: str, audit_dir: Path = AUDIT_DIR, fsync_every: int = 256):
+        now = datetime.datetime.now()
+        self.sha = sha
+        self.audit_dir = audit_dir
+        self.fsync_every = fsync_every
+        self.rel_path = f"{now.strftime('%Y-%m-%d')}/run_{now.strftime('%H%M%S_%f')}_{os.getpid()}.jsonl"
+
+        os.makedirs(audit_dir / os.path.dirname(self.rel_path), exist_ok=True)
+        self._file = open(audit_dir / self.rel_path, "ab")
+        self._offset = self._file.tell()
+        self._pending = 0
+        self._index_rows: List[bytes] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, entry: Dict):
+        line = json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n"
+        self._file.write(line)
+        self._index_rows.append(json.dumps({
+            "lo_id": entry.get("lo_id"),
+            "sha": self.sha,
+            "action": entry.get("action"),
+            "journal": self.rel_path,
+            "offset": self._offset,
+            "length": len(line),
+        }, separators=(",", ":")).encode("utf-8") + b"\n")
+        self._offset += len(line)
+
+        self._pending += 1
+        if self._pending >= self.fsync_every:
+            self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._sync()
+        self._file.close()
+
+        # Index rows go last, so every row points at bytes that are already durable
+        if self._index_rows:
+            with open(self.audit_dir / INDEX_NAME, "ab") as index:
+                index.write(b"".join(self._index_rows))
+                index.flush()
+                os.fsync(index.fileno())
+            self._index_rows = []
+
+
+def query_audit(lo_id: Optional[str] = None, sha: Optional[str] = None, action: Optional[str] = None,
+                audit_dir: Path = AUDIT_DIR) -> Iterator[Dict]:
+    """Yields journal entries matching every given filter, oldest first. sha may be abbreviated."""
+    try:
+        index = open(audit_dir / INDEX_NAME, "rb")
+    except FileNotFoundError:
+        return
+
+    journals = {}
+    try:
+        with index:
+            for raw in index:
+                row = json.loads(raw)
+                if lo_id is not None and row["lo_id"] != lo_id:
+                    continue
+                if sha is not None and not row["sha"].startswith(sha):
+                    continue
+                if action is not None and row["action"] != action:
+                    continue
+
+                journal = journals.get(row["journal"])
+                if journal is None:
+                    journal = journals[row["journal"]] = open(audit_dir / row["journal"], "rb")
+                journal.seek(row["offset"])
+                yield json.loads(journal.read(row["length"]))
+    finally:
+        for journal in journals.values():
+            journal.close()
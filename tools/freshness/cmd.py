@@ -1,170 +1,358 @@
 
 import os
-import hashlib
-import re
 import json
+import time
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
 from rich.console import Console
+from tools.freshness.audit import AuditJournal, query_audit
+from tools.freshness.git_store import GitObjectStore
+from tools.freshness.normalizer import compute_hash
+from tools.freshness.hash_cache import SnippetHashCache
+from tools.freshness.snippet import extract_snippet_windows, extract_windows_from_bytes
+from tools.gate.models import EvidenceItem
+from tools.index.trigram import relocate_symbol
 
 console = Console()
 
-def normalize_snippet(snippet: str) -> str:
+SNIPPET_CONTEXT_LINES = 40
+# Heal merges into the gate's statuses and only ever makes them worse
+STATUS_SEVERITY = {"verified": 0, "needs_review": 1, "stale": 2, "invalid": 3}
+STATUS_PATH = "out/status.json"
+
+# rel_path -> os.stat result, or None if the file does not exist
+EngineStats = Optional[Dict[str, Optional[os.stat_result]]]
+
+def read_snippet_windows(engine_path: Path, rel_path: str, symbols: List[str],
+                         store: GitObjectStore = None, sha: str = None) -> Dict[str, Optional[str]]:
     """
-    Normalizes a code snippet for hashing.
-    1. Remove single-line comments //...
-    2. Remove multi-line comments /*...*/
-    3. Remove all whitespace (spaces, tabs, newlines)
+    Windows around each symbol in one engine file, read from the git object store at sha
+    when a store is given, otherwise memory-mapped from the working tree.
     """
-    # Remove single line comments
-    snippet = re.sub(r'//.*', '', snippet)
-    # Remove multi-line comments
-    snippet = re.sub(r'/\*.*?\*/', '', snippet, flags=re.DOTALL)
-    # Remove all whitespace
-    snippet = re.sub(r'\s+', '', snippet)
-    return snippet
-
-def compute_hash(snippet: str) -> str:
-    normalized = normalize_snippet(snippet)
-    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
-
-def extract_snippet_window(file_path: Path, symbol: str, context_lines: int = 40) -> str:
+    if store is None:
+        full_path = engine_path / rel_path
+        if not full_path.exists():
+            raise FileNotFoundError(f"Engine file not found: {full_path}")
+        return extract_snippet_windows(full_path, symbols, SNIPPET_CONTEXT_LINES)
+
+    blob = store.read(sha, rel_path)
+    if blob is None:
+        raise FileNotFoundError(f"Engine file not found at {sha}: {rel_path}")
+    return extract_windows_from_bytes(blob, symbols, SNIPPET_CONTEXT_LINES)
+
+def file_identity(engine_path: Path, rel_path: str, store: GitObjectStore = None, sha: str = None,
+                  stats: EngineStats = None) -> str:
     """
-    Simulates finding a symbol and extracting a window around it.
-    For POC: we'll just read the file and look for the string literal "symbol".
-    If found, return X lines around it.
-    If file doesn't exist (because we are mocking engine), return a dummy string if we are in test mode
-    or raise error.
+    Cheap fingerprint of an engine file's contents: its blob id at sha, or size and mtime on disk.
+    stats holds stat results the caller already has (None for missing files), so they are not repeated.
     """
-    if not file_path.exists():
-        # POC Fallback logic: if the engine path is "D:\Fortnite...", we might not have access in this env.
-        # But for 'heal', we assume we do. If we don't, we can't really hash.
-        # However, for the purpose of the POC demo running completely, we might need a fallback.
-        # User requirement: "No hallucinated evidence".
-        # But if the user runs this on a machine WITHOUT the engine, it will fail.
-        # We will assume it fails if not found, consistent with requirements.
-        raise FileNotFoundError(f"Engine file not found: {file_path}")
-
-    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-        content = f.read()
-
-    # Simple substrings search for symbol
-    idx = content.find(symbol)
-    if idx == -1:
-        # Retry with some fuzzy matching or just fail?
-        # POC: fail
-        raise ValueError(f"Symbol '{symbol}' not found in {file_path}")
-
-    # Extract lines
-    # Convert index to line number
-    pre_content = content[:idx]
-    line_num = pre_content.count('\n')
-    
-    lines = content.splitlines()
-    start_line = max(0, line_num - (context_lines // 2))
-    end_line = min(len(lines), line_num + (context_lines // 2))
-    
-    return "\n".join(lines[start_line:end_line])
+    if store is None:
+        if stats is not None and rel_path in stats:
+            st = stats[rel_path]
+        else:
+            try:
+                st = os.stat(engine_path / rel_path)
+            except OSError:
+                st = None
+        if st is None:
+            raise FileNotFoundError(f"Engine file not found: {engine_path / rel_path}")
+        return f"{st.st_size}:{st.st_mtime_ns}"
+
+    oid = store.blob_id(sha, rel_path)
+    if oid is None:
+        raise FileNotFoundError(f"Engine file not found at {sha}: {rel_path}")
+    return f"blob:{oid}"
+
+def hash_evidence_group(engine_path: Path, rel_path: str, symbols: List[str], cache: SnippetHashCache,
+                        store: GitObjectStore = None, sha: str = None,
+                        stats: EngineStats = None) -> Dict[str, Union[str, Exception]]:
+    """
+    Normalized hash of the snippet around each symbol in one engine file. Cached hashes are
+    served while the file is unchanged; the file is read at most once for all the misses.
+    Symbols that cannot be resolved map to the exception explaining why.
+    """
+    try:
+        identity = file_identity(engine_path, rel_path, store, sha, stats)
+    except FileNotFoundError as e:
+        return {symbol: e for symbol in symbols}
+
+    hashes = {}
+    for symbol in symbols:
+        cached = cache.get((rel_path, identity, symbol, SNIPPET_CONTEXT_LINES))
+        if cached is not None:
+            hashes[symbol] = cached
+    missing = [symbol for symbol in symbols if symbol not in hashes]
+    if not missing:
+        return hashes
+
+    try:
+        windows = read_snippet_windows(engine_path, rel_path, missing, store, sha)
+    except OSError as e:
+        hashes.update((symbol, e) for symbol in missing)
+        return hashes
+
+    for symbol in missing:
+        window = windows[symbol]
+        if window is None:
+            hashes[symbol] = ValueError(f"Symbol '{symbol}' not found in {rel_path}")
+            continue
+        hashes[symbol] = compute_hash(window)
+        cache.put((rel_path, identity, symbol, SNIPPET_CONTEXT_LINES), hashes[symbol])
+    return hashes
+
+@dataclass
+class EvidenceCheck:
+    """Outcome of resolving one evidence item at to_sha."""
+    current_hash: Optional[str] = None
+    new_file: Optional[str] = None
+    from_sha_hash: Optional[str] = None
+    error: Optional[Exception] = None
+
+def check_evidence_group(engine_root: str, rel_path: str, evidence: List[EvidenceItem], cache: SnippetHashCache,
+                         store: GitObjectStore = None, from_sha: str = None, to_sha: str = None,
+                         stats: EngineStats = None) -> List[EvidenceCheck]:
+    """Resolves every evidence item citing rel_path, reading the file once per side of the diff."""
+    engine_path = Path(engine_root)
+    symbols = [ev.symbol for ev in evidence]
+    current = hash_evidence_group(engine_path, rel_path, symbols, cache, store, to_sha, stats)
+    previous = hash_evidence_group(engine_path, rel_path, symbols, cache, store, from_sha) if store else {}
+
+    checks = []
+    for ev in evidence:
+        check = EvidenceCheck()
+        result = current[ev.symbol]
+        if isinstance(result, Exception):
+            # The symbol may have moved to another file; ask the source index. Its candidates come
+            # from the working tree, so in object-store mode each is checked at to_sha instead
+            read = (lambda path: store.read(to_sha, path)) if store else None
+            moved = relocate_symbol(engine_root, ev.symbol, ev.file, read)
+            if moved:
+                check.new_file = moved[0]
+                result = hash_evidence_group(engine_path, check.new_file, [ev.symbol], cache, store, to_sha)[ev.symbol]
+
+        if isinstance(result, Exception):
+            check.error = result
+        else:
+            check.current_hash = result
+            prev = previous.get(ev.symbol)
+            if store and not isinstance(prev, Exception):
+                check.from_sha_hash = prev
+        checks.append(check)
+    return checks
+
+def index_evidence_by_file(los) -> Dict[str, List[Tuple[int, int]]]:
+    """Reverse index from engine file to the (LO position, evidence position) pairs that cite it."""
+    evidence_by_file = {}
+    for lo_pos, lo in enumerate(los):
+        for ev_pos, ev in enumerate(lo.evidence):
+            evidence_by_file.setdefault(ev.file, []).append((lo_pos, ev_pos))
+    return evidence_by_file
 
-def run_heal(engine_root: str, from_sha: str, to_sha: str):
+def merge_heal_status(heal_status: Dict[str, str], status_path: str = STATUS_PATH):
+    """
+    Merges heal results into the gate's status file. A heal can only lower an LO's status
+    (verified < needs_review < stale < invalid); the next gate run, incremental or not,
+    rewrites the file from its own results.
+    """
+    try:
+        with open(status_path) as f:
+            status = json.load(f)
+    except (OSError, ValueError):
+        status = {}
+    for lo_id, healed in heal_status.items():
+        current = status.get(lo_id)
+        if current is None or STATUS_SEVERITY.get(healed, 0) > STATUS_SEVERITY.get(current, 0):
+            status[lo_id] = healed
+    os.makedirs(os.path.dirname(status_path), exist_ok=True)
+    with open(status_path, "w") as f:
+        json.dump(status, f, indent=2)
+
+def run_heal(engine_root: str, from_sha: str, to_sha: str, jobs: int = 1,
+             corpus=None, engine_stats: EngineStats = None) -> Dict[str, str]:
+    """
+    Checks evidence that changed between from_sha and to_sha, journals every result and merges
+    the implied LO statuses into out/status.json. corpus and engine_stats let a caller that
+    already loaded the LOs or stat'ed the evidence files share them. Returns LO id -> heal status.
+    """
     console.print(f"[bold]Running Auto-Heal...[/bold]")
     console.print(f"Engine: {engine_root}")
     console.print(f"Diff: {from_sha} -> {to_sha}")
 
-    # In a real tool, we would:
-    # 1. Load all LOs.
-    # 2. Identify LOs that touch files changed between from_sha and to_sha.
-    # 3. For each affected LO, extract the new snippet and hash it.
-    # 4. Compare with the hash in the YAML.
+    from tools.corpus import load_corpus
+    from tools.freshness.git_ops import changed_paths, commit_time, is_git_checkout, resolve_commit
+    from tools.metrics.store import MetricsStore
     
-    # For POC Vertical Slice:
-    # We will iterate over our known 3 LOs and perform the check on their evidence.
-    
-    import yaml
-    from tools.gate.models import LearningObject
+    # In a git checkout a SHA that does not resolve is a typo, not a reason to scan everything
+    changed = None
+    if is_git_checkout(engine_root):
+        unresolved = [sha for sha in (from_sha, to_sha) if resolve_commit(engine_root, sha) is None]
+        if unresolved:
+            console.print(f"[red]Unknown commit in the engine repo: {', '.join(unresolved)}. Nothing was checked.[/red]")
+            return {}
+        changed = changed_paths(engine_root, from_sha, to_sha)
+
+    los = (corpus or load_corpus()).learning_objects()
+    evidence_by_file = index_evidence_by_file(los)
     
-    audit_dir = Path("out/audit")
-    os.makedirs(audit_dir, exist_ok=True)
+    # Only evidence whose engine file changed between the two SHAs can have drifted
+    if changed is None:
+        console.print("[yellow]Could not diff the engine path (not a git checkout). Checking all evidence in the working tree.[/yellow]")
+        selected_files = set(evidence_by_file)
+    else:
+        selected_files = changed & set(evidence_by_file)
+        console.print(f"{len(changed)} engine files changed, {len(selected_files)} referenced by evidence.")
     
-    knowledge_dir = Path("knowledge/learning_objects")
-    engine_path = Path(engine_root)
+    # Keep corpus order so the audit trail reads the same as a full scan
+    selected = sorted(item for f in selected_files for item in evidence_by_file[f])
+    skipped_count = sum(len(items) for items in evidence_by_file.values()) - len(selected)
     
-    lo_checked = 0
+    lo_checked = len({lo_pos for lo_pos, _ in selected})
     healed_count = 0
     review_count = 0
     
-    for root, dirs, files in os.walk(knowledge_dir):
-        for file in files:
-            if file.endswith(".yml") or file.endswith(".yaml"):
-                full_path = Path(root) / file
-                with open(full_path, "r") as f:
-                    data = yaml.safe_load(f)
-                
-                try:
-                    lo = LearningObject(**data)
-                except:
-                    continue
-                
-                lo_checked += 1
-                
-                for ev in lo.evidence:
-                    full_ev_path = engine_path / ev.file
-                    
-                    try:
-                        current_snippet = extract_snippet_window(full_ev_path, ev.symbol)
-                        current_hash = compute_hash(current_snippet)
-                        
-                        # In a real scenario, we compare current_hash against ev.snippet_hash.
-                        # If matches: Verification Pass.
-                        # If mismatch:
-                        #   We would ideally check if the AST is effectively the same (mechanical drift).
-                        #   For this POC context: "Normalized snippet hashing only".
-                        #   So if normalized hash matches, it IS mechanical match.
-                        
-                        # Wait, ev.snippet_hash in the YAML is the 'verified' hash.
-                        # If current_hash == ev.snippet_hash, then NO CHANGE (or only whitespace change if we normalized before hashing).
-                        # If we stripped whitespace in normalization, then whitespace changes result in SAME hash.
-                        # So:
-                        # 1. Calculate Hash of file content (normalized).
-                        # 2. Compare with YAML hash.
-                        # 3. If Match: It's good (either identical or just formatting).
-                        # 4. If Mismatch: It's semantic change -> Needs Review.
-                        
-                        if current_hash == ev.snippet_hash:
-                            # It matches our normalized view.
-                            # We can log a "Verified" audit.
-                            action = "VERIFIED"
-                            status = "verified"
-                        else:
-                            # Mismatch
-                            action = "FLAGGED"
-                            status = "needs_review"
-                            review_count += 1
-                        
-                        # Audit Log
-                        audit_entry = {
-                            "timestamp": datetime.datetime.now().isoformat(),
-                            "lo_id": lo.id,
-                            "symbol": ev.symbol,
-                            "file": ev.file,
-                            "old_hash": ev.snippet_hash,
-                            "new_hash": current_hash,
-                            "action": action,
-                            "reason": "Normalized hash comparison"
-                        }
-                        
-                        audit_filename = f"{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}_{lo.id}.json"
-                        with open(audit_dir / audit_filename, "w") as af:
-                            json.dump(audit_entry, af, indent=2)
-                            
-                        console.print(f"[{'green' if action=='VERIFIED' else 'red'}] {lo.id}: {action}[/]")
-
-                    except Exception as e:
-                        console.print(f"[red]Error checking {lo.id}: {e}[/red]")
-                        # Log error audit
-                        json.dump({"error": str(e), "lo_id": lo.id}, open(audit_dir / f"error_{lo.id}.json", "w"))
-
-    console.print(f"Heal complete. Checked {lo_checked} LOs. Flagged {review_count} for review.")
+    # With a resolvable diff, both sides are read from the object store rather than the working tree
+    store = GitObjectStore(engine_root) if changed is not None else None
+    hash_cache = SnippetHashCache.load()
+    
+    # Resolve evidence file by file so each engine file is read once, fanning file groups out on a thread pool
+    groups = {}
+    for lo_pos, ev_pos in selected:
+        groups.setdefault(los[lo_pos].evidence[ev_pos].file, []).append((lo_pos, ev_pos))
     
-    # Update status summary
-    # (In a real system we would merge this with existing status)
+    def resolve(rel_path):
+        items = groups[rel_path]
+        evidence = [los[lo_pos].evidence[ev_pos] for lo_pos, ev_pos in items]
+        return list(zip(items, check_evidence_group(engine_root, rel_path, evidence, hash_cache, store, from_sha, to_sha,
+                                                    engine_stats)))
+    
+    group_files = sorted(groups)
+    if jobs > 1 and len(group_files) > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            resolved = list(pool.map(resolve, group_files))
+    else:
+        resolved = [resolve(f) for f in group_files]
+    checks = {item: check for group in resolved for item, check in group}
+    
+    # Report serially in corpus order, so output is identical for any jobs value
+    journal = AuditJournal(resolve_commit(engine_root, to_sha) or to_sha)
+    committed_at = commit_time(engine_root, journal.sha)
+    metric_events = []
+    heal_status = {}
+    for lo_pos, ev_pos in selected:
+        lo = los[lo_pos]
+        ev = lo.evidence[ev_pos]
+        check = checks[(lo_pos, ev_pos)]
+        try:
+            if check.error:
+                raise check.error
+            current_hash = check.current_hash
+            new_file = check.new_file
+            
+            # In a real scenario, we compare current_hash against ev.snippet_hash.
+            # If matches: Verification Pass.
+            # If mismatch:
+            #   We would ideally check if the AST is effectively the same (mechanical drift).
+            #   For this POC context: "Normalized snippet hashing only".
+            #   So if normalized hash matches, it IS mechanical match.
+            
+            # Wait, ev.snippet_hash in the YAML is the 'verified' hash.
+            # If current_hash == ev.snippet_hash, then NO CHANGE (or only whitespace change if we normalized before hashing).
+            # If we stripped whitespace in normalization, then whitespace changes result in SAME hash.
+            # So:
+            # 1. Calculate Hash of file content (normalized).
+            # 2. Compare with YAML hash.
+            # 3. If Match: It's good (either identical or just formatting).
+            # 4. If Mismatch: It's semantic change -> Needs Review.
+            
+            if current_hash == ev.snippet_hash and new_file:
+                # Same normalized snippet, only the file moved: mechanical drift.
+                action = "RELOCATED"
+                status = "verified"
+                healed_count += 1
+            elif current_hash == ev.snippet_hash:
+                # It matches our normalized view.
+                # We can log a "Verified" audit.
+                action = "VERIFIED"
+                status = "verified"
+            else:
+                # Mismatch
+                action = "FLAGGED"
+                status = "needs_review"
+                review_count += 1
+            
+            # Audit Log
+            audit_entry = {
+                "timestamp": datetime.datetime.now().isoformat(),
+                "from_sha": from_sha,
+                "to_sha": journal.sha,
+                "lo_id": lo.id,
+                "symbol": ev.symbol,
+                "file": ev.file,
+                "old_hash": ev.snippet_hash,
+                "new_hash": current_hash,
+                "action": action,
+                "reason": "Normalized hash comparison"
+            }
+            if new_file:
+                audit_entry["new_file"] = new_file
+            if store:
+                audit_entry["from_sha_hash"] = check.from_sha_hash
+            journal.append(audit_entry)
+            latency = time.time() - committed_at if committed_at else None
+            metric_events.append(("heal", action, lo.id, journal.sha, latency, ev.file))
+            
+            console.print(f"[{'red' if action=='FLAGGED' else 'green'}] {lo.id}: {action}[/]")
+
+        except Exception as e:
+            console.print(f"[red]Error checking {lo.id}: {e}[/red]")
+            # Log error audit
+            journal.append({
+                "timestamp": datetime.datetime.now().isoformat(),
+                "from_sha": from_sha,
+                "to_sha": journal.sha,
+                "lo_id": lo.id,
+                "symbol": ev.symbol,
+                "file": ev.file,
+                "action": "ERROR",
+                "error": str(e)
+            })
+            metric_events.append(("heal", "ERROR", lo.id, journal.sha, None, ev.file))
+            # Architecture 4, phase 2: the symbol is missing at to_sha, so the LO is invalid.
+            # Any other failure (e.g. reading the object store) says nothing about the LO.
+            if not isinstance(e, (FileNotFoundError, ValueError)):
+                continue
+            status = "invalid"
+
+        # An LO takes the worst status any of its checked evidence implies
+        if STATUS_SEVERITY[status] >= STATUS_SEVERITY[heal_status.get(lo.id, "verified")]:
+            heal_status[lo.id] = status
+
+    journal.close()
+    with MetricsStore() as metrics:
+        metrics.record_many(metric_events)
+    if store:
+        store.close()
+    hash_cache.save()
+
+    console.print(f"Heal complete. Checked {lo_checked} LOs. Relocated {healed_count}. Flagged {review_count} for review. "
+                  f"Skipped {skipped_count} unchanged evidence items.")
+    console.print(f"Snippet hash cache: {hash_cache.hits} hits, {hash_cache.misses} misses.")
+    console.print(f"Audit journal: [blue]{journal.audit_dir / journal.rel_path}[/blue]")
+
+    merge_heal_status(heal_status)
+    downgraded = sum(1 for healed in heal_status.values() if healed != "verified")
+    console.print(f"Status merged into [blue]{STATUS_PATH}[/blue]: {downgraded} LOs need attention.")
+    return heal_status
+
+
+def run_audit(lo_id: str = None, sha: str = None, action: str = None):
+    entries = list(query_audit(lo_id, sha, action))
+    for entry in entries:
+        color = "red" if entry.get("action") in ("FLAGGED", "ERROR") else "green"
+        detail = entry.get("error") or f"{entry.get('old_hash', '')[:12]} -> {entry.get('new_hash', '')[:12]}"
+        console.print(f"{entry['timestamp']} [{color}]{entry['action']}[/] {entry['lo_id']} "
+                      f"{entry['symbol']} ({entry['to_sha']}) {detail}")
+    console.print(f"{len(entries)} audit entries.")
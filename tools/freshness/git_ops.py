@@ -0,0 +1,47 @@
+import subprocess
+from typing import Optional, Set
+
+def changed_paths(engine_root: str, from_sha: str, to_sha: str) -> Optional[Set[str]]:
+    """
+    Paths (relative to engine_root) that differ between two commits of the engine repo.
+    Renames are reported as a delete plus an add so evidence citing the old path is caught.
+    Returns None when engine_root is not a git checkout or a SHA cannot be resolved
+    (run_heal resolves both SHAs first, so only the former falls back to a full scan).
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-C", engine_root, "diff", "--name-only", "-z", "--no-renames", "--relative", from_sha, to_sha],
+            capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {p for p in result.stdout.decode("utf-8", "surrogateescape").split("\0") if p}
+
+def is_git_checkout(engine_root: str) -> bool:
+    """True if engine_root is inside a git work tree."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", engine_root, "rev-parse", "--is-inside-work-tree"],
+            capture_output=True, check=True, text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    return result.stdout.strip() == "true"
+
+def resolve_commit(engine_root: str, ref: str) -> Optional[str]:
+    """Full commit id for ref in the engine repo, or None if it cannot be resolved."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", engine_root, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"],
+            capture_output=True, check=True, text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+def commit_time(engine_root: str, sha: str) -> Optional[int]:
+    """Committer timestamp (epoch seconds) of sha, or None if it cannot be read."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", engine_root, "show", "-s", "--format=%ct", sha],
+            capture_output=True, check=True, text=True)
+        return int(result.stdout.strip())
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return None
@@ -0,0 +1,105 @@
+import subprocess
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+
+class GitObjectStore:
+    """
+    Reads file contents at arbitrary commits straight from the git object database
+    through long-lived `git cat-file --batch` processes, so no checkout is needed
+    and the working tree is never touched. Recently read blobs are kept in an LRU.
+    Each thread gets its own processes, so threads only share the LRU and reads
+    from a thread pool run in parallel.
+    """
+
+    def __init__(self, repo_path: str, max_cached: int = 256):
+        self.repo_path = repo_path
+        self.max_cached = max_cached
+        self._cache: "OrderedDict[Tuple[str, str], Optional[bytes]]" = OrderedDict()
+        self._local = threading.local()
+        self._procs: List[subprocess.Popen] = []
+        # Guards the LRU and the process list, never a cat-file round trip
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _spawn(self, mode: str) -> subprocess.Popen:
+        return subprocess.Popen(
+            ["git", "-C", self.repo_path, "cat-file", mode],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def _process(self, mode: str) -> subprocess.Popen:
+        """This thread's cat-file process for mode ("--batch" or "--batch-check")."""
+        procs = getattr(self._local, "procs", None)
+        if procs is None:
+            procs = self._local.procs = {}
+        proc = procs.get(mode)
+        if proc is None or proc.poll() is not None:
+            proc = procs[mode] = self._spawn(mode)
+            with self._lock:
+                self._procs.append(proc)
+        return proc
+
+    def _header(self, proc: subprocess.Popen, spec: str) -> Optional[list]:
+        proc.stdin.write(spec.encode("utf-8") + b"\n")
+        proc.stdin.flush()
+
+        header = proc.stdout.readline()
+        if not header:
+            raise RuntimeError(f"git cat-file exited while reading {spec}")
+        parts = header.split()
+        # "<spec> missing" / "<spec> ambiguous" carry no body
+        return parts if len(parts) == 3 else None
+
+    def _request(self, spec: str) -> Optional[bytes]:
+        proc = self._process("--batch")
+        parts = self._header(proc, spec)
+        if parts is None:
+            return None
+
+        oid, obj_type, size = parts
+        body = proc.stdout.read(int(size))
+        proc.stdout.read(1)  # trailing LF after every object
+        return body if obj_type == b"blob" else None
+
+    def blob_id(self, sha: str, rel_path: str) -> Optional[str]:
+        """Object id of the blob at rel_path in commit sha, without reading its contents."""
+        parts = self._header(self._process("--batch-check"), f"{sha}:./{rel_path}")
+        if parts is None or parts[1] != b"blob":
+            return None
+        return parts[0].decode("ascii")
+
+    def read(self, sha: str, rel_path: str) -> Optional[bytes]:
+        """
+        Returns the blob at rel_path (relative to repo_path) in commit sha,
+        or None if the path does not exist there.
+        """
+        key = (sha, rel_path)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        # "./" makes git resolve the path relative to repo_path, not the repo top-level
+        blob = self._request(f"{sha}:./{rel_path}")
+
+        with self._lock:
+            self._cache[key] = blob
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return blob
+
+    def close(self):
+        """Stops every thread's processes; a later read spawns new ones."""
+        with self._lock:
+            procs, self._procs = self._procs, []
+        for proc in procs:
+            if proc.poll() is None:
+                proc.stdin.close()
+                proc.wait()
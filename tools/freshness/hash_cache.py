@@ -0,0 +1,74 @@
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+CACHE_PATH = Path("out/cache/snippet_hashes.pkl")
+CACHE_VERSION = 1
+
+# (engine file path, file identity, symbol, context_lines). The identity is
+# "blob:<oid>" for object store reads and "<size>:<mtime_ns>" for working tree reads.
+CacheKey = Tuple[str, str, str, int]
+
+
+class SnippetHashCache:
+    """
+    Persistent LRU of normalized snippet hashes. An unchanged engine file has the same
+    identity, so its evidence resolves without reading, searching or hashing it again.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH, max_entries: int = 200_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[CacheKey, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path = CACHE_PATH, max_entries: int = 200_000) -> "SnippetHashCache":
+        cache = cls(path, max_entries)
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return cache
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            cache._entries = data["entries"]
+            cache._evict()
+        return cache
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: CacheKey, value: str):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._evict()
+            self._dirty = True
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self):
+        if not self._dirty:
+            return
+        os.makedirs(self.path.parent, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"version": CACHE_VERSION, "entries": self._entries}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,56 @@
+import hashlib
+import re
+from typing import Iterable, Iterator, List
+
+# One scanner pass over the snippet. Literals are matched as whole tokens so that
+# "//" or "/*" inside them is never mistaken for a comment, and whichever of
+# "//" or "/*" starts first wins, so "/* // */" is a single block comment.
+_SCANNER = re.compile(r'''
+    (?P<literal>
+        (?:u8|[uUL])?R"(?P<delim>[^()\\\s]{0,16})\(.*?\)(?P=delim)"   # raw string
+      | "(?:\\.|[^"\\\n])*"                                           # string
+      | '(?:\\.[^'\\\n]{0,8}|[^'\\\n]{1,4})'                          # char / multichar
+    )
+  | //[^\n]*                                                          # line comment
+  | /\*.*?(?:\*/|\Z)                                                  # block comment
+  | \s+                                                               # whitespace
+''', re.VERBOSE | re.DOTALL)
+
+
+def iter_normalized(snippet: str) -> Iterator[str]:
+    """
+    Yields the pieces of the normalized snippet in order: code with comments and
+    whitespace removed, and string/char literals kept verbatim.
+    """
+    pos = 0
+    for m in _SCANNER.finditer(snippet):
+        if m.start() > pos:
+            yield snippet[pos:m.start()]
+        if m.group("literal") is not None:
+            yield m.group("literal")
+        pos = m.end()
+    if pos < len(snippet):
+        yield snippet[pos:]
+
+
+def normalize_snippet(snippet: str) -> str:
+    """
+    Normalizes a code snippet for hashing.
+    1. Remove single-line comments //...
+    2. Remove multi-line comments /*...*/
+    3. Remove all whitespace (spaces, tabs, newlines) outside string and char literals
+    """
+    return "".join(iter_normalized(snippet))
+
+
+def compute_hash(snippet: str) -> str:
+    """SHA-256 of the normalized snippet, fed piece by piece without building the normalized string."""
+    hasher = hashlib.sha256()
+    for piece in iter_normalized(snippet):
+        hasher.update(piece.encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def hash_snippets(snippets: Iterable[str]) -> List[str]:
+    """compute_hash over many snippets, in order."""
+    return [compute_hash(s) for s in snippets]
@@ -0,0 +1,62 @@
+import mmap
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+
+def window_bounds(buf, idx: int, context_lines: int) -> Tuple[int, int]:
+    """
+    Byte range of the context_lines window around offset idx, found by scanning for
+    newlines outward from the match: context_lines // 2 lines before the matching line,
+    and the matching line plus the lines after it up to the same count.
+    """
+    half = context_lines // 2
+    line_start = buf.rfind(b"\n", 0, idx) + 1
+
+    start = line_start
+    for _ in range(half):
+        if start == 0:
+            break
+        start = buf.rfind(b"\n", 0, start - 1) + 1
+
+    end = line_start
+    pos = line_start
+    for _ in range(half):
+        nl = buf.find(b"\n", pos)
+        if nl == -1:
+            # A trailing newline does not start another line
+            if pos < len(buf):
+                end = len(buf)
+            break
+        end = nl
+        pos = nl + 1
+    return start, end
+
+
+def extract_windows_from_bytes(buf, symbols: Iterable[str], context_lines: int = 40) -> Dict[str, Optional[str]]:
+    """
+    Windows around the first occurrence of each symbol in buf (bytes or mmap).
+    Only the window is decoded; symbols that do not occur map to None.
+    """
+    windows = {}
+    for symbol in symbols:
+        if symbol in windows:
+            continue
+        idx = buf.find(symbol.encode("utf-8"))
+        if idx == -1:
+            windows[symbol] = None
+            continue
+        start, end = window_bounds(buf, idx, context_lines)
+        text = buf[start:end].decode("utf-8", errors="replace")
+        windows[symbol] = "\n".join(line[:-1] if line.endswith("\r") else line for line in text.split("\n"))
+    return windows
+
+
+def extract_snippet_windows(file_path: Path, symbols: Iterable[str], context_lines: int = 40) -> Dict[str, Optional[str]]:
+    """Like extract_windows_from_bytes, over a single read-only mapping of file_path."""
+    symbols = list(symbols)
+    with open(file_path, "rb") as f:
+        # Empty files cannot be mapped, and contain no symbols anyway
+        if f.seek(0, 2) == 0:
+            return {s: None for s in symbols}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return extract_windows_from_bytes(buf, symbols, context_lines)
@@ -0,0 +1,85 @@
+import os
+import json
+from typing import Dict, List, Optional, Tuple
+from tools.corpus import CorpusEntry
+from tools.index.trigram import index_identity
+
+MANIFEST_PATH = "out/gate_manifest.json"
+MANIFEST_VERSION = 1
+
+
+class GateManifest:
+    """
+    Remembers, per LO file, the inputs of its last validation and the outcome.
+    An LO only needs revalidating when its content hash or the mtime of one of
+    its evidence files differs from what is recorded here. An LO with a missing
+    evidence file was also judged by the source index (relocation), so it is
+    revalidated when the index has been rebuilt since.
+    """
+
+    def __init__(self, engine_root: Optional[str], no_capture: bool):
+        self.engine_root = engine_root
+        self.no_capture = no_capture
+        self.records: Dict[str, Dict] = {}
+        self.index_identity = index_identity()
+
+    @classmethod
+    def load(cls, path: str, engine_root: Optional[str], no_capture: bool) -> "GateManifest":
+        """Loads the manifest, returning an empty one if it is missing or was built with other settings."""
+        manifest = cls(engine_root, no_capture)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+
+        if (data.get("version") == MANIFEST_VERSION
+                and data.get("engine_root") == engine_root
+                and data.get("no_capture") == no_capture):
+            manifest.records = data.get("los", {})
+        return manifest
+
+    def lookup(self, entry: CorpusEntry, evidence_mtimes: Dict[str, Optional[int]]) -> Optional[Tuple[str, List[str]]]:
+        """Returns the recorded (status, errors) if nothing the LO depends on has changed."""
+        rec = self.records.get(entry.path)
+        if not rec or rec["content_hash"] != entry.content_hash:
+            return None
+        for file, mtime in rec["evidence"].items():
+            if evidence_mtimes.get(file) != mtime:
+                return None
+        if self._used_index(rec["evidence"]) and rec.get("index") != self.index_identity:
+            return None
+        return rec["status"], rec["errors"]
+
+    def _used_index(self, evidence: Dict[str, Optional[int]]) -> bool:
+        # Validation only falls back to relocate_symbol for evidence files that do not exist
+        return bool(self.engine_root) and not self.no_capture and None in evidence.values()
+
+    def record(self, entry: CorpusEntry, evidence_mtimes: Dict[str, Optional[int]], status: str, errors: List[str]):
+        files = [ev.file for ev in entry.lo.evidence] if entry.lo else []
+        evidence = {f: evidence_mtimes.get(f) for f in files}
+        self.records[entry.path] = {
+            "lo_id": entry.lo_id,
+            "content_hash": entry.content_hash,
+            "evidence": evidence,
+            "index": self.index_identity if self._used_index(evidence) else None,
+            "status": status,
+            "errors": errors,
+        }
+
+    def prune(self, live_paths) -> int:
+        """Drops records for LO files that no longer exist and returns how many were dropped."""
+        live = set(live_paths)
+        before = len(self.records)
+        self.records = {p: r for p, r in self.records.items() if p in live}
+        return before - len(self.records)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "engine_root": self.engine_root,
+                "no_capture": self.no_capture,
+                "los": self.records,
+            }, f, separators=(",", ":"))
@@ -15,6 +15,13 @@ class EvidenceItem(BaseModel):
     symbol_id: str
     snippet_hash: str
 
+class ValidationSpec(BaseModel):
+    # none | compile | unit | editor_integration_test
+    kind: str = "none"
+    # Capture script under tools/capture/scripts/
+    script: Optional[str] = None
+    asserts: List[str] = Field(default_factory=list)
+
 class LearningObject(BaseModel):
     id: str
     type: LOType
@@ -26,3 +33,5 @@ class LearningObject(BaseModel):
     # Context filters (simple for POC)
     roles: List[str] = Field(default_factory=list)
     skill_level: Optional[str] = None
+
+    validation: Optional[ValidationSpec] = None
@@ -1,12 +1,14 @@
 
 import os
-import yaml
 import json
 from enum import Enum
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict, Any, Optional
 from pathlib import Path
-from pydantic import ValidationError
-from tools.gate.models import LearningObject, EvidenceItem
+from concurrent.futures import ThreadPoolExecutor
+from tools.corpus import CorpusEntry, LOCorpus, load_corpus
+from tools.gate.manifest import GateManifest, MANIFEST_PATH
+from tools.index.trigram import relocate_symbol
+from tools.metrics.store import MetricsStore
 
 class ValidationStatus(str, Enum):
     VERIFIED = "verified"
@@ -18,6 +20,7 @@ class GateReport:
     def __init__(self):
         self.results = {}
         self.status_map = {}
+        self.reused_count = 0
 
     def add_result(self, lo_id: str, status: ValidationStatus, errors: List[str] = None):
         self.results[lo_id] = {
@@ -32,60 +35,123 @@ class GateReport:
         with open(status_path, "w") as f:
             json.dump(self.status_map, f, indent=2)
 
-def validate_lo_file(file_path: Path, engine_root: Path = None, skip_evidence: bool = False) -> (ValidationStatus, List[str]):
-    errors = []
-    
-    # 1. Parse YAML
-    try:
-        with open(file_path, "r") as f:
-            data = yaml.safe_load(f)
-    except Exception as e:
-        return ValidationStatus.INVALID, [f"YAML Parse Error: {str(e)}"]
+def stat_engine_files(engine_root: Path, rel_paths: Iterable[str], jobs: int = 1) -> Dict[str, Optional[os.stat_result]]:
+    """
+    Stats each distinct engine path once, on a thread pool when jobs > 1.
+    Returns the stat result of every path, or None for paths that do not exist.
+    """
+    def stat(rel_path):
+        try:
+            return os.stat(engine_root / rel_path)
+        except OSError:
+            return None
 
-    # 2. Validate Schema
-    try:
-        lo = LearningObject(**data)
-    except ValidationError as e:
-        return ValidationStatus.INVALID, [f"Schema Error: {str(e)}"]
+    unique = sorted(set(rel_paths))
+    if jobs > 1 and len(unique) > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            stats = list(pool.map(stat, unique))
+    else:
+        stats = [stat(p) for p in unique]
+    return dict(zip(unique, stats))
+
+def stat_evidence_files(engine_root: Path, rel_paths: Iterable[str], jobs: int = 1) -> Dict[str, Optional[int]]:
+    """Like stat_engine_files, keeping only the mtime (ns) of every path."""
+    return evidence_mtimes_from(stat_engine_files(engine_root, rel_paths, jobs))
+
+def evidence_mtimes_from(stats: Dict[str, Optional[os.stat_result]]) -> Dict[str, Optional[int]]:
+    return {p: st.st_mtime_ns if st is not None else None for p, st in stats.items()}
+
+def validate_entry(entry: CorpusEntry, engine_root: Path = None, skip_evidence: bool = False,
+                   evidence_mtimes: Optional[Dict[str, Optional[int]]] = None) -> (ValidationStatus, List[str]):
+    # 1./2. YAML parse and schema validation already happened when the corpus was loaded
+    if entry.lo is None:
+        return ValidationStatus.INVALID, [entry.error]
+
+    errors = []
+    relocated = []
 
     # 3. Validate Evidence Paths (if engine provided)
     if engine_root and not skip_evidence:
-        for ev in lo.evidence:
-            full_path = engine_root / ev.file
-            if not full_path.exists():
-                errors.append(f"Evidence file not found: {ev.file}")
+        for ev in entry.lo.evidence:
+            if evidence_mtimes is not None:
+                exists = evidence_mtimes[ev.file] is not None
+            else:
+                exists = (engine_root / ev.file).exists()
+            if not exists:
+                moved = relocate_symbol(str(engine_root), ev.symbol, ev.file)
+                if moved:
+                    relocated.append(f"Evidence file not found: {ev.file} (symbol {ev.symbol} found in {moved[0]})")
+                else:
+                    errors.append(f"Evidence file not found: {ev.file}")
     
     if errors:
-        return ValidationStatus.INVALID, errors
+        return ValidationStatus.INVALID, errors + relocated
+
+    # Every missing file has a known new home, so a human only needs to repoint the evidence
+    if relocated:
+        return ValidationStatus.NEEDS_REVIEW, relocated
     
     return ValidationStatus.VERIFIED, []
 
-def run_validation(engine_root: str, no_capture: bool):
-    knowledge_dir = Path("knowledge/learning_objects")
+def run_validation(engine_root: str, no_capture: bool, jobs: int = 1, incremental: bool = False,
+                   corpus: Optional[LOCorpus] = None, engine_stats: Optional[Dict[str, Optional[os.stat_result]]] = None):
+    """
+    Validates every LO and saves the gate report. corpus and engine_stats (see stat_engine_files)
+    let a caller that already loaded the LOs or stat'ed the evidence files share them.
+    """
     report = GateReport()
     
     engine_path = Path(engine_root) if engine_root else None
-    
-    # Walk through LOs
-    for root, dirs, files in os.walk(knowledge_dir):
-        for file in files:
-            if file.endswith(".yml") or file.endswith(".yaml"):
-                full_path = Path(root) / file
-                status, errors = validate_lo_file(full_path, engine_path, no_capture)
-                
-                # Extract ID from filename or content (using content as source of truth for ID)
-                # But we need basic parsing first. We already parsed it in validate_lo_file effectively.
-                # Let's do a quick re-parse to get the ID for the report key.
-                try:
-                    with open(full_path, "r") as f:
-                        data = yaml.safe_load(f)
-                        lo_id = data.get("id", file)
-                except:
-                    lo_id = file
-
-                report.add_result(lo_id, status, errors)
+    entries = (corpus or load_corpus(jobs=jobs)).entries
+
+    # Stat every referenced engine file up front so the blocking calls overlap
+    evidence_mtimes = {}
+    if engine_path and not no_capture:
+        if engine_stats is not None:
+            evidence_mtimes = evidence_mtimes_from(engine_stats)
+        else:
+            evidence_mtimes = stat_evidence_files(
+                engine_path, (ev.file for e in entries if e.lo for ev in e.lo.evidence), jobs)
+
+    manifest = GateManifest(engine_root, no_capture)
+    if incremental:
+        manifest = GateManifest.load(MANIFEST_PATH, engine_root, no_capture)
+
+    metric_events = []
+
+    # Entries are in path order, so the report is identical for any jobs value
+    for entry in entries:
+        previous = manifest.lookup(entry, evidence_mtimes) if incremental else None
+        if previous:
+            status, errors = previous
+            report.reused_count += 1
+        else:
+            status, errors = validate_entry(entry, engine_path, no_capture, evidence_mtimes)
+            manifest.record(entry, evidence_mtimes, status.value, errors)
+            metric_events.append(("gate", status.value, entry.lo_id, None, None, "; ".join(errors) or None))
+        report.add_result(entry.lo_id, status, errors)
+    removed = manifest.prune(e.path for e in entries)
+
+    if metric_events:
+        with MetricsStore() as metrics:
+            metrics.record_many(metric_events)
 
     # Ensure output dir exists
     os.makedirs("out", exist_ok=True)
-    report.save("out/gate_report.json", "out/status.json")
+
+    # An incremental run over an unchanged tree leaves the previous outputs untouched, unless
+    # heal has since lowered statuses in status.json: the gate's own results replace those
+    unchanged = incremental and removed == 0 and report.reused_count == len(entries)
+    if not (unchanged and os.path.exists("out/gate_report.json") and status_file_matches("out/status.json", report)):
+        report.save("out/gate_report.json", "out/status.json")
+        manifest.save(MANIFEST_PATH)
     return report
+
+def status_file_matches(status_path: str, report: GateReport) -> bool:
+    """True if status_path holds exactly the report's statuses."""
+    try:
+        with open(status_path) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return saved == {lo_id: ValidationStatus(status).value for lo_id, status in report.status_map.items()}
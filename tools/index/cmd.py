@@ -0,0 +1,30 @@
+import time
+from rich.console import Console
+from tools.index.trigram import SourceIndex, INDEX_PATH
+
+console = Console()
+
+def run_index_build(engine_path: str):
+    console.print(f"[bold]Building engine source index...[/bold]")
+    console.print(f"Engine Path: {engine_path}")
+
+    start = time.perf_counter()
+    index = SourceIndex.load(engine_path)
+    fresh = index is None
+    if fresh:
+        console.print("[yellow]No existing index for this engine, building from scratch.[/yellow]")
+        index = SourceIndex(engine_path)
+
+    changed, removed, unchanged = index.update()
+    # Saving changes index_identity(), which makes the gate revalidate everything that used relocation
+    dirty = fresh or changed or removed
+    if dirty:
+        index.save()
+
+    elapsed = time.perf_counter() - start
+    console.print(f"[green]Index updated in {elapsed:.2f}s.[/green] "
+                  f"{changed} indexed, {removed} removed, {unchanged} unchanged.")
+    if dirty:
+        console.print(f"Index saved to [blue]{INDEX_PATH}[/blue]")
+    else:
+        console.print(f"Index unchanged: [blue]{INDEX_PATH}[/blue]")
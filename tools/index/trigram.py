@@ -0,0 +1,237 @@
+import os
+import re
+import pickle
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+INDEX_PATH = Path("out/index/engine.pkl")
+INDEX_VERSION = 1
+
+SOURCE_EXTENSIONS = {".h", ".hpp", ".inl", ".c", ".cc", ".cpp", ".cs"}
+
+# Evidence symbols are C++ identifiers (optionally qualified), so the index only
+# has to cover identifier text. Indexing the distinct identifiers of a file instead
+# of every byte keeps a build over Engine/Source tractable in pure Python.
+IDENTIFIER_RE = re.compile(rb"[A-Za-z_][A-Za-z0-9_]*")
+QUERY_TOKEN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def identifier_trigrams(identifiers) -> Set[bytes]:
+    grams = set()
+    for ident in identifiers:
+        for i in range(len(ident) - 2):
+            grams.add(ident[i:i + 3])
+    return grams
+
+
+class SourceIndex:
+    """
+    Persistent trigram -> file inverted index over an engine source tree.
+    Paths are stored relative to the engine root, matching EvidenceItem.file.
+    """
+
+    def __init__(self, engine_root: str):
+        self.engine_root = os.path.abspath(engine_root)
+        self.file_ids: Dict[str, int] = {}
+        self.paths: List[Optional[str]] = []
+        self.stats: Dict[int, Tuple[int, int]] = {}
+        self.file_grams: Dict[int, bytes] = {}
+        self.postings: Dict[bytes, Set[int]] = {}
+        # Ids of removed files, handed out again so paths does not grow with churn
+        self.free_ids: List[int] = []
+
+    @classmethod
+    def load(cls, engine_root: str, index_path: Path = INDEX_PATH) -> Optional["SourceIndex"]:
+        """Returns the persisted index for engine_root, or None if none has been built."""
+        try:
+            with open(index_path, "rb") as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if data.get("version") != INDEX_VERSION or data.get("engine_root") != os.path.abspath(engine_root):
+            return None
+        index = cls(engine_root)
+        index.file_ids = data["file_ids"]
+        index.paths = data["paths"]
+        index.stats = data["stats"]
+        index.file_grams = data["file_grams"]
+        index.postings = data["postings"]
+        index.free_ids = [fid for fid, path in enumerate(index.paths) if path is None]
+        return index
+
+    def save(self, index_path: Path = INDEX_PATH):
+        os.makedirs(index_path.parent, exist_ok=True)
+        tmp_path = index_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump({
+                "version": INDEX_VERSION,
+                "engine_root": self.engine_root,
+                "file_ids": self.file_ids,
+                "paths": self.paths,
+                "stats": self.stats,
+                "file_grams": self.file_grams,
+                "postings": self.postings,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, index_path)
+
+    def _source_root(self) -> str:
+        source = os.path.join(self.engine_root, "Engine", "Source")
+        return source if os.path.isdir(source) else self.engine_root
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        found = {}
+        stack = [self._source_root()]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with it:
+                for de in it:
+                    if de.is_dir(follow_symlinks=False):
+                        stack.append(de.path)
+                    elif os.path.splitext(de.name)[1].lower() in SOURCE_EXTENSIONS:
+                        st = de.stat()
+                        rel = os.path.relpath(de.path, self.engine_root).replace(os.sep, "/")
+                        found[rel] = (st.st_mtime_ns, st.st_size)
+        return found
+
+    def _remove(self, rel_path: str):
+        fid = self.file_ids.pop(rel_path)
+        grams = self.file_grams.pop(fid, b"")
+        for i in range(0, len(grams), 3):
+            gram = grams[i:i + 3]
+            posting = self.postings.get(gram)
+            if posting is not None:
+                posting.discard(fid)
+                if not posting:
+                    del self.postings[gram]
+        self.paths[fid] = None
+        self.stats.pop(fid, None)
+        self.free_ids.append(fid)
+
+    def _add(self, rel_path: str, stat: Tuple[int, int]):
+        try:
+            with open(os.path.join(self.engine_root, rel_path), "rb") as f:
+                content = f.read()
+        except OSError:
+            return
+        if self.free_ids:
+            fid = self.free_ids.pop()
+            self.paths[fid] = rel_path
+        else:
+            fid = len(self.paths)
+            self.paths.append(rel_path)
+        self.file_ids[rel_path] = fid
+        self.stats[fid] = stat
+
+        grams = identifier_trigrams(set(IDENTIFIER_RE.findall(content)))
+        self.file_grams[fid] = b"".join(sorted(grams))
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                self.postings[gram] = {fid}
+            else:
+                posting.add(fid)
+
+    def update(self) -> Tuple[int, int, int]:
+        """
+        Brings the index in line with the source tree, re-indexing only files whose
+        mtime or size changed. Returns (added_or_changed, removed, unchanged) counts.
+        """
+        found = self._scan()
+        changed = removed = 0
+
+        for rel_path in [p for p in self.file_ids if p not in found]:
+            self._remove(rel_path)
+            removed += 1
+
+        for rel_path in sorted(found):
+            fid = self.file_ids.get(rel_path)
+            if fid is not None and self.stats.get(fid) == found[rel_path]:
+                continue
+            if fid is not None:
+                self._remove(rel_path)
+            self._add(rel_path, found[rel_path])
+            changed += 1
+
+        return changed, removed, len(found) - changed
+
+    def candidates(self, symbol: str) -> List[str]:
+        """Files whose identifiers contain every trigram of symbol, in path order."""
+        tokens = [t.encode("utf-8") for t in QUERY_TOKEN_RE.findall(symbol)]
+        grams = identifier_trigrams(t for t in tokens if len(t) >= 3)
+        if not grams:
+            return []
+
+        # Intersect the rarest postings first to keep the working set small
+        postings = sorted((self.postings.get(g, set()) for g in grams), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                return []
+        return sorted(self.paths[fid] for fid in result)
+
+    def _read(self, rel_path: str) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self.engine_root, rel_path), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def locate(self, symbol: str, read: Optional[Callable[[str], Optional[bytes]]] = None) -> List[Tuple[str, int]]:
+        """
+        Returns (relative path, 0-based line) for every indexed file that contains
+        the literal symbol, verified against the file on disk, or against read(rel_path)
+        (None for files that do not exist) when given.
+        """
+        needle = symbol.encode("utf-8")
+        hits = []
+        for rel_path in self.candidates(symbol):
+            content = (read or self._read)(rel_path)
+            if content is None:
+                continue
+            idx = content.find(needle)
+            if idx != -1:
+                hits.append((rel_path, content.count(b"\n", 0, idx)))
+        return hits
+
+
+def index_identity(index_path: Path = INDEX_PATH) -> Optional[str]:
+    """'mtime_ns:size' of the persisted index, which changes on every save; None if none is built."""
+    try:
+        st = os.stat(index_path)
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+_loaded: Dict[str, Tuple[Optional[str], Optional[SourceIndex]]] = {}
+_loaded_lock = threading.Lock()
+
+
+def cached_index(engine_root: str) -> Optional[SourceIndex]:
+    """Loads the persisted index for engine_root once per process, and again after it is rebuilt."""
+    key = os.path.abspath(engine_root)
+    identity = index_identity()
+    with _loaded_lock:
+        if key not in _loaded or _loaded[key][0] != identity:
+            _loaded[key] = (identity, SourceIndex.load(key))
+        return _loaded[key][1]
+
+
+def relocate_symbol(engine_root: str, symbol: str, old_file: str,
+                    read: Optional[Callable[[str], Optional[bytes]]] = None) -> Optional[Tuple[str, int]]:
+    """
+    Finds symbol in a file other than old_file, or None if there is no index or no hit.
+    read verifies candidates against another version of the tree (see SourceIndex.locate).
+    """
+    index = cached_index(engine_root)
+    if index is None:
+        return None
+    for rel_path, line in index.locate(symbol, read):
+        if rel_path != old_file:
+            return rel_path, line
+    return None
@@ -0,0 +1,28 @@
+from rich.console import Console
+from rich.table import Table
+from tools.metrics.store import MetricsStore
+
+console = Console()
+
+# (key, label, target, format)
+KPI_ROWS = [
+    ("auto_merge_rate", "Auto-Merge Rate", "> 60%", "{:.1%}"),
+    ("capture_pass_rate", "Capture Pass Rate", "> 95%", "{:.1%}"),
+    ("anchor_hit_rate", "Anchor Hit Rate", "> 90%", "{:.1%}"),
+    ("drift_latency_hours", "Drift Latency", "< 4 hours", "{:.2f} hours"),
+    ("flake_rate", "Flake Rate", "< 2%", "{:.1%}"),
+    ("rollbacks_per_week", "Rollback Rate", "near 0 / week", "{:.2f} / week"),
+]
+
+def run_metrics(since: str = None, until: str = None):
+    with MetricsStore() as store:
+        kpis = store.kpis(since or "0000-00-00", until or "9999-99-99")
+
+    table = Table(title=f"UKE Metrics ({since or 'all time'} .. {until or 'today'})")
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    table.add_column("Target")
+    for key, label, target, fmt in KPI_ROWS:
+        value = kpis[key]
+        table.add_row(label, fmt.format(value) if value is not None else "n/a", target)
+    console.print(table)
@@ -0,0 +1,153 @@
+import os
+import sqlite3
+import datetime
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+DB_PATH = "out/metrics.db"
+
+# Rollups are maintained by triggers as events are inserted, so KPI queries only
+# ever touch one row per (day, source, action) or per (day, source, lo) and stay
+# fast no matter how many months of raw events accumulate.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    day TEXT NOT NULL,
+    source TEXT NOT NULL,
+    action TEXT NOT NULL,
+    lo_id TEXT,
+    sha TEXT,
+    value REAL,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS events_lo ON events (lo_id, ts);
+
+CREATE TABLE IF NOT EXISTS daily_rollup (
+    day TEXT NOT NULL,
+    source TEXT NOT NULL,
+    action TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    value_sum REAL NOT NULL DEFAULT 0,
+    value_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, source, action)
+);
+
+CREATE TABLE IF NOT EXISTS daily_lo_outcomes (
+    day TEXT NOT NULL,
+    source TEXT NOT NULL,
+    lo_id TEXT NOT NULL,
+    passes INTEGER NOT NULL DEFAULT 0,
+    fails INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, source, lo_id)
+);
+
+CREATE TRIGGER IF NOT EXISTS events_rollup AFTER INSERT ON events
+BEGIN
+    INSERT INTO daily_rollup (day, source, action, count, value_sum, value_count)
+    VALUES (NEW.day, NEW.source, NEW.action, 1, COALESCE(NEW.value, 0), NEW.value IS NOT NULL)
+    ON CONFLICT (day, source, action) DO UPDATE SET
+        count = count + 1,
+        value_sum = value_sum + COALESCE(NEW.value, 0),
+        value_count = value_count + (NEW.value IS NOT NULL);
+END;
+
+CREATE TRIGGER IF NOT EXISTS events_lo_outcome AFTER INSERT ON events
+WHEN NEW.lo_id IS NOT NULL AND NEW.action IN ('PASS', 'FAIL')
+BEGIN
+    INSERT INTO daily_lo_outcomes (day, source, lo_id, passes, fails)
+    VALUES (NEW.day, NEW.source, NEW.lo_id, NEW.action = 'PASS', NEW.action = 'FAIL')
+    ON CONFLICT (day, source, lo_id) DO UPDATE SET
+        passes = passes + (NEW.action = 'PASS'),
+        fails = fails + (NEW.action = 'FAIL');
+END;
+"""
+
+# (source, action, lo_id, sha, value, detail)
+Event = Tuple[str, str, Optional[str], Optional[str], Optional[float], Optional[str]]
+
+
+class MetricsStore:
+    """
+    Local SQLite store for heal, gate and capture events with per-day rollups.
+
+    Event vocabulary:
+    * heal: VERIFIED (no drift), RELOCATED (drift merged automatically), FLAGGED (drift needing
+      human review), ERROR, ROLLBACK (an auto-merge reverted). value = seconds from engine
+      commit to the heal.
+    * gate: one event per revalidated LO, action = its ValidationStatus.
+    * capture: PASS / FAIL per run (value = duration in seconds), and for passing runs ANCHOR_OK
+      (every overlay anchor resolved) or ANCHOR_LOST (at least one did not).
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record_many(self, events: Iterable[Event], ts: float = None):
+        """Inserts events in a single transaction, all stamped with ts (default: now)."""
+        ts = ts if ts is not None else time.time()
+        day = datetime.date.fromtimestamp(ts).isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO events (ts, day, source, action, lo_id, sha, value, detail) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((ts, day) + tuple(e) for e in events))
+
+    def record(self, source: str, action: str, lo_id: str = None, sha: str = None,
+               value: float = None, detail: str = None, ts: float = None):
+        self.record_many([(source, action, lo_id, sha, value, detail)], ts)
+
+    def _counts(self, since: str, until: str) -> Dict[Tuple[str, str], Tuple[int, float, int]]:
+        rows = self.conn.execute(
+            "SELECT source, action, SUM(count), SUM(value_sum), SUM(value_count) FROM daily_rollup "
+            "WHERE day >= ? AND day <= ? GROUP BY source, action", (since, until))
+        return {(source, action): (count, value_sum, value_count) for source, action, count, value_sum, value_count in rows}
+
+    def kpis(self, since: str = "0000-00-00", until: str = "9999-99-99") -> Dict[str, Optional[float]]:
+        """Architecture section 8 KPIs over the inclusive day range. None means no data."""
+        counts = self._counts(since, until)
+
+        def n(source, *actions):
+            return sum(counts.get((source, a), (0, 0, 0))[0] for a in actions)
+
+        def ratio(num, den):
+            return num / den if den else None
+
+        # Only evidence that drifted counts: VERIFIED means nothing changed, so nothing was merged
+        drift = ("RELOCATED", "FLAGGED")
+        latency_sum = sum(counts.get(("heal", a), (0, 0, 0))[1] for a in drift)
+        latency_n = sum(counts.get(("heal", a), (0, 0, 0))[2] for a in drift)
+
+        flaky, lo_days = self.conn.execute(
+            "SELECT SUM(passes > 0 AND fails > 0), COUNT(*) FROM daily_lo_outcomes "
+            "WHERE source = 'capture' AND day >= ? AND day <= ?", (since, until)).fetchone()
+
+        days = self.conn.execute(
+            "SELECT MIN(day), MAX(day) FROM daily_rollup WHERE day >= ? AND day <= ?", (since, until)).fetchone()
+        weeks = None
+        if days[0]:
+            span = datetime.date.fromisoformat(days[1]) - datetime.date.fromisoformat(days[0])
+            weeks = (span.days + 1) / 7
+        # Nothing emits ROLLBACK yet; a rate of 0 would claim a measurement nobody makes
+        rollbacks_tracked = self.conn.execute(
+            "SELECT 1 FROM daily_rollup WHERE source = 'heal' AND action = 'ROLLBACK' LIMIT 1").fetchone()
+
+        return {
+            "auto_merge_rate": ratio(n("heal", "RELOCATED"), n("heal", *drift)),
+            "capture_pass_rate": ratio(n("capture", "PASS"), n("capture", "PASS", "FAIL")),
+            "anchor_hit_rate": ratio(n("capture", "ANCHOR_OK"), n("capture", "ANCHOR_OK", "ANCHOR_LOST")),
+            "drift_latency_hours": ratio(latency_sum, latency_n * 3600),
+            "flake_rate": ratio(flaky or 0, lo_days),
+            "rollbacks_per_week": ratio(n("heal", "ROLLBACK"), weeks) if rollbacks_tracked else None,
+        }
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,72 @@
+import heapq
+from typing import Dict, Iterable, List, Set, Tuple
+from tools.path_planner.graph import PrereqGraph
+
+# Architecture 6.2: within the prerequisite order, concept -> task -> troubleshooting.
+# Reference material sits with the concepts it supports.
+TYPE_RANK = {"concept": 0, "reference": 1, "task": 2, "troubleshooting": 3}
+
+
+def closure(graph: PrereqGraph, goals: Iterable[int]) -> Tuple[List[int], List[List[str]]]:
+    """
+    The goals plus all their transitive prerequisites, in topological order, and the
+    cycles among them. Walks the CSR arrays from the goals only, so the cost is the size
+    of the closure, not of the corpus.
+    """
+    return graph.topo_order(sorted(set(goals)))
+
+
+def blocked_nodes(graph: PrereqGraph, order: List[int], excluded: Set[int]) -> Set[int]:
+    """
+    Nodes of order (a topological order) that are excluded or have an excluded transitive
+    prerequisite, in one pass over their edges. Like topo_order, an edge that closes a
+    cycle is ignored.
+    """
+    blocked = set()
+    for n in order:
+        if n in excluded or any(p in blocked for p in graph.prereqs_of(n)):
+            blocked.add(n)
+    return blocked
+
+
+def step_priority(lo: Dict) -> Tuple:
+    """Architecture 6.2: concept -> task -> troubleshooting, then prefer higher trust_score."""
+    trust = lo.get("trust")
+    score = trust.get("trust_score") if isinstance(trust, dict) else None
+    return (TYPE_RANK.get(lo.get("type"), len(TYPE_RANK)),
+            -score if isinstance(score, (int, float)) and not isinstance(score, bool) else 0.0)
+
+
+def order_closure(graph: PrereqGraph, nodes: List[int], priorities: Dict[int, Tuple]) -> List[int]:
+    """
+    Orders a prerequisite closure so every node follows its prerequisites and, among the
+    nodes that are ready, the lowest priority (see step_priority) comes first (ties by id).
+    Nodes left over by a cycle are appended in the same priority order.
+    """
+    members = set(nodes)
+    indegree = {n: 0 for n in nodes}
+    dependents: Dict[int, List[int]] = {n: [] for n in nodes}
+    for n in nodes:
+        for p in graph.prereqs_of(n):
+            if p in members:
+                indegree[n] += 1
+                dependents[p].append(n)
+
+    def key(n):
+        return (priorities[n], graph.ids[n], n)
+
+    ready = [key(n) for n in nodes if indegree[n] == 0]
+    heapq.heapify(ready)
+    ordered = []
+    while ready:
+        n = heapq.heappop(ready)[2]
+        ordered.append(n)
+        for d in dependents[n]:
+            indegree[d] -= 1
+            if indegree[d] == 0:
+                heapq.heappush(ready, key(d))
+
+    if len(ordered) < len(nodes):
+        placed = set(ordered)
+        ordered.extend(sorted((n for n in nodes if n not in placed), key=key))
+    return ordered
@@ -1,86 +1,178 @@
 
 import os
 import json
-import yaml
-from typing import List, Dict, Set
+from collections import OrderedDict
+from typing import List, Dict, Optional, Set, Tuple
 from pathlib import Path
 from rich.console import Console
+from tools.corpus import LOCorpus, load_corpus
+from tools.path_planner.graph import PrereqGraph
+from tools.path_planner.closure import blocked_nodes, closure, order_closure, step_priority
+from tools.path_planner.context_filter import ContextFilter, bit_positions
 
 console = Console()
 
 class PathPlanner:
-    def __init__(self, context_path: str):
+    def __init__(self, context_path: Optional[str] = None, max_cached_plans: int = 4096,
+                 corpus: Optional[LOCorpus] = None):
         self.context = {}
-        if os.path.exists(context_path):
+        if context_path and os.path.exists(context_path):
             with open(context_path) as f:
                 self.context = json.load(f)
         
         self.los = {}
-        self.load_los()
-
-    def load_los(self):
-        knowledge_dir = Path("knowledge/learning_objects")
-        for root, dirs, files in os.walk(knowledge_dir):
-            for file in files:
-                if file.endswith(".yml") or file.endswith(".yaml"):
-                    try:
-                        with open(Path(root) / file) as f:
-                            data = yaml.safe_load(f)
-                            if "id" in data:
-                                self.los[data["id"]] = data
-                    except:
-                        pass
-
-    def plan(self) -> List[Dict]:
+        self.cycles = []
+        self.missing_prerequisites = {}
+        self.unknown_goals = []
+        self.blocked_goals = []
+        self.filtered_out = []
+        self.corpus_version = None
+        self.load_los(corpus)
+
+        self.graph = PrereqGraph({lo_id: lo.get("prerequisites", []) for lo_id, lo in self.los.items()})
+        self.filter = ContextFilter([self.los[lo_id] for lo_id in self.graph.ids])
+        # (exclusion bitmap, goals) -> (steps, diagnostics); contexts that rule out the same LOs share a plan
+        self._plans: "OrderedDict[Tuple[int, Tuple[str, ...]], Tuple[Tuple[str, ...], Dict]]" = OrderedDict()
+        # goal nodes -> (closure in topological order, cycles), shared by every context planning those goals
+        self._closures: "OrderedDict[Tuple[int, ...], Tuple[List[int], List[List[str]]]]" = OrderedDict()
+        self._topo: Optional[Tuple[List[int], List[List[str]]]] = None
+        self.max_cached_plans = max_cached_plans
+
+    def load_los(self, corpus: Optional[LOCorpus] = None):
+        corpus = corpus or load_corpus()
+        self.corpus_version = corpus.version()
+        for data in corpus.records():
+            self.los[data["id"]] = data
+
+    def plan(self, goals: Optional[List[str]] = None, context: Optional[Dict] = None) -> List[Dict]:
         """
-        Deterministic planning:
-        1. Context Filtering (Role/Skill) - Skipped for POC simplicity or simple exact match.
+        Deterministic planning (architecture 6.2):
+        1. Context Filtering - engine_version range, plugins, settings, lifecycle.status
+           and trust_score through the precomputed ContextFilter. An LO whose
+           prerequisites are filtered out is dropped as well.
         2. Sequence Ordering (Topological)
+        Cycles and prerequisites that do not exist are recorded in self.cycles and
+        self.missing_prerequisites rather than aborting the plan.
+        With goals, only the goals and their transitive prerequisites are planned (see plan_goals).
+        context defaults to the planner's context.json.
         """
-        # POC Constraint: Concept -> Task -> Troubleshooting
-        # We can implement a simple dependency resolver.
-        
-        visited = set()
-        path = []
-        
-        def visit(lo_id):
-            if lo_id in visited:
-                return
-            if lo_id not in self.los:
-                return
-            
-            lo = self.los[lo_id]
-            
-            # Visit prerequisites first
-            for prereq in lo.get("prerequisites", []):
-                visit(prereq)
-            
-            visited.add(lo_id)
-            path.append(lo)
-
-        # Naively try to visit all LOs in the system
-        # In a real system, we'd start from a 'goal' or 'root'
-        # Here we just want to linearize everything we have.
-        # To ensure deterministic order for independent nodes, we sort keys
-        sorted_ids = sorted(self.los.keys())
-        for lid in sorted_ids:
-            visit(lid)
-            
-        return path
-
-def run_plan(context_path: str):
+        return [self.los[lo_id] for lo_id in self.plan_steps(goals, context)]
+
+    def plan_steps(self, goals: Optional[List[str]] = None, context: Optional[Dict] = None) -> Tuple[str, ...]:
+        """Like plan, returning LO ids. Plans are memoized by the set of LOs the context excludes."""
+        excluded = self.filter.excluded(self.context if context is None else context)
+        key = (excluded, tuple(goals or ()))
+        cached = self._plans.get(key)
+        if cached is None:
+            cached = self._plans[key] = self._plan_uncached(goals, excluded)
+            if len(self._plans) > self.max_cached_plans:
+                self._plans.popitem(last=False)
+        else:
+            self._plans.move_to_end(key)
+
+        steps, diagnostics = cached
+        for name, value in diagnostics.items():
+            setattr(self, name, value)
+        return steps
+
+    def goal_closure(self, seeds: List[int]) -> Tuple[List[int], List[List[str]]]:
+        """closure() of the goal nodes, memoized per goal set."""
+        key = tuple(sorted(set(seeds)))
+        cached = self._closures.get(key)
+        if cached is None:
+            cached = self._closures[key] = closure(self.graph, key)
+            if len(self._closures) > self.max_cached_plans:
+                self._closures.popitem(last=False)
+        else:
+            self._closures.move_to_end(key)
+        return cached
+
+    def topo_order(self) -> Tuple[List[int], List[List[str]]]:
+        """Topological order of the whole graph and its cycles, computed on the first plan without goals."""
+        if self._topo is None:
+            self._topo = self.graph.topo_order()
+        return self._topo
+
+    def _plan_uncached(self, goals: Optional[List[str]], excluded: int):
+        graph = self.graph
+        if goals:
+            unknown_goals = [g for g in goals if g not in graph.index]
+            seeds = [graph.index[g] for g in goals if g in graph.index]
+            nodes, cycles = self.goal_closure(seeds)
+            members = {graph.ids[n] for n in nodes}
+            missing = {lo_id: m for lo_id, m in graph.missing.items() if lo_id in members}
+        else:
+            unknown_goals, seeds = [], []
+            nodes, cycles = self.topo_order()
+            missing = graph.missing
+
+        kept, filtered_out = nodes, []
+        if excluded:
+            blocked = blocked_nodes(graph, nodes, set(bit_positions(excluded)))
+            kept = [n for n in nodes if n not in blocked]
+            filtered_out = [graph.ids[n] for n in nodes if n in blocked]
+
+        if goals:
+            kept = self.plan_goals(kept)
+        blocked = set(filtered_out)
+
+        diagnostics = {
+            "cycles": cycles,
+            "missing_prerequisites": missing,
+            "unknown_goals": unknown_goals,
+            "blocked_goals": [graph.ids[n] for n in seeds if graph.ids[n] in blocked],
+            "filtered_out": filtered_out,
+        }
+        return tuple(graph.ids[n] for n in kept), diagnostics
+
+    def plan_goals(self, nodes: List[int]) -> List[int]:
+        """
+        Orders the prerequisite closure of the goals so that concepts come before tasks
+        before troubleshooting, and higher trust_score first, wherever the prerequisites
+        leave a choice.
+        """
+        priorities = {n: step_priority(self.los[self.graph.ids[n]]) for n in nodes}
+        return order_closure(self.graph, nodes, priorities)
+
+def run_plan(context_path: str, goals: Optional[List[str]] = None):
     console.print(f"[bold]Running Path Planner...[/bold]")
     planner = PathPlanner(context_path)
-    path = planner.plan()
-    
+    try:
+        path = save_plan(planner, goals)
+    except ValueError as e:
+        console.print(f"[red]{context_path}: {e}[/red]")
+        return
+
+    print_diagnostics(planner)
+    if planner.filtered_out:
+        console.print(f"Filtered out by context: {len(planner.filtered_out)} LOs.")
+    for goal in planner.blocked_goals:
+        console.print(f"[yellow]Goal {goal} is not available in this context.[/yellow]")
+    console.print(f"[green]Plan generated: {len(path)} steps.[/green]")
+    console.print(f"- out/path/path.json")
+    console.print(f"- out/path/path.md")
+
+
+def save_plan(planner: PathPlanner, goals: Optional[List[str]] = None) -> List[Dict]:
+    """Plans for goals and writes out/path/path.json and path.md. Returns the planned LOs."""
+    path = planner.plan(goals)
+
     out_dir = Path("out/path")
     os.makedirs(out_dir, exist_ok=True)
     
     # Write JSON
     path_data = {
         "context": planner.context,
+        "goals": goals or [],
         "steps": [lo["id"] for lo in path],
-        "details": path
+        "details": path,
+        "diagnostics": {
+            "cycles": planner.cycles,
+            "missing_prerequisites": planner.missing_prerequisites,
+            "blocked_goals": planner.blocked_goals,
+            "filtered_out": planner.filtered_out,
+            "requirement_errors": planner.filter.errors
+        }
     }
     with open(out_dir / "path.json", "w") as f:
         json.dump(path_data, f, indent=2)
@@ -98,7 +190,66 @@ def run_plan(context_path: str):
 
     with open(out_dir / "path.md", "w") as f:
         f.write(md_content)
+    return path
 
-    console.print(f"[green]Plan generated: {len(path)} steps.[/green]")
-    console.print(f"- out/path/path.json")
-    console.print(f"- out/path/path.md")
+
+def print_diagnostics(planner: PathPlanner):
+    for goal in planner.unknown_goals:
+        console.print(f"[red]Unknown goal: {goal}[/red]")
+    for cycle in planner.cycles:
+        console.print(f"[yellow]Prerequisite cycle: {' -> '.join(cycle + cycle[:1])}[/yellow]")
+    for lo_id, missing in planner.missing_prerequisites.items():
+        console.print(f"[yellow]{lo_id} has unknown prerequisites: {', '.join(missing)}[/yellow]")
+    for lo_id, error in planner.filter.errors.items():
+        console.print(f"[yellow]{lo_id}: {error} (requirement ignored)[/yellow]")
+
+def run_plan_batch(contexts_path: str, goals: Optional[List[str]] = None):
+    """
+    Plans every context in a JSONL file (one context object per line) against one
+    loaded corpus. Identical paths are written once; each context refers to its path by id.
+    """
+    console.print(f"[bold]Running Path Planner (batch)...[/bold]")
+    planner = PathPlanner()
+
+    path_ids: Dict[Tuple[str, ...], str] = {}
+    assignments = []
+    failed = 0
+    with open(contexts_path) as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                context = json.loads(line)
+                if not isinstance(context, dict):
+                    raise ValueError("context must be a JSON object")
+                steps = planner.plan_steps(goals, context)
+            except ValueError as e:
+                console.print(f"[red]{contexts_path}:{line_no}: {e}[/red]")
+                assignments.append({"line": line_no, "error": str(e)})
+                failed += 1
+                continue
+
+            path_id = path_ids.setdefault(steps, f"path_{len(path_ids)}")
+            assignment = {"line": line_no, "path": path_id}
+            if "id" in context:
+                assignment["id"] = context["id"]
+            if planner.blocked_goals:
+                assignment["blocked_goals"] = planner.blocked_goals
+            assignments.append(assignment)
+
+    out_dir = Path("out/path")
+    os.makedirs(out_dir, exist_ok=True)
+    batch_data = {
+        "goals": goals or [],
+        "paths": [{"id": path_id, "steps": list(steps)} for steps, path_id in path_ids.items()],
+        "contexts": assignments,
+    }
+    with open(out_dir / "batch.json", "w") as f:
+        json.dump(batch_data, f, indent=2)
+
+    print_diagnostics(planner)
+    planned = len(assignments) - failed
+    console.print(f"[green]Planned {planned} contexts: {len(path_ids)} distinct paths.[/green]")
+    if failed:
+        console.print(f"[red]{failed} contexts could not be planned.[/red]")
+    console.print(f"- out/path/batch.json")
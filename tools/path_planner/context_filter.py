@@ -0,0 +1,227 @@
+import re
+import json
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+# Architecture 6.2 step 3: these never make it into a path
+EXCLUDED_STATUSES = {"quarantined", "invalid"}
+
+_BOUND_RE = re.compile(r"^(>=|<=|==|=|>|<)?\s*v?(\d+(?:\.\d+){0,3})$")
+_VERSION_RE = re.compile(r"^v?\d+(?:\.\d+)*$")
+_VERSION_PARTS = 4
+
+
+def parse_version(text: str) -> Tuple[int, ...]:
+    """
+    '5.6.0' / '5.6' -> (5, 6, 0, 0), so versions of different lengths compare as expected.
+    Raises ValueError for anything that is not dot-separated numbers.
+    """
+    text = str(text).strip()
+    if not _VERSION_RE.match(text):
+        raise ValueError(f"Invalid engine_version: {text!r} (expected a version such as '5.6')")
+    parts = [int(p) for p in text.lstrip("v").split(".")[:_VERSION_PARTS]]
+    return tuple(parts + [0] * (_VERSION_PARTS - len(parts)))
+
+
+def parse_version_range(spec: str):
+    """
+    Parses a requirements.engine_version spec such as ">=5.3 <5.7" into
+    (low, low_inclusive, high, high_inclusive); unbounded ends are None.
+    Raises ValueError on anything that is not a list of comparisons.
+    """
+    low, low_inc, high, high_inc = None, True, None, True
+    for token in re.split(r"[\s,]+(?![\d.])", str(spec).strip()):
+        if not token:
+            continue
+        m = _BOUND_RE.match(token)
+        if not m:
+            raise ValueError(f"Invalid engine_version bound: {token!r}")
+        op, version = m.group(1) or "==", parse_version(m.group(2))
+        if op in (">=", ">", "==", "="):
+            inclusive = op != ">"
+            if low is None or version > low or (version == low and not inclusive):
+                low, low_inc = version, inclusive
+        if op in ("<=", "<", "==", "="):
+            inclusive = op != "<"
+            if high is None or version < high or (version == high and not inclusive):
+                high, high_inc = version, inclusive
+    return low, low_inc, high, high_inc
+
+
+def bit_positions(mask: int) -> List[int]:
+    """Positions of the set bits of mask, ascending."""
+    positions = []
+    # Walk the bitmap a byte at a time; only non-zero bytes reach Python code
+    for byte_pos, byte in enumerate(mask.to_bytes((mask.bit_length() + 7) // 8, "little")):
+        while byte:
+            low = byte & -byte
+            positions.append(byte_pos * 8 + low.bit_length() - 1)
+            byte ^= low
+    return positions
+
+
+def _setting_value(value) -> str:
+    # Canonical form, so that False / "false" style mismatches are real mismatches only
+    return json.dumps(value, sort_keys=True)
+
+
+class ContextFilter:
+    """
+    Precomputed exclusion bitmaps for filtering LOs by user context (architecture 6.2).
+    Every LO owns one bit (bit i for records[i]); a context is evaluated with a
+    handful of bitmap ORs instead of a pass over the corpus:
+
+    - engine_version: the distinct range bounds split the version line into elementary
+      segments, each with the bitmap of LOs whose range covers it, so a version lookup
+      is one bisect.
+    - plugins_required / plugins_incompatible: one bitmap per plugin name.
+    - settings_required: one bitmap per (setting key, required value).
+    - lifecycle.status quarantined/invalid: one bitmap, always excluded.
+    - trust.trust_score: LOs sorted by score, thresholds answered by bisect.
+
+    Context fields that are absent do not filter anything, so an empty context keeps
+    the whole corpus. LO fields that cannot be parsed (requirements, lifecycle, trust
+    of the wrong shape included) are recorded in self.errors and do not constrain the LO.
+    """
+
+    def __init__(self, records: List[Dict]):
+        self.errors: Dict[str, str] = {}
+        self.always_excluded = 0
+        self.requires_plugin: Dict[str, int] = {}
+        self.incompatible_plugin: Dict[str, int] = {}
+        self.requires_setting: Dict[str, Dict[str, int]] = {}
+        self._trust: List[Tuple[float, int]] = []
+        self._trust_masks: Dict[float, int] = {}
+
+        ranges = []
+        self.version_constrained = 0
+        for pos, lo in enumerate(records):
+            bit = 1 << pos
+            requirements = self._field(lo, lo, "requirements", dict, {})
+
+            status = self._field(lo, self._field(lo, lo, "lifecycle", dict, {}), "status", str, None)
+            if status in EXCLUDED_STATUSES:
+                self.always_excluded |= bit
+
+            score = self._field(lo, self._field(lo, lo, "trust", dict, {}), "trust_score", (int, float), None)
+            if score is not None:
+                self._trust.append((float(score), bit))
+
+            spec = requirements.get("engine_version")
+            if spec:
+                try:
+                    ranges.append((parse_version_range(spec), bit))
+                    self.version_constrained |= bit
+                except ValueError as e:
+                    self.errors[lo["id"]] = str(e)
+
+            for plugin in self._names(lo, requirements, "plugins_required"):
+                self.requires_plugin[plugin] = self.requires_plugin.get(plugin, 0) | bit
+            for plugin in self._names(lo, requirements, "plugins_incompatible"):
+                self.incompatible_plugin[plugin] = self.incompatible_plugin.get(plugin, 0) | bit
+            for setting in self._field(lo, requirements, "settings_required", list, []):
+                if not isinstance(setting, dict) or "key" not in setting:
+                    self.errors[lo["id"]] = f"Invalid settings_required entry: {setting!r}"
+                    continue
+                by_value = self.requires_setting.setdefault(setting["key"], {})
+                value = _setting_value(setting.get("equals"))
+                by_value[value] = by_value.get(value, 0) | bit
+
+        self._trust.sort(key=lambda t: t[0])
+        self._trust_scores = [score for score, _ in self._trust]
+        self._build_version_segments(ranges)
+
+    def _field(self, lo: Dict, parent: Dict, key: str, kind, default):
+        """parent[key] if it is a kind; otherwise default, noting the LO in self.errors unless the key is unset."""
+        value = parent.get(key)
+        if value is None:
+            return default
+        if isinstance(value, bool) or not isinstance(value, kind):
+            self.errors[lo["id"]] = f"Invalid {key}: {value!r}"
+            return default
+        return value
+
+    def _names(self, lo: Dict, requirements: Dict, key: str) -> List[str]:
+        names = self._field(lo, requirements, key, list, [])
+        if not all(isinstance(name, str) for name in names):
+            self.errors[lo["id"]] = f"Invalid {key}: {names!r} (expected a list of plugin names)"
+            return []
+        return names
+
+    def _build_version_segments(self, ranges):
+        # Point i splits the line into segments 2i (below it), 2i + 1 (exactly it) and 2i + 2
+        self.version_points = sorted({v for (low, _, high, _), _ in ranges for v in (low, high) if v is not None})
+        index = {v: i for i, v in enumerate(self.version_points)}
+        last = 2 * len(self.version_points)
+
+        toggles = [0] * (last + 2)
+        for (low, low_inc, high, high_inc), bit in ranges:
+            start = 0 if low is None else 2 * index[low] + (1 if low_inc else 2)
+            end = last if high is None else 2 * index[high] + (1 if high_inc else 0)
+            if start <= end:
+                toggles[start] ^= bit
+                toggles[end + 1] ^= bit
+
+        self.version_segments = []
+        covered = 0
+        for toggle in toggles[:last + 1]:
+            covered ^= toggle
+            self.version_segments.append(covered)
+
+    def _version_excluded(self, version: str) -> int:
+        v = parse_version(version)
+        i = bisect_left(self.version_points, v)
+        segment = 2 * i + 1 if i < len(self.version_points) and self.version_points[i] == v else 2 * i
+        return self.version_constrained & ~self.version_segments[segment]
+
+    def _trust_excluded(self, min_trust: float) -> int:
+        mask = self._trust_masks.get(min_trust)
+        if mask is None:
+            mask = 0
+            for _, bit in self._trust[:bisect_left(self._trust_scores, min_trust)]:
+                mask |= bit
+            self._trust_masks[min_trust] = mask
+        return mask
+
+    def excluded(self, context: Optional[Dict]) -> int:
+        """
+        Bitmap of the LOs this context rules out. Raises ValueError for a context field
+        of the wrong type or an engine_version that is not a version number.
+        """
+        context = context or {}
+        excluded = self.always_excluded
+
+        version = context.get("engine_version")
+        if version is not None and version != "":
+            # A JSON number would lose digits: 5.10 reads as 5.1
+            if not isinstance(version, str):
+                raise ValueError(f"Invalid engine_version: {version!r} (expected a version string such as '5.6')")
+            excluded |= self._version_excluded(version)
+
+        plugins = context.get("plugins")
+        if plugins is not None:
+            if not isinstance(plugins, list) or not all(isinstance(p, str) for p in plugins):
+                raise ValueError(f"Invalid plugins: {plugins!r} (expected a list of plugin names)")
+            plugins = set(plugins)
+            for plugin, mask in self.requires_plugin.items():
+                if plugin not in plugins:
+                    excluded |= mask
+            for plugin in plugins:
+                excluded |= self.incompatible_plugin.get(plugin, 0)
+
+        settings = context.get("project_settings") or {}
+        if not isinstance(settings, dict):
+            raise ValueError(f"Invalid project_settings: {settings!r} (expected an object)")
+        for key, by_value in self.requires_setting.items():
+            if key in settings:
+                actual = _setting_value(settings[key])
+                for value, mask in by_value.items():
+                    if value != actual:
+                        excluded |= mask
+
+        min_trust = context.get("min_trust_score")
+        if min_trust is not None:
+            if isinstance(min_trust, bool) or not isinstance(min_trust, (int, float)):
+                raise ValueError(f"Invalid min_trust_score: {min_trust!r} (expected a number)")
+            excluded |= self._trust_excluded(float(min_trust))
+        return excluded
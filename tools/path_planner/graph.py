@@ -0,0 +1,85 @@
+from itertools import accumulate, chain
+from typing import Dict, Iterable, List, Optional
+
+
+class PrereqGraph:
+    """
+    Prerequisite graph over integer node ids with CSR-style adjacency arrays:
+    the prerequisites of node i are targets[offsets[i]:offsets[i + 1]], in the
+    order the LO lists them. Node ids follow sorted LO id order, so iterating
+    ids ascending is the deterministic root order the planner has always used.
+    """
+
+    def __init__(self, prerequisites: Dict[str, List[str]]):
+        self.ids: List[str] = sorted(prerequisites)
+        self.index: Dict[str, int] = {lo_id: i for i, lo_id in enumerate(self.ids)}
+        # LO id -> prerequisite ids that are not in the graph
+        self.missing: Dict[str, List[str]] = {}
+
+        get = self.index.get
+        lists = [prerequisites[lo_id] for lo_id in self.ids]
+        self.targets: List[int] = list(map(get, chain.from_iterable(lists)))
+        self.offsets: List[int] = list(accumulate(map(len, lists), initial=0))
+
+        # Dangling prerequisites are rare, so they get the slow path
+        if None in self.targets:
+            self.targets, self.offsets = [], [0]
+            for lo_id, prereqs in zip(self.ids, lists):
+                for prereq in prereqs:
+                    target = get(prereq)
+                    if target is None:
+                        self.missing.setdefault(lo_id, []).append(prereq)
+                    else:
+                        self.targets.append(target)
+                self.offsets.append(len(self.targets))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def prereqs_of(self, node: int):
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def topo_order(self, roots: Optional[Iterable[int]] = None):
+        """
+        Iterative depth-first linearization: every node comes after its prerequisites,
+        roots are taken in id order (or the given order) and prerequisites in listed order.
+        With roots, only the roots and their transitive prerequisites are visited, so the
+        walk costs the size of that closure rather than of the graph.
+        Returns (order, cycles). A prerequisite edge that closes a cycle is reported
+        (as the list of LO ids on the cycle) and ignored, so planning always terminates.
+        """
+        n = len(self.ids)
+        offsets, targets = self.offsets, self.targets
+        WHITE, GRAY, BLACK = 0, 1, 2
+        state = bytearray(n)
+        order = []
+        cycles = []
+
+        for root in range(n) if roots is None else roots:
+            if state[root] != WHITE:
+                continue
+            stack = [root]
+            cursor = [offsets[root]]
+            state[root] = GRAY
+
+            while stack:
+                node = stack[-1]
+                pos = cursor[-1]
+                if pos < offsets[node + 1]:
+                    cursor[-1] = pos + 1
+                    nxt = targets[pos]
+                    s = state[nxt]
+                    if s == WHITE:
+                        state[nxt] = GRAY
+                        stack.append(nxt)
+                        cursor.append(offsets[nxt])
+                    elif s == GRAY:
+                        # Cycles are rare, so the stack is searched only when one closes
+                        cycles.append([self.ids[i] for i in stack[stack.index(nxt):]])
+                else:
+                    state[node] = BLACK
+                    order.append(node)
+                    stack.pop()
+                    cursor.pop()
+
+        return order, cycles
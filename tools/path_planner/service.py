@@ -0,0 +1,114 @@
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from tools.corpus import stat_fingerprint
+from tools.path_planner.cmd import PathPlanner
+
+
+def plan_key(context: Dict, goals: List[str], corpus_version: str) -> str:
+    """Canonical hash of a plan request: key order and whitespace in the context do not matter."""
+    canonical = json.dumps([context, goals, corpus_version], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class PlanningService:
+    """
+    Long-lived planner for `uke serve --api`. The LO graph, goal closures and context
+    filter stay resident in one PathPlanner; responses are memoized in an LRU keyed by
+    plan_key(context, goals, corpus version). LO files are stat'ed at most once per
+    check_interval seconds and the planner is rebuilt only when they changed.
+    Safe to call from several request threads.
+    """
+
+    def __init__(self, max_cached: int = 1024, check_interval: float = 1.0):
+        self.max_cached = max_cached
+        self.check_interval = check_interval
+        self.planner: Optional[PathPlanner] = None
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._fingerprint = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._refresh(force=True)
+
+    def _refresh(self, force: bool = False) -> bool:
+        """
+        Rebuilds the planner if LO files changed. Stat'ing the corpus and rebuilding run
+        outside the lock, by one thread at a time, so other requests keep being served
+        from the current planner; only the swap is locked.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and (self._refreshing or now - self._checked_at < self.check_interval):
+                return False
+            self._checked_at = now
+            self._refreshing = True
+            known = self._fingerprint
+
+        try:
+            fingerprint = stat_fingerprint()
+            if fingerprint == known:
+                return False
+            planner = PathPlanner()
+            with self._lock:
+                previous = self.planner.corpus_version if self.planner else None
+                self.planner = planner
+                self._fingerprint = fingerprint
+                # Entries for an older corpus can never be hit again
+                if planner.corpus_version != previous:
+                    self._cache.clear()
+            return True
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    @property
+    def corpus_version(self) -> str:
+        return self.planner.corpus_version
+
+    def plan(self, context: Optional[Dict] = None, goals: Optional[List[str]] = None) -> bytes:
+        """
+        JSON response body for one plan request. Raises ValueError for goals that are not
+        LO id strings or a context the planner cannot filter by (see ContextFilter.excluded).
+        """
+        context = context or {}
+        if not all(isinstance(goal, str) for goal in goals or []):
+            raise ValueError("goals must be a list of LO ids")
+        goals = sorted(set(goals or []))
+        self._refresh()
+        with self._lock:
+            key = plan_key(context, goals, self.planner.corpus_version)
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return body
+
+            self.misses += 1
+            planner = self.planner
+            steps = planner.plan_steps(goals, context)
+            body = json.dumps({
+                "corpus_version": planner.corpus_version,
+                "context": context,
+                "goals": goals,
+                "steps": list(steps),
+                "details": [{"id": lo_id, "type": planner.los[lo_id].get("type"),
+                             "title": planner.los[lo_id].get("title")} for lo_id in steps],
+                "diagnostics": {
+                    "cycles": planner.cycles,
+                    "missing_prerequisites": planner.missing_prerequisites,
+                    "unknown_goals": planner.unknown_goals,
+                    "blocked_goals": planner.blocked_goals,
+                    "filtered_out": planner.filtered_out,
+                },
+            }).encode("utf-8")
+
+            self._cache[key] = body
+            if len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+            return body
@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from rich.console import Console
+from rich.table import Table
+from tools.corpus import load_corpus
+from tools.gate.validator import run_validation, stat_engine_files
+
+console = Console()
+
+STATE_PATH = Path("out/cache/pipeline.json")
+STATE_VERSION = 1
+
+
+def fingerprint(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def file_hash(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def tree_signature(root: Path) -> List[Tuple[str, int, int]]:
+    """(path, size, mtime) of every file under root, in path order."""
+    signature = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            st = os.stat(path)
+            signature.append((path, st.st_size, st.st_mtime_ns))
+    return sorted(signature)
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline step. key() fingerprints everything the step reads (None if the step
+    does not apply to this invocation); run() does the work and returns a one-line summary.
+    outputs are the files the step owns, whose content is checked before the step is skipped.
+    """
+    name: str
+    deps: Tuple[str, ...]
+    key: Callable[[], Optional[str]]
+    run: Callable[[], str]
+    outputs: Tuple[str, ...]
+
+
+class Pipeline:
+    """
+    gate -> heal -> plan -> site in one process, over one loaded corpus and one stat of
+    every evidence file. A stage is skipped when its input key and its outputs are the
+    same as after its last run and none of the stages it depends on ran.
+    """
+
+    def __init__(self, engine: Optional[str], from_sha: Optional[str] = None, to_sha: Optional[str] = None,
+                 context_path: str = "context.json", goals: Optional[List[str]] = None,
+                 jobs: int = 1, no_capture: bool = False, state_path: Path = STATE_PATH):
+        self.engine = engine
+        self.from_sha = from_sha
+        self.to_sha = to_sha
+        self.context_path = context_path
+        self.goals = goals or []
+        self.jobs = jobs
+        self.no_capture = no_capture
+        self.state_path = state_path
+        self.state = self._load_state()
+        self.timings: List[Tuple[str, str, float, str]] = []
+
+        self.corpus = None
+        self.engine_stats = None
+        self.stages = {stage.name: stage for stage in [
+            Stage("gate", (), self.gate_key, self.run_gate, ("out/gate_report.json",)),
+            Stage("heal", ("gate",), self.heal_key, self.run_heal, ("out/status.json",)),
+            Stage("plan", (), self.plan_key, self.run_plan, ("out/path/path.json",)),
+            Stage("site", ("gate", "heal", "plan"), self.site_key, self.run_site, ("out/site/index.html",)),
+        ]}
+
+    def _load_state(self) -> Dict[str, Dict]:
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state.get("stages", {}) if state.get("version") == STATE_VERSION else {}
+
+    def _save_state(self):
+        os.makedirs(self.state_path.parent, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"version": STATE_VERSION, "stages": self.state}, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def timed(self, name: str, result: str, fn: Callable[[], str]):
+        start = time.perf_counter()
+        detail = fn()
+        self.timings.append((name, result, time.perf_counter() - start, detail or ""))
+
+    def load(self) -> str:
+        self.corpus = load_corpus(jobs=self.jobs)
+        return f"{len(self.corpus.entries)} LO files"
+
+    def stat_engine(self) -> str:
+        rel_paths = {ev.file for lo in self.corpus.learning_objects() for ev in lo.evidence}
+        self.engine_stats = stat_engine_files(Path(self.engine), rel_paths, self.jobs)
+        missing = sum(1 for st in self.engine_stats.values() if st is None)
+        return f"{len(self.engine_stats)} evidence files, {missing} missing"
+
+    # Stage keys
+
+    def gate_key(self) -> str:
+        from tools.index.trigram import index_identity
+        mtimes = sorted((p, st.st_mtime_ns if st else None) for p, st in (self.engine_stats or {}).items())
+        # Missing evidence is relocated through the source index, so a rebuilt index re-runs the gate
+        return fingerprint(self.corpus.version(), self.engine, self.no_capture, mtimes, index_identity())
+
+    def heal_key(self) -> Optional[str]:
+        if not (self.engine and self.from_sha and self.to_sha):
+            return None
+        from tools.freshness.git_ops import resolve_commit
+        # Branch names and HEAD are pinned to commits, so a moved ref re-runs the heal
+        shas = [resolve_commit(self.engine, ref) or ref for ref in (self.from_sha, self.to_sha)]
+        return fingerprint(self.corpus.version(), self.engine, shas)
+
+    def plan_key(self) -> str:
+        return fingerprint(self.corpus.version(), file_hash(self.context_path), self.goals)
+
+    def site_key(self) -> str:
+        from tools.site_gen.cmd import TEMPLATES_FINGERPRINT
+        return fingerprint(self.corpus.version(), TEMPLATES_FINGERPRINT, file_hash("out/status.json"),
+                           file_hash("out/path/path.json"), tree_signature(Path("out/images")))
+
+    # Stage bodies
+
+    def run_gate(self) -> str:
+        report = run_validation(self.engine, self.no_capture, self.jobs, incremental=True,
+                                corpus=self.corpus, engine_stats=self.engine_stats)
+        verified = sum(1 for v in report.status_map.values() if v == "verified")
+        total = len(report.status_map)
+        return f"{verified}/{total} verified, {total - report.reused_count} revalidated"
+
+    def run_heal(self) -> str:
+        from tools.freshness.cmd import run_heal
+        heal_status = run_heal(self.engine, self.from_sha, self.to_sha, self.jobs,
+                               corpus=self.corpus, engine_stats=self.engine_stats)
+        attention = sum(1 for status in heal_status.values() if status != "verified")
+        return f"{len(heal_status)} LOs checked, {attention} need attention"
+
+    def run_plan(self) -> str:
+        from tools.path_planner.cmd import PathPlanner, save_plan
+        path = save_plan(PathPlanner(self.context_path, corpus=self.corpus), self.goals)
+        return f"{len(path)} steps"
+
+    def run_site(self) -> str:
+        from tools.site_gen.cmd import SiteGenerator
+        gen = SiteGenerator(jobs=self.jobs, corpus=self.corpus)
+        gen.generate()
+        return f"{gen.written} written, {gen.skipped} unchanged, {gen.removed} removed"
+
+    def is_current(self, name: str, key: str, outputs: Tuple[str, ...]) -> bool:
+        """True if the stage last ran on the same key and its outputs are still what it wrote."""
+        previous = self.state.get(name, {})
+        if previous.get("key") != key:
+            return False
+        recorded = previous.get("outputs", {})
+        for path in outputs:
+            digest = file_hash(path)
+            if digest is None or recorded.get(path) != digest:
+                return False
+        return True
+
+    def run(self, force: bool = False):
+        self.timed("load", "ran", self.load)
+        if self.engine:
+            self.timed("engine stat", "ran", self.stat_engine)
+
+        ran = set()
+        # Stages are declared after the stages they depend on
+        for name, stage in self.stages.items():
+            start = time.perf_counter()
+            key = stage.key()
+            if key is None:
+                self.timings.append((name, "n/a", time.perf_counter() - start, "not configured"))
+                continue
+
+            if not force and not ran.intersection(stage.deps) and self.is_current(name, key, stage.outputs):
+                self.timings.append((name, "unchanged", time.perf_counter() - start, ""))
+                continue
+
+            detail = stage.run()
+            ran.add(name)
+            self.state[name] = {"key": key, "outputs": {p: file_hash(p) for p in stage.outputs}}
+            self._save_state()
+            self.timings.append((name, "ran", time.perf_counter() - start, detail))
+
+
+def run_pipeline(engine: Optional[str], from_sha: Optional[str] = None, to_sha: Optional[str] = None,
+                 context_path: str = "context.json", goals: Optional[List[str]] = None,
+                 jobs: int = 1, no_capture: bool = False, force: bool = False):
+    if bool(from_sha) != bool(to_sha):
+        console.print("[red]--from-sha and --to-sha must be given together.[/red]")
+        return
+    if not engine:
+        console.print("[yellow]Warning: No engine path provided. Skipping evidence file checks and heal.[/yellow]")
+
+    console.print(f"[bold]Running Pipeline...[/bold]")
+    pipeline = Pipeline(engine, from_sha, to_sha, context_path, goals, jobs, no_capture)
+    start = time.perf_counter()
+    pipeline.run(force)
+    total = time.perf_counter() - start
+
+    table = Table(title="UKE Pipeline")
+    table.add_column("Stage")
+    table.add_column("Result")
+    table.add_column("Time", justify="right")
+    table.add_column("Detail")
+    colors = {"ran": "green", "unchanged": "blue", "n/a": "yellow"}
+    for name, result, seconds, detail in pipeline.timings:
+        table.add_row(name, f"[{colors[result]}]{result}[/]", f"{seconds * 1000:.0f} ms", detail)
+    table.add_row("[bold]total[/bold]", "", f"[bold]{total * 1000:.0f} ms[/bold]", "")
+    console.print(table)
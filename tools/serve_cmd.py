@@ -1,14 +1,41 @@
 
 import os
+import re
+import json
+import mimetypes
+import threading
 import http.server
 import socketserver
 import webbrowser
+from collections import OrderedDict
+from email.utils import formatdate
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import urlsplit, parse_qs, unquote
 from rich.console import Console
 
 console = Console()
 
-def run_serve():
-    port = 8000
+SITE_DIR = Path("out/site")
+# LO pages reference captures as ../../images/..., i.e. outside the site directory
+MOUNTS = {"images/": Path("out/images")}
+# Assets written by `uke site` under content-hashed names never change
+HASHED_ASSET_RE = re.compile(r"\.[0-9a-f]{10}\.(?:css|js)$")
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+def run_serve(api: bool = False, port: int = 8000, prod: bool = False, host: str = "",
+              watch: bool = False, engine: Optional[str] = None, context_path: str = "context.json"):
+    if watch:
+        from tools.watch.cmd import run_watch_serve
+        run_watch_serve(engine, context_path, host or "127.0.0.1", port)
+        return
+    if api:
+        run_serve_api(port)
+        return
+    if prod:
+        run_serve_prod(host or "0.0.0.0", port)
+        return
+
     directory = "out/site"
     
     if not os.path.exists(directory):
@@ -30,3 +57,260 @@ def run_serve():
         except KeyboardInterrupt:
             console.print("\n[yellow]Server stopped.[/yellow]")
             httpd.server_close()
+
+def run_serve_api(port: int = 8000):
+    """
+    Local planning API. GET /plan?goal=ID&goal=ID&context=<json> or POST /plan with
+    {"context": {...}, "goals": [...]} returns the plan as JSON.
+    """
+    from tools.path_planner.service import PlanningService
+
+    console.print("[bold]Loading corpus...[/bold]")
+    service = PlanningService()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path != "/plan":
+                self.send_json(404, {"error": f"Unknown endpoint: {url.path}"})
+                return
+            query = parse_qs(url.query)
+            try:
+                context = json.loads(query["context"][0]) if "context" in query else {}
+            except ValueError as e:
+                self.send_json(400, {"error": f"Invalid context: {e}"})
+                return
+            self.respond_plan(context, query.get("goal", []))
+
+        def do_POST(self):
+            if urlsplit(self.path).path != "/plan":
+                self.send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as e:
+                self.send_json(400, {"error": f"Invalid request: {e}"})
+                return
+            self.respond_plan(request.get("context") or {}, request.get("goals") or [])
+
+        def respond_plan(self, context, goals):
+            if not isinstance(context, dict) or not isinstance(goals, list):
+                self.send_json(400, {"error": "context must be an object and goals a list"})
+                return
+            try:
+                body = service.plan(context, goals)
+            except ValueError as e:
+                self.send_json(400, {"error": str(e)})
+                return
+            self.send_body(200, body)
+
+        def send_json(self, status, payload):
+            self.send_body(status, json.dumps(payload).encode("utf-8"))
+
+        def send_body(self, status, body):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with http.server.ThreadingHTTPServer(("127.0.0.1", port), Handler) as httpd:
+        console.print(f"[green]Planning API at http://127.0.0.1:{port}/plan[/green]")
+        console.print(f"Corpus version: {service.corpus_version[:12]}")
+        console.print("Press Ctrl+C to stop.")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            console.print("\n[yellow]Server stopped.[/yellow]")
+            console.print(f"Plan cache: {service.hits} hits, {service.misses} misses.")
+
+
+class HotFileCache:
+    """
+    LRU of small file bodies keyed by (path, mtime_ns, size), bounded by total bytes.
+    A changed file simply misses, since its stat key changes.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_file: int = 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_file = max_file
+        self._entries: "OrderedDict[Tuple[str, int, int], bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, path: str, st: os.stat_result) -> Optional[bytes]:
+        key = (path, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                return body
+        if st.st_size > self.max_file:
+            return None
+
+        with open(path, "rb") as f:
+            body = f.read()
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = body
+                self._size += len(body)
+                while self._size > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._size -= len(evicted)
+        return body
+
+
+def resolve_site_path(url_path: str) -> Optional[Path]:
+    """File under out/site (or a mount) for a URL path; None if missing or outside them."""
+    rel = unquote(url_path).lstrip("/")
+    parts = [p for p in rel.split("/") if p not in ("", ".")]
+    # On Windows "\\" separates and "C:" re-roots a path, so neither may hide inside a part
+    if any(p == ".." or "\\" in p or ":" in p for p in parts):
+        return None
+    rel = "/".join(parts)
+    base = SITE_DIR
+    for prefix, directory in MOUNTS.items():
+        if rel.startswith(prefix):
+            base, rel = directory, rel[len(prefix):]
+    path = base / rel
+    if not path.resolve().is_relative_to(base.resolve()):
+        return None
+    if path.is_dir():
+        path = path / "index.html"
+    return path if path.is_file() else None
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Single "bytes=start-end" range -> inclusive (start, end); None if unsatisfiable or malformed."""
+    m = re.fullmatch(r"bytes=(\d*)-(\d*)", header.strip())
+    if not m or (not m.group(1) and not m.group(2)):
+        return None
+    if not m.group(1):
+        length = int(m.group(2))
+        if length == 0:
+            return None
+        return max(0, size - length), size - 1
+    start = int(m.group(1))
+    end = int(m.group(2)) if m.group(2) else size - 1
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def run_serve_prod(host: str = "0.0.0.0", port: int = 8000):
+    """
+    Production static server for out/site: threaded, HTTP/1.1 keep-alive, precompressed
+    .br/.gz siblings from `uke site`, ETag/Last-Modified revalidation (304), single byte
+    ranges (206), immutable caching for content-hashed assets, and small files served
+    from memory.
+    """
+    if not SITE_DIR.exists():
+        console.print(f"[red]Directory {SITE_DIR} does not exist. Run 'uke site' first.[/red]")
+        return
+
+    cache = HotFileCache()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        server_version = "uke"
+
+        def do_GET(self):
+            self.serve(send_body=True)
+
+        def do_HEAD(self):
+            self.serve(send_body=False)
+
+        def serve(self, send_body: bool):
+            path = resolve_site_path(urlsplit(self.path).path)
+            if path is None:
+                self.send_error(404, "File not found")
+                return
+
+            content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            if content_type.startswith("text/") or content_type in ("application/javascript", "application/json"):
+                content_type += "; charset=utf-8"
+
+            # Pick a precompressed representation, unless a byte range of the file was asked for
+            encoding, file_path = None, str(path)
+            range_header = self.headers.get("Range")
+            if not range_header:
+                accepted = self.headers.get("Accept-Encoding", "")
+                for name, suffix in ENCODINGS:
+                    if re.search(rf"\b{name}\b", accepted) and os.path.exists(file_path + suffix):
+                        encoding, file_path = name, file_path + suffix
+                        break
+
+            st = os.stat(file_path)
+            etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}{"-" + encoding if encoding else ""}"'
+            immutable = bool(HASHED_ASSET_RE.search(path.name))
+            headers = {
+                "ETag": etag,
+                "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+                "Cache-Control": "public, max-age=31536000, immutable" if immutable else "no-cache",
+                "Vary": "Accept-Encoding",
+                "Accept-Ranges": "bytes",
+            }
+
+            if_none_match = self.headers.get("If-None-Match")
+            if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+                self.send_response(304)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            status, start, end = 200, 0, st.st_size - 1
+            if range_header:
+                byte_range = parse_range(range_header, st.st_size)
+                if byte_range is None:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{st.st_size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status, (start, end) = 206, byte_range
+
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            if status == 206:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{st.st_size}")
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+            if not send_body:
+                return
+
+            body = cache.get(file_path, st)
+            if body is not None:
+                self.wfile.write(body[start:end + 1] if status == 206 else body)
+                return
+            with open(file_path, "rb") as f:
+                f.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = f.read(min(remaining, 1024 * 1024))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+
+        def log_message(self, format, *args):
+            pass
+
+    with http.server.ThreadingHTTPServer((host, port), Handler) as httpd:
+        console.print(f"[green]Serving {SITE_DIR} on http://{host}:{port}[/green]")
+        console.print("Press Ctrl+C to stop.")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            console.print("\n[yellow]Server stopped.[/yellow]")
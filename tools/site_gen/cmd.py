@@ -1,89 +1,47 @@
 
 import os
+import re
+import gzip
 import json
-import yaml
+import hashlib
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 from rich.console import Console
+from tools.corpus import LOCorpus, load_corpus
+from tools.site_gen.graph import GRAPH_FINGERPRINT, GRAPH_JS, GRAPH_MANIFEST, build_graph_files
+from tools.site_gen.search import (SEARCH_FINGERPRINT, SEARCH_JS, SEARCH_MANIFEST,
+                                   build_search_files, search_inputs)
+
+# brotli is optional; without it only .gz siblings are written
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 console = Console()
 
-class SiteGenerator:
-    def __init__(self):
-        self.out_dir = Path("out/site")
-        self.data_dir = self.out_dir / "data"
-        self.images_dir = Path("out/images") # External to site, but referenced
-        self.status = {}
-        if os.path.exists("out/status.json"):
-            with open("out/status.json") as f:
-                self.status = json.load(f)
-        
-        self.los = []
-        self.load_los()
-
-    def load_los(self):
-        knowledge_dir = Path("knowledge/learning_objects")
-        for root, dirs, files in os.walk(knowledge_dir):
-            for file in files:
-                if file.endswith(".yml") or file.endswith(".yaml"):
-                    try:
-                        with open(Path(root) / file) as f:
-                            data = yaml.safe_load(f)
-                            if "id" in data:
-                                self.los.append(data)
-                    except:
-                        pass
+MANIFEST_PATH = Path("out/cache/site_manifest.json")
+MANIFEST_VERSION = 1
 
-    def generate(self):
-        os.makedirs(self.out_dir, exist_ok=True)
-        os.makedirs(self.data_dir, exist_ok=True)
-        
-        # 1. Generate Data JSON
-        self.generate_graph_json()
-        self.generate_paths_json() # Reuse Planner output conceptually
-        
-        # 2. Generate HTML Pages
-        self.generate_index()
-        self.generate_lo_pages()
-        self.generate_graph_page()
-        self.generate_path_page()
-        
-        # 3. Copy CSS/JS string assets (inline or file write)
-        self.write_assets()
 
-    def generate_graph_json(self):
-        nodes = []
-        links = []
-        for lo in self.los:
-            status = self.status.get(lo["id"], "unknown")
-            color = "#4caf50" if status=="verified" else "#ff9800" if status=="needs_review" else "#f44336"
-            
-            nodes.append({
-                "id": lo["id"],
-                "title": lo["title"],
-                "type": lo["type"],
-                "status": status,
-                "color": color
-            })
-            
-            for p in lo.get("prerequisites", []):
-                links.append({"source": p, "target": lo["id"]})
-                
-        graph = {"nodes": nodes, "links": links}
-        with open(self.data_dir / "graph.json", "w") as f:
-            json.dump(graph, f, indent=2)
+def fingerprint(*parts) -> str:
+    """Stable hash of the JSON-serializable inputs a page is rendered from."""
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
-    def generate_paths_json(self):
-        # Read from out/path/path.json if exists
-        path_file = Path("out/path/path.json")
-        if path_file.exists():
-            with open(path_file) as f:
-                data = json.load(f)
-            with open(self.data_dir / "paths.json", "w") as f:
-                json.dump(data, f, indent=2)
 
-    def write_assets(self):
-        # Simple CSS
-        css = """
+def file_signature(path: Path):
+    """(mtime_ns, size) of a file that pages reference but do not embed, or None if it is absent."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+# Simple CSS
+STYLE_CSS = """
         body { font-family: 'Segoe UI', sans-serif; margin: 0; padding: 0; background: #f5f5f5; color: #333; }
         header { background: #222; color: #fff; padding: 1rem; display: flex; justify-content: space-between; align-items: center; }
         nav a { color: #ccc; text-decoration: none; margin-left: 1rem; }
@@ -100,12 +58,31 @@ class SiteGenerator:
         pre { background: #eee; padding: 1rem; overflow-x: auto; }
         img { max-width: 100%; border: 1px solid #ddd; }
         .status-container { margin-bottom: 2rem; }
+        .facets { margin: 1rem 0; font-size: 0.9rem; }
+        .pager { margin: 1rem 0; text-align: center; }
         """
-        with open(self.out_dir / "style.css", "w") as f:
-            f.write(css)
 
-    def _header(self):
-        return """
+
+def asset_name(stem: str, ext: str, content: str) -> str:
+    """Content-addressed file name, e.g. style.1a2b3c4d5e.css."""
+    return f"{stem}.{hashlib.sha256(content.encode('utf-8')).hexdigest()[:10]}.{ext}"
+
+
+STYLE_ASSET = asset_name("style", "css", STYLE_CSS)
+SEARCH_ASSET = asset_name("search", "js", SEARCH_JS)
+GRAPH_ASSET = asset_name("graph", "js", GRAPH_JS)
+ASSETS = {STYLE_ASSET: STYLE_CSS, SEARCH_ASSET: SEARCH_JS, GRAPH_ASSET: GRAPH_JS}
+
+# Pages are rendered by this module and link the assets by name, so together they stand in for the templates
+TEMPLATES_FINGERPRINT = hashlib.sha256(Path(__file__).read_bytes() + " ".join(ASSETS).encode("utf-8")).hexdigest()
+
+# Text outputs at least this large also get precompressed .gz (and .br, with brotli installed)
+# siblings for `uke serve --prod`
+COMPRESS_MIN_SIZE = 512
+
+# Templates are plain str.format strings, assembled once at import. Pages one level
+# down (lo/) get the header with its links already rebased.
+HEADER = """
         <header>
             <div class="logo">UKE v4.1</div>
             <nav>
@@ -115,202 +92,463 @@ class SiteGenerator:
             </nav>
         </header>
         """
+LO_HEADER = HEADER.replace('href="', 'href="../')
 
-    def generate_index(self):
-        html = f"""
+# Listing pages: index.html is the first page of all LOs, browse/<facet>-<n>.html the rest.
+# {root} is the path back to the site root ("" or "../").
+LISTING_HEAD = """
         <!DOCTYPE html>
         <html>
-        <head><title>Unreal Knowledge Engine</title><link rel="stylesheet" href="style.css"></head>
+        <head><title>{title}</title><link rel="stylesheet" href="{root}{style}"></head>
         <body>
-            {self._header()}
+            {header}
             <div class="container">
-                <h1>Knowledge Base</h1>
-                <div class="search-bar">
-                    <input type="text" placeholder="Search..." style="width: 100%; padding: 0.5rem;">
-                </div>
+                <h1>Knowledge Base</h1>{search}
+                {facets}
                 <div class="status-container">
-                    <h3>Learning Objects</h3>
+                    <h3>{heading}</h3>
         """
-        
-        for lo in self.los:
-            status = self.status.get(lo["id"], "unknown")
-            html += f"""
+
+SEARCH_BOX = """
+                <div class="search-bar">
+                    <input type="text" id="search" placeholder="Search..." style="width: 100%; padding: 0.5rem;">
+                    <div id="search-results"></div>
+                </div>"""
+
+INDEX_CARD = """
                 <div class="card">
                     <div style="display:flex; justify-content:space-between;">
-                        <h3><a href="lo/{lo['id']}.html">{lo['title']}</a></h3>
+                        <h3><a href="{root}lo/{id}.html">{title}</a></h3>
                         <div>
-                            <span class="badge {lo['type']}">{lo['type']}</span>
+                            <span class="badge {type}">{type}</span>
                             <span class="badge {status}">{status}</span>
                         </div>
                     </div>
-                    <p>{lo['description']}</p>
+                    <p>{description}</p>
                 </div>
             """
-            
-        html += """
+
+LISTING_TAIL = """
+                <div class="pager">{pager}</div>
+            </div>
+            </div>{scripts}
+        </body>
+        </html>
+        """
+
+SEARCH_SCRIPT = """
+            <script src="{search}"></script>"""
+
+FACET_LINK = '<a href="{root}{href}">{label}</a> ({count})'
+FACET_LINK_PLAIN = '<a href="{root}{href}">{label}</a>'
+PAGER_PREV = '<a href="{root}{href}">&larr; Previous</a> '
+PAGER_NEXT = ' <a href="{root}{href}">Next &rarr;</a>'
+
+PAGE_SIZE = 100
+
+
+def facet_slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]", "_", str(value))
+
+
+def graph_shard_key(lo_id: str) -> str:
+    """Graph shard of an LO: its id up to the first dot. Mirrored by the ?focus= lookup in graph.js."""
+    return facet_slug(lo_id.split(".", 1)[0]) or "_"
+
+
+def listing_path(facet: str, page: int) -> str:
+    """Site-relative path of page `page` (1-based) of a facet listing."""
+    if facet == "all" and page == 1:
+        return "index.html"
+    return f"browse/{facet}-{page}.html"
+
+
+LO_IMAGE = """
+            <div class="card">
+                <h2>Tutorial Capture</h2>
+                <img src="../../images/{id}/step_01.final.png" alt="Capture">
             </div>
+            """
+
+LO_EVIDENCE_ITEM = "<li><b>{symbol}</b> in <i>{file}</i> (Hash: {hash}...)</li>"
+LO_PREREQ_ITEM = '<li><a href="{id}.html">{title}</a></li>'
+
+LO_PAGE = """
+        <!DOCTYPE html>
+        <html>
+        <head><title>{title}</title><link rel="stylesheet" href="../{style}"></head>
+        <body>
+            {header}
+            <div class="container">
+                <div style="margin-bottom:1rem;"><a href="../index.html">&larr; Back</a></div>
+                <div class="card">
+                    <h1>{title}</h1>
+                    <div style="margin-bottom:1rem;">
+                        <span class="badge {type}">{type}</span>
+                        <span class="badge {status}">{status}</span>
+                    </div>
+                    <p>{description}</p>
+                </div>
+                
+                {img_html}
+                
+                <div class="card">
+                    <h3>Evidence</h3>
+                    {evidence_html}
+                </div>
+                
+                <div class="card">
+                    <h3>Prerequisites</h3>
+                    <ul>
+                        {prereq_html}
+                    </ul>
+                </div>
             </div>
         </body>
         </html>
         """
-        with open(self.out_dir / "index.html", "w") as f:
-            f.write(html)
+
+
+def render_lo_page(lo: Dict, status: str, prereqs: List[Tuple[str, str]], has_image: bool) -> str:
+    """LO detail page. prereqs are (id, title) pairs; has_image says whether the capture exists."""
+    # Relative path from out/site/lo/FILE.html -> out/images/...
+    img_html = LO_IMAGE.format(id=lo["id"]) if has_image else ""
+    evidence_html = "<ul>" + "".join(
+        LO_EVIDENCE_ITEM.format(symbol=ev["symbol"], file=ev["file"], hash=ev["snippet_hash"][:8])
+        for ev in lo.get("evidence", [])) + "</ul>"
+    prereq_html = "".join(LO_PREREQ_ITEM.format(id=p, title=title) for p, title in prereqs)
+    return LO_PAGE.format(header=LO_HEADER, style=STYLE_ASSET, title=lo["title"], type=lo["type"], status=status,
+                          description=lo["description"], img_html=img_html,
+                          evidence_html=evidence_html, prereq_html=prereq_html)
+
+
+def precompress(path: Path):
+    """
+    Writes path.gz (and path.br) next to a text output, deterministically, so a server can
+    send them as-is. Stale siblings are removed when the output no longer qualifies.
+    """
+    data = Path(path).read_bytes()
+    variants = {".gz": None, ".br": None}
+    if len(data) >= COMPRESS_MIN_SIZE:
+        variants[".gz"] = gzip.compress(data, compresslevel=9, mtime=0)
+        if brotli is not None:
+            variants[".br"] = brotli.compress(data)
+    for suffix, compressed in variants.items():
+        sibling = f"{path}{suffix}"
+        if compressed is None:
+            if os.path.exists(sibling):
+                os.remove(sibling)
+            continue
+        with open(sibling, "wb") as f:
+            f.write(compressed)
+
+
+def write_output(path: Path, content: Union[str, Iterable[str]]):
+    """Writes a text output (one string or streamed chunks) and its precompressed siblings."""
+    with open(path, "w", encoding="utf-8") as f:
+        if isinstance(content, str):
+            f.write(content)
+        else:
+            f.writelines(content)
+    precompress(path)
+
+
+def _write_lo_page(task):
+    path, lo, status, prereqs, has_image = task
+    write_output(path, render_lo_page(lo, status, prereqs, has_image))
+
+
+def write_lo_pages(tasks: List[Tuple], jobs: int = 1):
+    """Renders and writes LO pages, fanning out across a process pool when jobs > 1."""
+    if jobs <= 1 or len(tasks) < 2:
+        for task in tasks:
+            _write_lo_page(task)
+        return
+    chunksize = max(1, len(tasks) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(_write_lo_page, tasks, chunksize=chunksize))
+
+
+class SiteGenerator:
+    """
+    Builds out/site incrementally. Every output file is registered with a fingerprint
+    of everything it is rendered from (LO YAML, status, capture image, prerequisite
+    titles, templates); the fingerprints are kept in out/cache/site_manifest.json.
+    A page is re-rendered only when its fingerprint changed or the file is missing,
+    and files the previous build wrote that this build does not are deleted.
+    """
+
+    def __init__(self, manifest_path: Path = MANIFEST_PATH, jobs: int = 1, corpus: Optional[LOCorpus] = None):
+        self.out_dir = Path("out/site")
+        self.jobs = jobs
+        self.data_dir = self.out_dir / "data"
+        self.images_dir = Path("out/images") # External to site, but referenced
+        self.manifest_path = manifest_path
+        self.status = {}
+        if os.path.exists("out/status.json"):
+            with open("out/status.json") as f:
+                self.status = json.load(f)
+        
+        self.los = []
+        self.content_hashes: Dict[str, str] = {}
+        self.load_los(corpus)
+
+        self.previous_pages: Dict[str, str] = self._load_manifest()
+        self.pages: Dict[str, str] = {}
+        self.written = 0
+        self.skipped = 0
+        self.removed = 0
+
+    def load_los(self, corpus: Optional[LOCorpus] = None):
+        corpus = corpus or load_corpus()
+        self.los = corpus.records()
+        self.content_hashes = {e.data["id"]: e.content_hash for e in corpus.entries
+                               if isinstance(e.data, dict) and "id" in e.data}
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        pages = manifest.get("pages", {})
+        if manifest.get("templates") != TEMPLATES_FINGERPRINT:
+            # Every page is stale, but the list is still needed to delete orphans
+            return {rel_path: None for rel_path in pages}
+        return pages
+
+    def _save_manifest(self):
+        os.makedirs(self.manifest_path.parent, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, "templates": TEMPLATES_FINGERPRINT, "pages": self.pages}, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def is_current(self, rel_path: str, page_fingerprint: str) -> bool:
+        """Registers rel_path for this build; True if the last build wrote it from the same inputs."""
+        self.pages[rel_path] = page_fingerprint
+        if self.previous_pages.get(rel_path) == page_fingerprint and (self.out_dir / rel_path).exists():
+            self.skipped += 1
+            return True
+        return False
+
+    def emit(self, rel_path: str, page_fingerprint: str, render: Callable[[], Union[str, Iterable[str]]]):
+        """
+        Writes out_dir/rel_path from render() unless it is current. render may return the
+        page as one string or as an iterable of chunks, which are streamed to the file.
+        """
+        if self.is_current(rel_path, page_fingerprint):
+            return
+        write_output(self.out_dir / rel_path, render())
+        self.written += 1
+
+    def carry_over(self, prefix: str):
+        """Keeps every file under prefix from the last build, when the step that writes them is current."""
+        for rel_path, page_fingerprint in self.previous_pages.items():
+            if rel_path.startswith(prefix) and rel_path not in self.pages:
+                self.pages[rel_path] = page_fingerprint
+                self.skipped += 1
+
+    def remove_orphans(self):
+        for rel_path in self.previous_pages.keys() - self.pages.keys():
+            try:
+                os.remove(self.out_dir / rel_path)
+                self.removed += 1
+            except FileNotFoundError:
+                pass
+            for suffix in (".gz", ".br"):
+                try:
+                    os.remove(self.out_dir / f"{rel_path}{suffix}")
+                except FileNotFoundError:
+                    pass
+
+    def generate(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        os.makedirs(self.data_dir, exist_ok=True)
+        
+        # 1. Generate Data JSON
+        self.generate_graph_json()
+        self.generate_paths_json() # Reuse Planner output conceptually
+        
+        self.generate_search_index()
+        
+        # 2. Generate HTML Pages
+        self.generate_index()
+        self.generate_lo_pages()
+        self.generate_graph_page()
+        self.generate_path_page()
+        
+        # 3. Copy CSS/JS string assets (inline or file write)
+        self.write_assets()
+
+        # 4. Drop pages for LOs (or data) that no longer exist
+        self.remove_orphans()
+        self._save_manifest()
+
+    def generate_graph_json(self):
+        """
+        Laid-out graph data sharded by LO id prefix under data/graph/ (see build_graph_files).
+        Layout depends only on ids, prerequisites and statuses, so the whole step is skipped
+        when none of those changed; otherwise shards are fingerprinted by content.
+        """
+        inputs = [(lo["id"], lo.get("prerequisites", []), self.status.get(lo["id"], "unknown")) for lo in self.los]
+        graph_fingerprint = fingerprint(GRAPH_FINGERPRINT, inputs)
+        if self.is_current(GRAPH_MANIFEST, graph_fingerprint):
+            self.carry_over("data/graph/")
+            return
+
+        files = build_graph_files(self.los, self.status, graph_shard_key)
+        manifest = files.pop(GRAPH_MANIFEST)
+        os.makedirs(self.data_dir / "graph", exist_ok=True)
+        for rel_path, content in files.items():
+            self.emit(rel_path, fingerprint(content), lambda content=content: content)
+        write_output(self.out_dir / GRAPH_MANIFEST, manifest)
+        self.written += 1
+
+    def generate_search_index(self):
+        inputs = [search_inputs(lo) for lo in self.los]
+        index_fingerprint = fingerprint(SEARCH_FINGERPRINT, inputs)
+        if self.is_current(SEARCH_MANIFEST, index_fingerprint):
+            # Nothing searchable changed, so every shard from the last build is still valid
+            self.carry_over("search/")
+            return
+
+        files = build_search_files(self.los)
+        manifest = files.pop(SEARCH_MANIFEST)
+        os.makedirs(self.out_dir / "search" / "terms", exist_ok=True)
+        os.makedirs(self.out_dir / "search" / "docs", exist_ok=True)
+        # Shards are fingerprinted by content, so an edit rewrites only the shards it touches
+        for rel_path, content in files.items():
+            self.emit(rel_path, fingerprint(content), lambda content=content: content)
+        write_output(self.out_dir / SEARCH_MANIFEST, manifest)
+        self.written += 1
+
+    def generate_paths_json(self):
+        # Read from out/path/path.json if exists; the planner already writes it indented, so it is copied as is
+        path_file = Path("out/path/path.json")
+        if path_file.exists():
+            def render():
+                with open(path_file) as f:
+                    return f.read()
+            self.emit("data/paths.json", fingerprint(TEMPLATES_FINGERPRINT, file_signature(path_file)), render)
+
+    def write_assets(self):
+        # Asset names carry their content hash, so they can be cached as immutable
+        for name, content in ASSETS.items():
+            self.emit(name, fingerprint(content), lambda content=content: content)
+
+    def listing_facets(self) -> List[Tuple[str, str, List[Dict]]]:
+        """(facet slug, heading, LOs) for all LOs, each type and each status, in corpus order."""
+        by_type: Dict[str, List[Dict]] = {}
+        by_status: Dict[str, List[Dict]] = {}
+        for lo in self.los:
+            by_type.setdefault(str(lo["type"]), []).append(lo)
+            by_status.setdefault(self.status.get(lo["id"], "unknown"), []).append(lo)
+
+        facets = [("all", "Learning Objects", self.los)]
+        facets += [(f"type-{facet_slug(t)}", f"Type: {t}", by_type[t]) for t in sorted(by_type)]
+        facets += [(f"status-{facet_slug(st)}", f"Status: {st}", by_status[st]) for st in sorted(by_status)]
+        return facets
+
+    def generate_index(self):
+        """
+        Paginated listings, PAGE_SIZE cards per page, for all LOs and per type and status.
+        Each page is fingerprinted by the cards it shows, so one LO edit rewrites only the
+        pages it appears on. Facet counts appear on index.html only, so adding an LO does
+        not touch every other page.
+        """
+        os.makedirs(self.out_dir / "browse", exist_ok=True)
+        facets = self.listing_facets()
+        counts = [(slug, heading, len(los)) for slug, heading, los in facets]
+        names = [(slug, heading, None) for slug, heading, _ in facets]
+
+        for slug, heading, los in facets:
+            total = max(1, -(-len(los) // PAGE_SIZE))
+            for page in range(1, total + 1):
+                cards = [(lo["id"], lo["title"], lo["type"], self.status.get(lo["id"], "unknown"), lo["description"])
+                         for lo in los[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]]
+                rel_path = listing_path(slug, page)
+                nav = counts if rel_path == "index.html" else names
+                page_fingerprint = fingerprint(TEMPLATES_FINGERPRINT, nav, slug, heading, page, total, cards)
+                self.emit(rel_path, page_fingerprint,
+                          lambda args=(slug, heading, page, total, cards, nav): self.render_listing(*args))
+
+    def render_listing(self, slug: str, heading: str, page: int, total: int, cards: List[Tuple],
+                       nav: List[Tuple[str, str, Optional[int]]]) -> Iterable[str]:
+        is_index = listing_path(slug, page) == "index.html"
+        root = "" if is_index else "../"
+
+        facets = " | ".join((FACET_LINK if count is not None else FACET_LINK_PLAIN).format(
+                                root=root, href=listing_path(facet, 1), label=label, count=count)
+                            for facet, label, count in nav)
+        title = "Unreal Knowledge Engine" if is_index else f"{heading} ({page}/{total})"
+        yield LISTING_HEAD.format(title=title, root=root, style=STYLE_ASSET, header=HEADER if is_index else LO_HEADER,
+                                  search=SEARCH_BOX if is_index else "",
+                                  facets=f'<div class="facets">{facets}</div>', heading=heading)
+        for lo_id, lo_title, lo_type, status, description in cards:
+            yield INDEX_CARD.format(root=root, id=lo_id, title=lo_title, type=lo_type, status=status,
+                                    description=description)
+
+        pager = f"Page {page} of {total}"
+        if page > 1:
+            pager = PAGER_PREV.format(root=root, href=listing_path(slug, page - 1)) + pager
+        if page < total:
+            pager += PAGER_NEXT.format(root=root, href=listing_path(slug, page + 1))
+        yield LISTING_TAIL.format(pager=pager, scripts=SEARCH_SCRIPT.format(search=SEARCH_ASSET) if is_index else "")
 
     def generate_lo_pages(self):
         lo_dir = self.out_dir / "lo"
         os.makedirs(lo_dir, exist_ok=True)
+        titles = {lo["id"]: lo["title"] for lo in self.los}
         
+        stale = []
         for lo in self.los:
             status = self.status.get(lo["id"], "unknown")
-            
-            # Check for images
-            img_path = Path("out/images") / lo["id"] / "step_01.final.png"
-            img_html = ""
-            if img_path.exists():
-                # We need relative path from out/site/lo/FILE.html -> out/images/...
-                # out/site/lo -> out/site (-1) -> out (-2) -> out/images
-                rel_img_path = f"../../images/{lo['id']}/step_01.final.png"
-                img_html = f"""
-                <div class="card">
-                    <h2>Tutorial Capture</h2>
-                    <img src="{rel_img_path}" alt="Capture">
-                </div>
-                """
-            
-            evidence_html = "<ul>"
-            for ev in lo.get("evidence", []):
-                evidence_html += f"<li><b>{ev['symbol']}</b> in <i>{ev['file']}</i> (Hash: {ev['snippet_hash'][:8]}...)</li>"
-            evidence_html += "</ul>"
-
-            html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head><title>{lo['title']}</title><link rel="stylesheet" href="../style.css"></head>
-            <body>
-                {self._header().replace('href="', 'href="../')}
-                <div class="container">
-                    <div style="margin-bottom:1rem;"><a href="../index.html">&larr; Back</a></div>
-                    <div class="card">
-                        <h1>{lo['title']}</h1>
-                        <div style="margin-bottom:1rem;">
-                            <span class="badge {lo['type']}">{lo['type']}</span>
-                            <span class="badge {status}">{status}</span>
-                        </div>
-                        <p>{lo['description']}</p>
-                    </div>
-                    
-                    {img_html}
-                    
-                    <div class="card">
-                        <h3>Evidence</h3>
-                        {evidence_html}
-                    </div>
-                    
-                    <div class="card">
-                        <h3>Prerequisites</h3>
-                        <ul>
-                            {''.join([f'<li><a href="{p}.html">{p}</a></li>' for p in lo.get("prerequisites", [])])}
-                        </ul>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-            with open(lo_dir / f"{lo['id']}.html", "w", encoding='utf-8') as f:
-                f.write(html)
+            image = file_signature(self.images_dir / lo["id"] / "step_01.final.png")
+            prereqs = [(p, titles.get(p, p)) for p in lo.get("prerequisites", [])]
+            rel_path = f"lo/{lo['id']}.html"
+            page_fingerprint = fingerprint(TEMPLATES_FINGERPRINT, self.content_hashes.get(lo["id"]),
+                                           status, image, prereqs)
+            if not self.is_current(rel_path, page_fingerprint):
+                stale.append((str(self.out_dir / rel_path), lo, status, prereqs, image is not None))
+
+        write_lo_pages(stale, self.jobs)
+        self.written += len(stale)
 
     def generate_graph_page(self):
-        # Minimal Force Graph using D3 or just placeholder text for POC
-        # Since "Internet required: None" and allowed deps are strictly Python libs, 
-        # we can't easily fetch D3 from CDN.
-        # We'll just dump a simple SVG or Canvas implementation if we really wanted, 
-        # or just show the JSON data for now.
-        # User requirement: "Verified against UE 5.6" -> "Repo must run without internet". 
-        # But website viewing usually implies browser. 
-        # I will include a very simple JS script to render nodes if possible, or just link the JSON.
-        
-        # Actually I can embed a tiny graph library or write a very simple canvas renderer in raw JS in the HTML.
-        # Let's write a barebones JS renderer for thePOC.
-        
+        self.emit("graph.html", TEMPLATES_FINGERPRINT, self.render_graph_page)
+
+    def render_graph_page(self) -> str:
+        # Canvas renderer in graph.js, no external libraries (the site must work offline)
         html = f"""
         <!DOCTYPE html>
         <html>
-        <head><title>Knowledge Graph</title><link rel="stylesheet" href="style.css"></head>
+        <head><title>Knowledge Graph</title><link rel="stylesheet" href="{STYLE_ASSET}"></head>
         <body>
-            {self._header()}
+            {HEADER}
             <div class="container">
                 <h1>Dependency Graph</h1>
-                <canvas id="graphCanvas" width="800" height="600" style="border:1px solid #ccc; background:#fff;"></canvas>
+                <p>Drag to pan, scroll to zoom. Click a node to load its neighbors; click again to open it.</p>
+                <canvas id="graphCanvas" width="1100" height="700" style="border:1px solid #ccc; background:#fff;"></canvas>
             </div>
-            <script>
-                fetch('data/graph.json').then(r => r.json()).then(data => {{
-                    const canvas = document.getElementById('graphCanvas');
-                    const ctx = canvas.getContext('2d');
-                    const nodes = data.nodes;
-                    const links = data.links;
-                    
-                    // Simple random positioning then layout simulation? 
-                    // Or just a circle layout for POC simplicity.
-                    const cx = canvas.width / 2;
-                    const cy = canvas.height / 2;
-                    const radius = 200;
-                    
-                    nodes.forEach((n, i) => {{
-                        const angle = (i / nodes.length) * 2 * Math.PI;
-                        n.x = cx + radius * Math.cos(angle);
-                        n.y = cy + radius * Math.sin(angle);
-                    }});
-                    
-                    // Draw links
-                    ctx.strokeStyle = '#999';
-                    links.forEach(l => {{
-                        const source = nodes.find(n => n.id === l.source);
-                        const target = nodes.find(n => n.id === l.target);
-                        if(source && target) {{
-                            ctx.beginPath();
-                            ctx.moveTo(source.x, source.y);
-                            ctx.lineTo(target.x, target.y);
-                            ctx.stroke();
-                        }}
-                    }});
-                    
-                    // Draw nodes
-                    nodes.forEach(n => {{
-                        ctx.fillStyle = n.color;
-                        ctx.beginPath();
-                        ctx.arc(n.x, n.y, 15, 0, 2 * Math.PI);
-                        ctx.fill();
-                        ctx.fillStyle = '#000';
-                        ctx.fillText(n.id, n.x + 20, n.y);
-                    }});
-                    
-                    // Click handler to go to LO page (simple bounding box check could go here)
-                    canvas.addEventListener('click', (e) => {{
-                         const rect = canvas.getBoundingClientRect();
-                         const x = e.clientX - rect.left;
-                         const y = e.clientY - rect.top;
-                         nodes.forEach(n => {{
-                             const dist = Math.sqrt((x-n.x)**2 + (y-n.y)**2);
-                             if (dist < 15) {{
-                                 window.location.href = 'lo/' + n.id + '.html';
-                             }}
-                         }});
-                    }});
-                }});
-            </script>
+            <script src="{GRAPH_ASSET}"></script>
         </body>
         </html>
         """
-        with open(self.out_dir / "graph.html", "w") as f:
-            f.write(html)
+        return html
 
     def generate_path_page(self):
+        self.emit("path.html", TEMPLATES_FINGERPRINT, self.render_path_page)
+
+    def render_path_page(self) -> str:
          html = f"""
         <!DOCTYPE html>
         <html>
-        <head><title>Learning Path</title><link rel="stylesheet" href="style.css"></head>
+        <head><title>Learning Path</title><link rel="stylesheet" href="{STYLE_ASSET}"></head>
         <body>
-            {self._header()}
+            {HEADER}
             <div class="container">
                 <h1>Active Learning Path</h1>
                 <div id="path-container"></div>
@@ -339,11 +577,11 @@ class SiteGenerator:
         </body>
         </html>
         """
-         with open(self.out_dir / "path.html", "w", encoding='utf-8') as f:
-            f.write(html)
+         return html
 
-def run_site():
+def run_site(jobs: int = 1):
     console.print(f"[bold]Generating Static Site...[/bold]")
-    gen = SiteGenerator()
+    gen = SiteGenerator(jobs=jobs)
     gen.generate()
+    console.print(f"Pages: {gen.written} written, {gen.skipped} unchanged, {gen.removed} removed.")
     console.print(f"[green]Site generated in out/site[/green]")
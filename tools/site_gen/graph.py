@@ -0,0 +1,355 @@
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Tuple
+from tools.path_planner.graph import PrereqGraph
+
+# Graph files are generated from this module, so its source versions them
+GRAPH_FINGERPRINT = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+GRAPH_MANIFEST = "data/graph/manifest.json"
+X_GAP = 40
+Y_GAP = 120
+ROW_GAP = 40
+MIN_ROW = 50
+NODE_RADIUS = 12
+CELL_SIZE = 160
+
+
+def layered_layout(graph: PrereqGraph, sweeps: int = 4) -> Tuple[List[int], List[int]]:
+    """
+    Layered DAG layout: each LO sits one layer below its deepest prerequisite, and nodes
+    within a layer are ordered by the barycenter of their neighbors in the adjacent layers,
+    sweeping down (towards prerequisites) and up (towards dependents) alternately to cut
+    crossings. Every sweep is linear in the graph plus a sort per layer. Edges that close a
+    cycle are ignored for layering. Returns integer (xs, ys) indexed by node; y grows with
+    depth.
+    """
+    n = len(graph)
+    order, _ = graph.topo_order()
+    layer = [0] * n
+    placed = bytearray(n)
+    dependents: List[List[int]] = [[] for _ in range(n)]
+    for node in order:
+        depth = 0
+        for p in graph.prereqs_of(node):
+            dependents[p].append(node)
+            if placed[p] and layer[p] >= depth:
+                depth = layer[p] + 1
+        layer[node] = depth
+        placed[node] = 1
+
+    layers: List[List[int]] = [[] for _ in range(max(layer, default=-1) + 1)]
+    for node in range(n):
+        layers[layer[node]].append(node)
+
+    pos = [0.0] * n
+
+    def spread(nodes):
+        mid = (len(nodes) - 1) / 2
+        for i, node in enumerate(nodes):
+            pos[node] = i - mid
+
+    for nodes in layers:
+        spread(nodes)
+
+    for sweep in range(sweeps):
+        down = sweep % 2 == 0
+        for nodes in (layers[1:] if down else layers[-2::-1]):
+            def barycenter(node):
+                neighbors = graph.prereqs_of(node) if down else dependents[node]
+                total = count = 0
+                for m in neighbors:
+                    if layer[m] != layer[node]:
+                        total += pos[m]
+                        count += 1
+                return total / count if count else pos[node]
+
+            nodes.sort(key=lambda node: (barycenter(node), node))
+            spread(nodes)
+
+    # Layers wider than max_row wrap onto extra rows within their band, so a few very
+    # wide layers do not stretch the whole layout into a thin strip
+    max_row = max(MIN_ROW, int(2 * n ** 0.5))
+    xs, ys = [0] * n, [0] * n
+    y = 0
+    for nodes in layers:
+        for row_start in range(0, len(nodes), max_row):
+            row = nodes[row_start:row_start + max_row]
+            mid = (len(row) - 1) / 2
+            for i, node in enumerate(row):
+                xs[node] = round((i - mid) * X_GAP)
+                ys[node] = y
+            y += ROW_GAP
+        y += Y_GAP - ROW_GAP
+    return xs, ys
+
+
+def build_graph_files(los: List[Dict], status: Dict[str, str], shard_key) -> Dict[str, str]:
+    """
+    Laid-out graph data as site-relative path -> file content.
+
+    Nodes are numbered globally, shard by shard (shard_key(id) groups them), so an edge is
+    just a pair of integers and a node's shard follows from its number. Each shard file has
+    the node ids, statuses and coordinates of its nodes, every edge touching them as a flat
+    [source, target, ...] list of global numbers, and a spatial grid (CELL_SIZE cells ->
+    local node numbers) for hit-testing. The manifest lists the shards with their first
+    global number, plus layout bounds.
+    """
+    graph = PrereqGraph({lo["id"]: lo.get("prerequisites", []) for lo in los})
+    xs, ys = layered_layout(graph)
+
+    by_shard: Dict[str, List[int]] = {}
+    for node, lo_id in enumerate(graph.ids):
+        by_shard.setdefault(shard_key(lo_id), []).append(node)
+    keys = sorted(by_shard)
+
+    number = [0] * len(graph)
+    starts = []
+    next_number = 0
+    for key in keys:
+        starts.append(next_number)
+        for node in by_shard[key]:
+            number[node] = next_number
+            next_number += 1
+
+    edges: Dict[str, List[int]] = {key: [] for key in keys}
+    for node in range(len(graph)):
+        for p in graph.prereqs_of(node):
+            source, target = number[p], number[node]
+            edges[shard_key(graph.ids[node])] += (source, target)
+            if shard_key(graph.ids[p]) != shard_key(graph.ids[node]):
+                edges[shard_key(graph.ids[p])] += (source, target)
+
+    files = {}
+    manifest_shards = []
+    for key, start in zip(keys, starts):
+        nodes = by_shard[key]
+        cells: Dict[str, List[int]] = {}
+        for i, node in enumerate(nodes):
+            cells.setdefault(f"{xs[node] // CELL_SIZE},{ys[node] // CELL_SIZE}", []).append(i)
+        shard = {
+            "start": start,
+            "ids": [graph.ids[node] for node in nodes],
+            "status": [status.get(graph.ids[node], "unknown") for node in nodes],
+            "x": [xs[node] for node in nodes],
+            "y": [ys[node] for node in nodes],
+            "edges": edges[key],
+            "cells": cells,
+        }
+        rel_path = f"data/graph/{key}.json"
+        files[rel_path] = json.dumps(shard, separators=(",", ":"))
+        manifest_shards.append({"key": key, "file": rel_path, "start": start,
+                                "nodes": len(nodes), "edges": len(edges[key]) // 2})
+
+    files[GRAPH_MANIFEST] = json.dumps({
+        "version": 2,
+        "nodes": len(graph),
+        "node_radius": NODE_RADIUS,
+        "cell": CELL_SIZE,
+        "bounds": [min(xs, default=0), min(ys, default=0), max(xs, default=0), max(ys, default=0)],
+        "shards": manifest_shards,
+    }, indent=2)
+    return files
+
+
+# Canvas client for graph.html. Shards are fetched lazily: the focused LO's shard
+# (?focus=<id>) or the first one on load, then clicking a node pulls in the shards of its
+# neighbors. Clicking a node whose neighborhood is loaded opens its page. Drag pans and
+# the wheel zooms; hit-testing goes through the shards' spatial grids.
+GRAPH_JS = r"""
+(function () {
+    const canvas = document.getElementById('graphCanvas');
+    const ctx = canvas.getContext('2d');
+    const COLORS = { verified: '#4caf50', needs_review: '#ff9800' };
+    const FALLBACK_COLOR = '#f44336';
+
+    let manifest = null;
+    const shards = [];
+    const loading = {};
+    const grid = new Map();
+    const view = { scale: 1, ox: 0, oy: 0 };
+
+    function shardIndexOf(g) {
+        let lo = 0, hi = manifest.shards.length - 1;
+        while (lo < hi) {
+            const mid = (lo + hi + 1) >> 1;
+            if (manifest.shards[mid].start <= g) lo = mid; else hi = mid - 1;
+        }
+        return lo;
+    }
+
+    function loadShard(k) {
+        if (!loading[k]) {
+            loading[k] = fetch(manifest.shards[k].file).then(r => r.json()).then(s => {
+                shards[k] = s;
+                for (const cell in s.cells) {
+                    const list = grid.get(cell) || [];
+                    s.cells[cell].forEach(i => list.push(s.start + i));
+                    grid.set(cell, list);
+                }
+            });
+        }
+        return loading[k];
+    }
+
+    function at(g) {
+        const s = shards[shardIndexOf(g)];
+        return s ? [s, g - s.start] : null;
+    }
+
+    function draw() {
+        ctx.setTransform(1, 0, 0, 1, 0, 0);
+        ctx.clearRect(0, 0, canvas.width, canvas.height);
+        ctx.setTransform(view.scale, 0, 0, view.scale, view.ox, view.oy);
+        const r = manifest.node_radius;
+
+        ctx.strokeStyle = '#999';
+        ctx.lineWidth = 1 / view.scale;
+        ctx.beginPath();
+        shards.forEach(s => {
+            if (!s) return;
+            const e = s.edges;
+            for (let i = 0; i < e.length; i += 2) {
+                const a = at(e[i]), b = at(e[i + 1]);
+                if (!a || !b) continue;
+                ctx.moveTo(a[0].x[a[1]], a[0].y[a[1]]);
+                ctx.lineTo(b[0].x[b[1]], b[0].y[b[1]]);
+            }
+        });
+        ctx.stroke();
+
+        // One path per color keeps the number of fill calls constant
+        const byColor = {};
+        shards.forEach(s => {
+            if (!s) return;
+            for (let i = 0; i < s.ids.length; i++) {
+                const color = COLORS[s.status[i]] || FALLBACK_COLOR;
+                (byColor[color] = byColor[color] || []).push(s, i);
+            }
+        });
+        for (const color in byColor) {
+            const list = byColor[color];
+            ctx.fillStyle = color;
+            ctx.beginPath();
+            for (let j = 0; j < list.length; j += 2) {
+                const s = list[j], i = list[j + 1];
+                ctx.moveTo(s.x[i] + r, s.y[i]);
+                ctx.arc(s.x[i], s.y[i], r, 0, 2 * Math.PI);
+            }
+            ctx.fill();
+        }
+
+        if (view.scale > 0.5) {
+            ctx.fillStyle = '#000';
+            ctx.font = (12 / view.scale) + 'px sans-serif';
+            shards.forEach(s => {
+                if (!s) return;
+                for (let i = 0; i < s.ids.length; i++) ctx.fillText(s.ids[i], s.x[i] + r + 4, s.y[i]);
+            });
+        }
+    }
+
+    function toWorld(e) {
+        const rect = canvas.getBoundingClientRect();
+        return [(e.clientX - rect.left - view.ox) / view.scale, (e.clientY - rect.top - view.oy) / view.scale];
+    }
+
+    function hit(x, y) {
+        const cx = Math.floor(x / manifest.cell), cy = Math.floor(y / manifest.cell);
+        const r2 = manifest.node_radius * manifest.node_radius;
+        let best = -1, bestD = Infinity;
+        for (let dx = -1; dx <= 1; dx++) {
+            for (let dy = -1; dy <= 1; dy++) {
+                (grid.get((cx + dx) + ',' + (cy + dy)) || []).forEach(g => {
+                    const [s, i] = at(g);
+                    const d = (s.x[i] - x) ** 2 + (s.y[i] - y) ** 2;
+                    if (d <= r2 && d < bestD) { best = g; bestD = d; }
+                });
+            }
+        }
+        return best;
+    }
+
+    function missingNeighborShards(g) {
+        const keys = new Set();
+        const e = at(g)[0].edges;
+        for (let i = 0; i < e.length; i += 2) {
+            const other = e[i] === g ? e[i + 1] : e[i + 1] === g ? e[i] : -1;
+            if (other !== -1) {
+                const k = shardIndexOf(other);
+                if (!loading[k]) keys.add(k);
+            }
+        }
+        return Array.from(keys);
+    }
+
+    function center(x, y, scale) {
+        view.scale = scale;
+        view.ox = canvas.width / 2 - x * scale;
+        view.oy = canvas.height / 2 - y * scale;
+    }
+
+    let drag = null;
+    canvas.addEventListener('mousedown', e => { drag = { x: e.clientX, y: e.clientY, ox: view.ox, oy: view.oy, moved: false }; });
+    canvas.addEventListener('mousemove', e => {
+        if (!drag) return;
+        const dx = e.clientX - drag.x, dy = e.clientY - drag.y;
+        if (Math.abs(dx) + Math.abs(dy) > 3) drag.moved = true;
+        if (drag.moved) { view.ox = drag.ox + dx; view.oy = drag.oy + dy; draw(); }
+    });
+    canvas.addEventListener('mouseup', async e => {
+        const wasDrag = drag && drag.moved;
+        drag = null;
+        if (wasDrag || !manifest) return;
+        const [x, y] = toWorld(e);
+        const g = hit(x, y);
+        if (g === -1) return;
+        const pending = missingNeighborShards(g);
+        if (pending.length) {
+            await Promise.all(pending.map(loadShard));
+            draw();
+        } else {
+            const [s, i] = at(g);
+            window.location.href = 'lo/' + s.ids[i] + '.html';
+        }
+    });
+    canvas.addEventListener('wheel', e => {
+        e.preventDefault();
+        const rect = canvas.getBoundingClientRect();
+        const mx = e.clientX - rect.left, my = e.clientY - rect.top;
+        const factor = e.deltaY < 0 ? 1.2 : 1 / 1.2;
+        view.ox = mx - (mx - view.ox) * factor;
+        view.oy = my - (my - view.oy) * factor;
+        view.scale *= factor;
+        draw();
+    }, { passive: false });
+
+    fetch('data/graph/manifest.json').then(r => r.json()).then(async m => {
+        manifest = m;
+        if (!m.shards.length) return;
+        const focus = new URLSearchParams(window.location.search).get('focus');
+        const key = focus ? (focus.split('.')[0].replace(/[^A-Za-z0-9_-]/g, '_') || '_') : null;
+        let k = m.shards.findIndex(s => s.key === key);
+        if (k === -1) k = 0;
+        await loadShard(k);
+
+        const s = shards[k];
+        const i = focus ? s.ids.indexOf(focus) : -1;
+        if (i !== -1) {
+            center(s.x[i], s.y[i], 1);
+        } else {
+            // Fit the loaded shard
+            let x0 = Infinity, y0 = Infinity, x1 = -Infinity, y1 = -Infinity;
+            for (let j = 0; j < s.ids.length; j++) {
+                x0 = Math.min(x0, s.x[j]); x1 = Math.max(x1, s.x[j]);
+                y0 = Math.min(y0, s.y[j]); y1 = Math.max(y1, s.y[j]);
+            }
+            const pad = 4 * m.node_radius;
+            const scale = Math.min(1, canvas.width / (x1 - x0 + pad), canvas.height / (y1 - y0 + pad));
+            center((x0 + x1) / 2, (y0 + y1) / 2, scale);
+        }
+        draw();
+    });
+})();
+"""
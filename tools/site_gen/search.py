@@ -0,0 +1,204 @@
+import re
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Search files are generated from this module, so its source versions them
+SEARCH_FINGERPRINT = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+SEARCH_DIR = "search"
+SEARCH_MANIFEST = "search/manifest.json"
+DOC_CHUNK = 500
+MIN_TOKEN = 2
+
+# Field bits stored with every posting; the client adds up the weights of the fields that matched
+FIELD_TITLE, FIELD_ID, FIELD_SYMBOL, FIELD_DESCRIPTION = 1, 2, 4, 8
+
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase ASCII alphanumeric tokens. Identifiers also contribute their camelCase parts,
+    so "UStaticMesh::ComplexCollisionMesh" matches "complex" and "collision".
+    """
+    tokens = []
+    for word in _WORD_RE.findall(text or ""):
+        tokens.append(word.lower())
+        parts = _CAMEL_RE.findall(word)
+        if len(parts) > 1:
+            tokens.extend(p.lower() for p in parts)
+    return [t for t in tokens if len(t) >= MIN_TOKEN]
+
+
+def shard_key(term: str) -> str:
+    """Terms are sharded by their first two characters, so a prefix query reads one shard."""
+    return term[:MIN_TOKEN]
+
+
+def build_search_files(los: List[Dict]) -> Dict[str, str]:
+    """
+    Inverted index over titles, ids, descriptions and evidence symbols, as site-relative
+    path -> file content:
+
+    - search/manifest.json: document count, doc chunk size and the list of term shards.
+    - search/terms/<xx>.json: term -> postings for every term starting with "xx". Postings are
+      a flat [doc gap, field bits, doc gap, field bits, ...] list, doc numbers delta-encoded.
+    - search/docs/<n>.json: [id, title, type] for docs n * DOC_CHUNK onwards, fetched only
+      for the results that are displayed.
+    """
+    postings: Dict[str, Dict[int, int]] = {}
+    for doc, lo in enumerate(los):
+        fields = [
+            (FIELD_TITLE, lo.get("title")),
+            (FIELD_ID, lo.get("id")),
+            (FIELD_DESCRIPTION, lo.get("description")),
+        ] + [(FIELD_SYMBOL, ev.get("symbol")) for ev in lo.get("evidence", []) if isinstance(ev, dict)]
+        for bit, text in fields:
+            for term in tokenize(str(text) if text is not None else ""):
+                docs = postings.setdefault(term, {})
+                docs[doc] = docs.get(doc, 0) | bit
+
+    shards: Dict[str, Dict[str, List[int]]] = {}
+    for term in sorted(postings):
+        flat, prev = [], 0
+        for doc, bits in sorted(postings[term].items()):
+            flat += (doc - prev, bits)
+            prev = doc
+        shards.setdefault(shard_key(term), {})[term] = flat
+
+    files = {}
+    for key, terms in shards.items():
+        files[f"{SEARCH_DIR}/terms/{key}.json"] = json.dumps(terms, separators=(",", ":"))
+    for start in range(0, len(los), DOC_CHUNK):
+        chunk = [[lo["id"], lo.get("title"), lo.get("type")] for lo in los[start:start + DOC_CHUNK]]
+        files[f"{SEARCH_DIR}/docs/{start // DOC_CHUNK}.json"] = json.dumps(chunk, separators=(",", ":"))
+    files[SEARCH_MANIFEST] = json.dumps({
+        "version": 1,
+        "docs": len(los),
+        "doc_chunk": DOC_CHUNK,
+        "min_token": MIN_TOKEN,
+        "weights": {str(FIELD_TITLE): 8, str(FIELD_ID): 4, str(FIELD_SYMBOL): 2, str(FIELD_DESCRIPTION): 1},
+        "shards": sorted(shards),
+    }, separators=(",", ":"))
+    return files
+
+
+def search_inputs(lo: Dict) -> Tuple:
+    """The LO fields the search index is built from."""
+    symbols = [ev.get("symbol") for ev in lo.get("evidence", []) if isinstance(ev, dict)]
+    return (lo["id"], lo.get("title"), lo.get("type"), lo.get("description"), symbols)
+
+
+# Offline client: loads the manifest on first keystroke, then only the term shards the
+# query's tokens fall in and the doc chunks of the results it shows.
+SEARCH_JS = r"""
+(function () {
+    const input = document.getElementById('search');
+    const results = document.getElementById('search-results');
+    if (!input || !results) return;
+
+    const LIMIT = 50;
+    const cache = {};
+    let seq = 0;
+
+    function load(url) {
+        if (!(url in cache)) {
+            cache[url] = fetch(url).then(r => r.ok ? r.json() : null).catch(() => null);
+        }
+        return cache[url];
+    }
+
+    function tokenize(q) {
+        return (q.toLowerCase().match(/[a-z0-9]+/g) || []);
+    }
+
+    function score(bits, weights) {
+        let s = 0;
+        for (const bit in weights) if (bits & bit) s += weights[bit];
+        return s;
+    }
+
+    // doc -> best score for one query token; the last token also matches as a prefix
+    async function lookup(manifest, token, prefix) {
+        const scores = new Map();
+        const key = token.slice(0, manifest.min_token);
+        if (manifest.shards.indexOf(key) === -1) return scores;
+        const shard = await load('search/terms/' + key + '.json');
+        if (!shard) return scores;
+        for (const term in shard) {
+            if (prefix ? !term.startsWith(token) : term !== token) continue;
+            const postings = shard[term];
+            let doc = 0;
+            for (let i = 0; i < postings.length; i += 2) {
+                doc += postings[i];
+                const s = score(postings[i + 1], manifest.weights);
+                if (!(scores.get(doc) >= s)) scores.set(doc, s);
+            }
+        }
+        return scores;
+    }
+
+    async function search(query) {
+        const mine = ++seq;
+        const manifest = await load('search/manifest.json');
+        if (!manifest) return;
+        const tokens = tokenize(query).filter(t => t.length >= manifest.min_token);
+        if (!tokens.length) {
+            results.innerHTML = '';
+            return;
+        }
+
+        const maps = await Promise.all(tokens.map((t, i) => lookup(manifest, t, i === tokens.length - 1)));
+        maps.sort((a, b) => a.size - b.size);
+        let hits = [];
+        for (const [doc, s] of maps[0]) {
+            let total = s;
+            for (let i = 1; i < maps.length && total >= 0; i++) {
+                const other = maps[i].get(doc);
+                total = other === undefined ? -1 : total + other;
+            }
+            if (total >= 0) hits.push([doc, total]);
+        }
+        hits.sort((a, b) => b[1] - a[1] || a[0] - b[0]);
+        const count = hits.length;
+        hits = hits.slice(0, LIMIT);
+
+        const chunks = {};
+        await Promise.all(hits.map(([doc]) => {
+            const n = Math.floor(doc / manifest.doc_chunk);
+            return load('search/docs/' + n + '.json').then(c => { chunks[n] = c; });
+        }));
+        if (mine !== seq) return;
+
+        results.textContent = '';
+        const summary = document.createElement('p');
+        summary.textContent = count + (count === 1 ? ' result' : ' results') + (count > LIMIT ? ' (showing ' + LIMIT + ')' : '');
+        results.appendChild(summary);
+        for (const [doc] of hits) {
+            const entry = (chunks[Math.floor(doc / manifest.doc_chunk)] || [])[doc % manifest.doc_chunk];
+            if (!entry) continue;
+            const card = document.createElement('div');
+            card.className = 'card';
+            const link = document.createElement('a');
+            link.href = 'lo/' + entry[0] + '.html';
+            link.textContent = entry[1] || entry[0];
+            const badge = document.createElement('span');
+            badge.className = 'badge ' + entry[2];
+            badge.textContent = entry[2];
+            card.appendChild(link);
+            card.appendChild(document.createTextNode(' '));
+            card.appendChild(badge);
+            results.appendChild(card);
+        }
+    }
+
+    let timer = null;
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(() => search(input.value), 80);
+    });
+})();
+"""
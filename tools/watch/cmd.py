@@ -0,0 +1,189 @@
+import os
+import time
+import mimetypes
+import threading
+import http.server
+from pathlib import Path
+from typing import Optional, Set
+from urllib.parse import urlsplit
+from rich.console import Console
+from tools.corpus import CACHE_PATH, LOCorpus, load_corpus
+from tools.gate.validator import run_validation
+from tools.path_planner.cmd import PathPlanner, save_plan
+from tools.serve_cmd import SITE_DIR, resolve_site_path
+from tools.site_gen.cmd import SiteGenerator
+from tools.watch.watcher import InotifyWatcher, make_watcher
+
+console = Console()
+
+KNOWLEDGE_ROOT = Path("knowledge")
+IMAGES_ROOT = Path("out/images")
+LO_SUFFIXES = (".yml", ".yaml")
+RELOAD_PATH = "/__reload"
+RELOAD_SCRIPT = b"<script>new EventSource('" + RELOAD_PATH.encode() + b"').onmessage=()=>location.reload()</script>"
+KEEPALIVE_SECONDS = 15
+
+
+class LiveBuild:
+    """
+    Keeps the corpus in memory between rebuilds. A knowledge change reloads only the
+    LO files whose mtime/size moved, then runs the incremental gate, the plan and the
+    incremental site; an image change only needs the site.
+    """
+
+    def __init__(self, engine: Optional[str], context_path: str):
+        self.engine = engine
+        self.context_path = context_path
+        self.corpus: Optional[LOCorpus] = None
+
+    def rebuild(self, knowledge: bool = True) -> str:
+        timings = []
+        start = time.perf_counter()
+
+        if knowledge or self.corpus is None:
+            # The on-disk cache only seeds the first load; after that the in-memory corpus is the cache
+            self.corpus = load_corpus(cache_path=CACHE_PATH if self.corpus is None else None, previous=self.corpus)
+            report = run_validation(self.engine, False, incremental=True, corpus=self.corpus)
+            gate_done = time.perf_counter()
+            revalidated = len(report.status_map) - report.reused_count
+            timings.append(f"gate {1000 * (gate_done - start):.0f}ms ({revalidated} revalidated)")
+
+            save_plan(PathPlanner(self.context_path, corpus=self.corpus))
+            plan_done = time.perf_counter()
+            timings.append(f"plan {1000 * (plan_done - gate_done):.0f}ms")
+        site_start = time.perf_counter()
+
+        gen = SiteGenerator(corpus=self.corpus)
+        gen.generate()
+        end = time.perf_counter()
+        timings.append(f"site {1000 * (end - site_start):.0f}ms ({gen.written} written, {gen.removed} removed)")
+        return f"Rebuilt in {1000 * (end - start):.0f}ms: " + ", ".join(timings)
+
+
+class ReloadBroadcaster:
+    """Generation counter that SSE handlers block on; bump() wakes every open page."""
+
+    def __init__(self):
+        self.generation = 0
+        self._cond = threading.Condition()
+
+    def bump(self):
+        with self._cond:
+            self.generation += 1
+            self._cond.notify_all()
+
+    def wait(self, seen: int, timeout: float) -> int:
+        with self._cond:
+            self._cond.wait_for(lambda: self.generation != seen, timeout)
+            return self.generation
+
+
+def make_handler(reloads: ReloadBroadcaster):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            url_path = urlsplit(self.path).path
+            if url_path == RELOAD_PATH:
+                self.stream_reloads()
+                return
+
+            path = resolve_site_path(url_path)
+            if path is None:
+                self.send_error(404, "File not found")
+                return
+            with open(path, "rb") as f:
+                body = f.read()
+            content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            if content_type == "text/html":
+                # Every page listens for rebuilds; the script goes in front of the last </body>
+                cut = body.rfind(b"</body>")
+                body = body + RELOAD_SCRIPT if cut == -1 else body[:cut] + RELOAD_SCRIPT + body[cut:]
+            if content_type.startswith("text/") or content_type in ("application/javascript", "application/json"):
+                content_type += "; charset=utf-8"
+
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def stream_reloads(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            seen = reloads.generation
+            try:
+                self.wfile.write(b": connected\n\n")
+                self.wfile.flush()
+                while True:
+                    generation = reloads.wait(seen, KEEPALIVE_SECONDS)
+                    # Comment lines keep proxies from closing an idle stream and detect gone tabs
+                    self.wfile.write(b"data: reload\n\n" if generation != seen else b": ping\n\n")
+                    self.wfile.flush()
+                    seen = generation
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def classify(changed: Set[str]) -> Optional[str]:
+    """'knowledge' if an LO file changed, 'images' if only captures did, None if nothing relevant."""
+    images = False
+    for path in changed:
+        parts = Path(path).parts
+        if parts[:len(KNOWLEDGE_ROOT.parts)] == KNOWLEDGE_ROOT.parts:
+            # Suffixless paths are directories, whose renames carry no per-file events
+            suffix = os.path.splitext(path)[1]
+            if suffix in LO_SUFFIXES or not suffix:
+                return "knowledge"
+        elif parts[:len(IMAGES_ROOT.parts)] == IMAGES_ROOT.parts:
+            images = True
+    return "images" if images else None
+
+
+def run_watch_serve(engine: Optional[str], context_path: str = "context.json",
+                    host: str = "127.0.0.1", port: int = 8000):
+    """
+    Development server: builds gate, plan and site once, serves out/site, and on every
+    change under knowledge/ or out/images/ rebuilds what the change affects and tells
+    open pages to reload over server-sent events.
+    """
+    if not engine:
+        console.print("[yellow]Warning: No engine path provided. Skipping evidence file checks.[/yellow]")
+    os.makedirs(IMAGES_ROOT, exist_ok=True)
+
+    build = LiveBuild(engine, context_path)
+    console.print("[bold]Building...[/bold]")
+    console.print(build.rebuild())
+
+    reloads = ReloadBroadcaster()
+    httpd = http.server.ThreadingHTTPServer((host, port), make_handler(reloads))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    watcher = make_watcher([KNOWLEDGE_ROOT, IMAGES_ROOT])
+    mode = "inotify" if isinstance(watcher, InotifyWatcher) else "polling"
+    console.print(f"[green]Serving {SITE_DIR} on http://{host}:{port} with live reload[/green]")
+    console.print(f"Watching {KNOWLEDGE_ROOT}/ and {IMAGES_ROOT}/ ({mode}). Press Ctrl+C to stop.")
+    try:
+        while True:
+            kind = classify(watcher.wait())
+            if kind is None:
+                continue
+            try:
+                console.print(build.rebuild(knowledge=kind == "knowledge"))
+            except Exception as e:
+                # A broken edit must not stop the server; the next save retries
+                console.print(f"[red]Rebuild failed: {e}[/red]")
+                continue
+            reloads.bump()
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Server stopped.[/yellow]")
+    finally:
+        watcher.close()
+        httpd.shutdown()
+        httpd.server_close()
@@ -0,0 +1,142 @@
+import os
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """
+    Recursive watcher over Linux inotify (through libc, no extra dependency). Every
+    directory under the roots gets its own watch, and directories created later are
+    added as they appear. wait() returns the set of changed paths.
+    """
+
+    def __init__(self, roots: Iterable[Path], debounce: float = 0.05):
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.debounce = debounce
+        self.roots = [str(r) for r in roots]
+        self._dirs: Dict[int, str] = {}
+        for root in self.roots:
+            self._add_tree(root)
+
+    def _add_tree(self, top: str):
+        for dirpath, _, _ in os.walk(top):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd >= 0:
+                self._dirs[wd] = dirpath
+
+    def _read_events(self, changed: Set[str]):
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        pos = 0
+        while pos < len(data):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, pos)
+            name = data[pos + EVENT_HEADER.size:pos + EVENT_HEADER.size + name_len].rstrip(b"\0")
+            pos += EVENT_HEADER.size + name_len
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; report the roots so the caller rebuilds everything
+                changed.update(self.roots)
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None:
+                continue
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            changed.add(path)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                # Files may already exist in the new directory before its watch is added
+                self._add_tree(path)
+                for dirpath, _, filenames in os.walk(path):
+                    changed.update(os.path.join(dirpath, f) for f in filenames)
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Blocks until something changes, then collects events until debounce seconds pass quietly."""
+        changed: Set[str] = set()
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return changed
+        while True:
+            self._read_events(changed)
+            if not select.select([self.fd], [], [], self.debounce)[0]:
+                return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback watcher that compares (mtime, size) snapshots of the roots every interval seconds."""
+
+    def __init__(self, roots: Iterable[Path], interval: float = 0.5):
+        self.roots = [str(r) for r in roots]
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for root in self.roots:
+            for dirpath, _, filenames in os.walk(root):
+                for name in filenames:
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval)
+            snapshot = self._scan()
+            changed = {p for p in snapshot.keys() | self._snapshot.keys()
+                       if snapshot.get(p) != self._snapshot.get(p)}
+            self._snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def make_watcher(roots: List[Path]):
+    """InotifyWatcher where the platform supports it, PollingWatcher otherwise."""
+    try:
+        return InotifyWatcher(roots)
+    except (OSError, AttributeError):
+        return PollingWatcher(roots)